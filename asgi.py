@@ -0,0 +1,34 @@
+"""ASGI entrypoint that adds a long-cache endpoint for published logos.
+
+Streamlit's own static serving only lets browsers revalidate files. Logo
+files are named by content hash, so this endpoint can mark them immutable
+and browsers download each club logo once. Run with:
+
+    TORNEOS_LOGO_MODE=url uvicorn asgi:app --port 8501
+"""
+import os
+
+os.environ.setdefault('TORNEOS_LOGO_BASE_URL', 'assets/logos')
+
+import streamlit as st  # noqa: E402
+from starlette.exceptions import HTTPException  # noqa: E402
+from starlette.responses import FileResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from torneos.thumbnails import STATIC_LOGO_PATH  # noqa: E402
+
+LOGO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+async def logo_asset(request):
+    file_name = request.path_params['file_name']
+    path = os.path.join(STATIC_LOGO_PATH, os.path.basename(file_name))
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="File not found")
+    return FileResponse(path, media_type='image/webp', headers={'Cache-Control': LOGO_CACHE_CONTROL})
+
+
+app = st.App(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Home.py'),
+    routes=[Route('/assets/logos/{file_name}', logo_asset)],
+)
@@ -0,0 +1,147 @@
+"""Knockout bracket: propagating one change vs rebuilding the bracket.
+
+Random brackets get random sequences of new results, corrections, draws,
+removed results and swapped seeds. After every change the incremental
+bracket must equal one built from scratch with the same seeds and
+matches. The bracket artifact of the real cup, updated from its previous
+value after an edit, must also equal a fresh build. Last, one change is
+timed against a full rebuild as brackets grow.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_bracket
+"""
+import copy
+import logging
+import time
+from dataclasses import replace
+
+import numpy as np
+
+from torneos.bracket import Bracket, build_bracket
+from torneos.ingest import LOGOS_FILE
+from torneos.loader import data_file, read_json
+from torneos.ranking import cross_zone_ranking
+from torneos.standings import build_standings
+from torneos.store import Match, category_matches
+
+SEEDS = range(5)
+CHANGES = 300
+SIZES = [16, 256, 4096, 65536]
+
+
+def knockout_match(round_name, home, away, home_goals, away_goals):
+    return Match('synthetic', round_name, None, home, away, home_goals, away_goals, '', '', '', '', '')
+
+
+def ties(bracket):
+    return [(tie.home, tie.away, tie.match, tie.winner) for round_ties in bracket.rounds for tie in round_ties]
+
+
+def fresh_bracket(size, seeds, matches):
+    bracket = Bracket(size)
+    bracket.set_seeds(seeds)
+    bracket.set_matches(matches.values())
+    return bracket
+
+
+def random_change(rng, bracket, seeds, matches):
+    """Change the seeds or the result of a random tie whose teams are known."""
+    if rng.random() < 0.1:
+        i, j = rng.choice(len(seeds), 2, replace=False)
+        seeds[i], seeds[j] = seeds[j], seeds[i]
+        return bracket.set_seeds(seeds)
+    ready = [tie for round_ties in bracket.rounds for tie in round_ties if tie.home and tie.away]
+    tie = ready[rng.integers(len(ready))]
+    key = (tie.round, frozenset((tie.home, tie.away)))
+    if key in matches and rng.random() < 0.2:
+        del matches[key]
+    else:
+        matches[key] = knockout_match(tie.round, tie.home, tie.away, int(rng.integers(0, 4)), int(rng.integers(0, 4)))
+    return bracket.set_matches(matches.values())
+
+
+def random_changes(seed):
+    rng = np.random.default_rng(seed)
+    size = 2 ** int(rng.integers(2, 7))
+    seeds = [f"Team {i}" for i in range(size)]
+    bracket = Bracket(size)
+    bracket.set_seeds(seeds)
+    matches = {}
+    for _ in range(CHANGES):
+        random_change(rng, bracket, seeds, matches)
+        assert ties(bracket) == ties(fresh_bracket(size, seeds, matches))
+    return size
+
+
+def group_ranking(loaded):
+    return cross_zone_ranking(build_standings(loaded, data_file(LOGOS_FILE), 'copa2025')[1])
+
+
+def bracket_state(bracket):
+    return bracket.seeds, bracket.provisional, ties(bracket), bracket.unplaced()
+
+
+def incremental_artifact():
+    """The cup bracket updated from its previous value equals a fresh build and leaves the previous value as it was."""
+    matches = category_matches('copa2025', read_json('copa2025.json'))
+    loaded = (matches, None)
+    previous = build_bracket(group_ranking(loaded), loaded, 'copa2025')
+    before = copy.deepcopy(bracket_state(previous))
+    edited = tuple(
+        replace(match, home_goals=match.away_goals, away_goals=match.home_goals) if match.round == 'Octavos de Final' else match
+        for match in matches
+    )
+    loaded = (edited, None)
+    updated = build_bracket(group_ranking(loaded), loaded, 'copa2025', previous=previous)
+    assert updated is not previous
+    assert bracket_state(previous) == before
+    fresh = build_bracket(group_ranking(loaded), loaded, 'copa2025')
+    assert ties(updated) == ties(fresh)
+
+
+def change_cost(size):
+    rng = np.random.default_rng(size)
+    seeds = [f"Team {i}" for i in range(size)]
+    bracket = Bracket(size)
+    bracket.set_seeds(seeds)
+    matches = {}
+    # Play out the first rounds so changes have ties to reach
+    for round_ties in bracket.rounds[:-1]:
+        for tie in round_ties:
+            key = (tie.round, frozenset((tie.home, tie.away)))
+            matches[key] = knockout_match(tie.round, tie.home, tie.away, int(rng.integers(1, 4)), 0)
+        bracket.set_matches(matches.values())
+
+    repeat = 50
+    first_round = list(bracket.rounds[0])
+    start = time.perf_counter()
+    for i in range(repeat):
+        tie = first_round[rng.integers(len(first_round))]
+        key = (tie.round, frozenset((tie.home, tie.away)))
+        home_goals, away_goals = matches[key].home_goals, matches[key].away_goals
+        matches[key] = knockout_match(tie.round, tie.home, tie.away, away_goals, home_goals)
+        bracket.set_match(matches[key])
+    incremental = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    fresh_bracket(size, seeds, matches)
+    full = time.perf_counter() - start
+    return incremental, full
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    for seed in SEEDS:
+        size = random_changes(seed)
+        print(f"bracket {seed}: {size} teams, {CHANGES} random changes, equal to a fresh bracket after each")
+    incremental_artifact()
+    print("cup bracket artifact updated from its previous value matches a fresh build, previous value untouched")
+    print(f"{'teams':>6} {'change ms':>10} {'rebuild ms':>11}")
+    for size in SIZES:
+        incremental, full = change_cost(size)
+        print(f"{size:>6} {incremental * 1000:>10.2f} {full * 1000:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Cross-zone ranking: one vectorized pass vs ranking zone rows in Python.
+
+Synthetic leagues with zones of different sizes, where teams have played
+different numbers of matches, are ranked both ways, per match and on
+totals. Both rankings must agree before they are timed.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_cross_zone
+"""
+import logging
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import standings_frames, synthetic_matches
+from torneos.ranking import cross_zone_ranking
+
+# (matches, zones)
+LEAGUES = [(400, 8), (10_000, 100), (100_000, 2_000), (400_000, 10_000)]
+
+
+def loop_ranking(frames, per_match):
+    """(team, zone position, Ranking, General) of every team, sorting Python rows."""
+    rows = []
+    for df in frames:
+        for position, row in enumerate(df.itertuples(index=False), 1):
+            scale = row.MP if per_match else 1
+            rows.append((position, -row.Pts / scale, -row.GD / scale, -row.GF / scale, row.Team))
+    general = {row[4]: rank for rank, row in enumerate(sorted(rows, key=lambda row: row[1:]), 1)}
+    ranked = []
+    for position in sorted({row[0] for row in rows}):
+        same_place = sorted((row for row in rows if row[0] == position), key=lambda row: row[1:])
+        ranked.extend((row[4], position, rank, general[row[4]]) for rank, row in enumerate(same_place, 1))
+    return ranked
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"{'matches':>8} {'zones':>6} {'teams':>6} {'per match':>10} {'loop ms':>8} {'vectorized ms':>14} {'speedup':>8}")
+    for n_matches, n_zones in LEAGUES:
+        # Team pools of 4 to 16 per zone, so zone sizes and matches played differ
+        df_matches = synthetic_matches(n_matches, n_teams=16, n_zones=n_zones, seed=n_zones)
+        rng = np.random.default_rng(n_zones)
+        pool = rng.integers(4, 17, n_zones)
+        zone_index = df_matches['Zona'].str.slice(5).astype(int).to_numpy() - 1
+        team_index = df_matches['Local'].str.rsplit('-', n=1).str[1].astype(int).to_numpy()
+        away_index = df_matches['Visitante'].str.rsplit('-', n=1).str[1].astype(int).to_numpy()
+        df_matches = df_matches[(team_index < pool[zone_index]) & (away_index < pool[zone_index])]
+        frames = standings_frames(df_matches)
+        for per_match in (True, False):
+            expected, loop_time = timed(loop_ranking, frames, per_match)
+            df_ranking, vectorized_time = timed(cross_zone_ranking, frames, per_match)
+            have = list(df_ranking[['Team', 'Posición', 'Ranking', 'General']].itertuples(index=False, name=None))
+            assert have == expected
+            print(f"{len(df_matches):>8} {n_zones:>6} {len(df_ranking):>6} {str(per_match):>10} {loop_time * 1000:>8.1f} "
+                  f"{vectorized_time * 1000:>14.1f} {loop_time / vectorized_time:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Fixture tab: tables for the open rounds only vs a table for every round.
+
+Runs a division page headless and measures the run time and the
+dataframe payload sent, once with every round's expander open (what
+every run paid when all tables were built inside closed expanders) and
+once as a page opens by default: the current round only, plus one round
+the user opened.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fixture_rounds
+"""
+import logging
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from torneos.fixtures import fixture_rounds
+from torneos.round_calendar import round_calendar
+
+SLUGS = ['c13', 'copa2025']
+REPEAT = 10
+
+
+def division_page(slug):
+    from torneos.categories import CATEGORIES_BY_SLUG
+    from views.division import render_division
+    render_division(CATEGORIES_BY_SLUG[slug])
+
+
+def fixture_run(slug, open_rounds):
+    """(seconds, fixture tables, their payload bytes) of one run with ``open_rounds`` expanded."""
+    at = AppTest.from_function(division_page, args=(slug,), default_timeout=120)
+    at.run()
+    elapsed = 0
+    for _ in range(REPEAT):
+        # The test harness does not carry an expander's state over like a browser does
+        for fecha_num in open_rounds:
+            at.session_state[f"fixture_round_{slug}_{fecha_num.replace(' ', '_')}"] = True
+        start = time.perf_counter()
+        at.run()
+        elapsed += (time.perf_counter() - start) / REPEAT
+    assert not at.exception, [e.value for e in at.exception]
+    tables = [df for df in at.dataframe if 'Local_Logo' in df.value.columns]
+    return elapsed, len(tables), sum(df.proto.ByteSize() for df in tables)
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"{'category':>9} {'rounds':>7} {'open':>5} {'tables':>7} {'payload KB':>11} {'run ms':>8}")
+    for slug in SLUGS:
+        rounds = [fecha_num for fecha_num, _ in fixture_rounds(slug)]
+        current = round_calendar(slug).current()
+        other = next(fecha_num for fecha_num in rounds if fecha_num != current)
+        for label, open_rounds in (('all', rounds), ('lazy', [other])):
+            elapsed, n_tables, payload = fixture_run(slug, open_rounds)
+            print(f"{slug:>9} {len(rounds):>7} {label:>5} {n_tables:>7} {payload / 1024:>11.0f} {elapsed * 1000:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
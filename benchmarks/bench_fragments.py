@@ -0,0 +1,61 @@
+"""Division pages: a full rerun vs rerunning only the tab a widget belongs to.
+
+Every tab body is a fragment, so a widget inside it reruns that tab
+alone. The headless test runner always runs whole scripts, so a tab's
+rerun is measured as a script rendering that tab only, with the same
+shared artifacts behind it; a full rerun renders the page header and all
+three tabs. The what-if editor is a fragment inside the Tabla tab, so an
+edit reruns only the hypothetical tables; it is measured switched on.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fragments
+"""
+import logging
+import time
+
+from streamlit.testing.v1 import AppTest
+
+SLUGS = ['c13', 'copa2025']
+REPEAT = 10
+
+
+def division_page(slug):
+    from torneos.categories import CATEGORIES_BY_SLUG
+    from views.division import render_division
+    render_division(CATEGORIES_BY_SLUG[slug])
+
+
+def division_tab(slug, tab):
+    from torneos.categories import CATEGORIES_BY_SLUG
+    from views import division
+    getattr(division, tab)(CATEGORIES_BY_SLUG[slug], False)
+
+
+def per_run(script, *args, state=None):
+    at = AppTest.from_function(script, args=args, default_timeout=120)
+    for key, value in (state or {}).items():
+        at.session_state[key] = value
+    at.run()  # warm the shared artifacts
+    assert not at.exception, [e.value for e in at.exception]
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        at.run()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    tabs = ['render_fixture_tab', 'render_standings_tab', 'render_statistics_tab']
+    print(f"{'category':>9} {'full page ms':>13} " + " ".join(f"{tab.split('_')[1] + ' ms':>15}" for tab in tabs)
+          + f" {'what-if ms':>11}")
+    for slug in SLUGS:
+        full = per_run(division_page, slug)
+        what_if = per_run(division_tab, slug, 'render_what_if', state={f"what_if_{slug}": True})
+        print(f"{slug:>9} {full * 1000:>13.0f} " + " ".join(
+            f"{per_run(division_tab, slug, tab) * 1000:>15.0f}" for tab in tabs
+        ) + f" {what_if * 1000:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Cost of one new result: cold start vs incremental ingest of a single category file.
+
+Works on a copy of data/ with its own artifact cache and database. A rerun
+first builds every artifact the pages use (fixtures, standings, scorers, the
+day index and the match database). Then one C13 score is edited
+and the rerun repeated: the ingest must rebuild exactly C13's artifacts and
+the ones combining every category, every other category must come back as
+the very same cached objects, and C13's standings must reflect the new
+score. Last, a restart with an empty memory cache maps the match and scorer
+tables back from disk instead of parsing the files.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ingest
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from torneos import artifacts, loader, match_db
+from torneos.artifacts import artifact_graph
+from torneos.categories import CATEGORIES, CATEGORIES_BY_SLUG
+from torneos.fixtures import fixture_rounds
+from torneos.ingest import data_versions
+from torneos.logos import LOGO_WIDTH, build_logo_dict, team_resolver
+from torneos.match_db import match_db as shared_match_db
+from torneos.match_index import match_index
+from torneos.standings import category_standings
+from torneos.statistics import category_statistics
+
+EDITED = CATEGORIES_BY_SLUG['c13']
+
+
+def rerun():
+    """Every artifact a round of page visits touches, by category."""
+    versions = data_versions()
+    built = {
+        category.slug: (
+            fixture_rounds(category.slug, versions),
+            category_standings(category.slug, versions),
+            category_statistics(category.slug, versions),
+        )
+        for category in CATEGORIES
+    }
+    match_index(versions)
+    shared_match_db(versions)
+    return built
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def edit_first_result(category):
+    """Add a goal to the home side of the first played match of ``category``."""
+    path = loader.data_file(category.json_file)
+    with open(path) as file:
+        data = json.load(file)
+    match = next(m for fecha in data for m in fecha['Data'] if m['GL'] != '' and m['Visitante'].strip())
+    match['GL'] = str(int(match['GL']) + 1)
+    with open(path, 'w') as file:
+        json.dump(data, file, ensure_ascii=False)
+    return match
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(loader.DATA_PATH, os.path.join(tmp, 'data'))
+        loader.DATA_PATH = os.path.join(tmp, 'data')
+        artifacts.ARTIFACT_PATH = os.path.join(tmp, 'artifacts')
+        match_db.DB_PATH = os.path.join(tmp, 'db', 'matches.sqlite')
+        # Logo thumbnails are shared with the app and not part of the data
+        build_logo_dict()
+        team_resolver()
+
+        before, cold_time = timed(rerun)
+        _, unchanged_time = timed(rerun)
+        match = edit_first_result(EDITED)
+        after, edit_time = timed(rerun)
+        rebuilt = {build.name for build in artifact_graph().ingests[-1].builds}
+        assert rebuilt == {
+            f"match_table/{EDITED.slug}", f"matches/{EDITED.slug}", f"fixtures/{EDITED.slug}/{LOGO_WIDTH}",
+            f"fixture_rounds/{EDITED.slug}/{LOGO_WIDTH}", f"standings/{EDITED.slug}", f"day_index/{EDITED.slug}",
+            "match_index",
+        }, rebuilt
+
+        for slug, built in after.items():
+            same = all(a is b for a, b in zip(built[:2], before[slug][:2]))
+            assert same == (slug != EDITED.slug), slug
+            assert built[2] is before[slug][2], slug
+        standings = {row.Team: row for df in after[EDITED.slug][1] for row in df.itertuples()}
+        old_standings = {row.Team: row for df in before[EDITED.slug][1] for row in df.itertuples()}
+        assert standings[match['Local']].GF == old_standings[match['Local']].GF + 1
+        assert any(m.home_goals == int(match['GL']) for m in shared_match_db().involving(match['Local'], EDITED.slug, exact=True))
+
+        artifact_graph.clear()
+        _, restart_time = timed(rerun)
+        origins = {build.name.split('/')[0]: build.origin for build in artifact_graph().ingests[-1].builds}
+        assert origins['match_table'] == origins['scorer_table'] == 'disk', origins
+
+    print(f"cold start, every category:  {cold_time * 1000:8.1f} ms")
+    print(f"rerun, nothing changed:      {unchanged_time * 1000:8.1f} ms")
+    print(f"rerun after one C13 result:  {edit_time * 1000:8.1f} ms")
+    print(f"restart, tables from disk:   {restart_time * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Leaderboard across categories: a heap merge of the sorted scorer tables vs concatenating and re-sorting them.
+
+Every registered category gets a synthetic scorer table of growing size.
+The merged top N and the club totals must equal those of the
+concatenated tables, sorted and grouped, and stay equal to a leaderboard
+built from scratch after one category's file changes; the leaderboard
+updated from must stay as it was, sharing the unchanged categories with
+the new one. Then a top N, and
+updating for one changed file, are timed against doing it all again.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_leaderboard
+"""
+import logging
+import time
+
+import pyarrow as pa
+
+from benchmarks.synthetic import synthetic_scorers
+from torneos.categories import CATEGORIES
+from torneos.leaderboard import CLUB_COLUMNS, LEADERBOARD_COLUMNS, Leaderboard
+from torneos.snapshot import statistics_table
+
+# Scorers per category
+SIZES = [1_000, 5_000, 20_000]
+TOP = [10, 100]
+REPEAT = 20
+
+
+def category_tables(n_players, seed=0):
+    return {
+        category.slug: statistics_table(category.slug, synthetic_scorers(n_players, seed=seed + position))
+        for position, category in enumerate(CATEGORIES)
+    }
+
+
+def concatenated(tables):
+    # Registry order, so the stable sort breaks ties like the merge does
+    return pa.concat_tables(tables[category.slug] for category in CATEGORIES)
+
+
+def sorted_top(tables, n=None):
+    table = concatenated(tables).sort_by([('Goals', 'descending'), ('Player', 'ascending')])
+    return table if n is None else table.slice(0, n)
+
+
+def grouped_clubs(tables):
+    df = concatenated(tables).to_pandas()
+    df['Club'] = df['Club'].astype(str)
+    clubs = df.groupby('Club', as_index=False).agg(Goals=('Goals', 'sum'), Players=('Goals', 'size'))
+    return clubs.sort_values(['Goals', 'Club'], ascending=[False, True], ignore_index=True)[CLUB_COLUMNS]
+
+
+def assert_matches(leaderboard, tables):
+    expected = sorted_top(tables).to_pandas()
+    expected['category'] = expected['category'].astype(str)
+    expected['Club'] = expected['Club'].astype(str)
+    top = leaderboard.top()
+    assert top.equals(expected[LEADERBOARD_COLUMNS].astype(top.dtypes.to_dict())), "top scorers differ"
+    clubs = leaderboard.clubs()
+    assert clubs.equals(grouped_clubs(tables).astype(clubs.dtypes.to_dict())), "club totals differ"
+
+
+def per_call(function, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        function(*args)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"{'scorers':>8} " + " ".join(f"{f'sort top{n} ms':>13} {f'heap top{n} ms':>13}" for n in TOP)
+          + f" {'rebuild ms':>11} {'update ms':>10}")
+    for n_players in SIZES:
+        tables = category_tables(n_players)
+        leaderboard, _ = Leaderboard().update(tables)
+        assert_matches(leaderboard, tables)
+
+        # One category's file changes
+        slug = CATEGORIES[0].slug
+        changed = dict(tables, **{slug: statistics_table(slug, synthetic_scorers(n_players, seed=100))})
+        start = time.perf_counter()
+        updated, n_changed = leaderboard.update(changed)
+        update = time.perf_counter() - start
+        assert n_changed == 1
+        assert_matches(updated, changed)
+        assert_matches(leaderboard, tables)
+        assert all(updated._categories[other] is leaderboard._categories[other] for other in tables if other != slug)
+        leaderboard = updated
+        rebuild = per_call(lambda: Leaderboard().update(changed))
+
+        timings = []
+        for n in TOP:
+            timings += [per_call(sorted_top, changed, n), per_call(leaderboard.top, n)]
+        print(f"{len(leaderboard):>8} " + " ".join(f"{seconds * 1000:>13.2f}" for seconds in timings)
+              + f" {rebuild * 1000:>11.1f} {update * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Logos inlined as data URIs vs referenced by URL: payload bytes and time to first render.
+
+A data URI travels inside every dataframe cell on every rerun. A URL costs a
+few dozen bytes per cell, and each logo file is downloaded once and then
+served from the browser cache. Time to first render is approximated on the
+server side as building the division's frames plus Arrow serialization; the
+browser's own image decoding is not measured.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logo_mode
+"""
+import logging
+import os
+import time
+
+from benchmarks.bench_logo_payload import COLUMNS, arrow_bytes
+from torneos.fixtures import fixtures_frame
+from torneos.logos import LOGO_WIDTH, TeamResolver, build_logo_dict
+from torneos.standings import StandingsState
+from torneos.store import load_category_matches
+from torneos.thumbnails import STATIC_LOGO_PATH
+
+SLUGS = ['c13', 'copa2025']
+MODES = ['data', 'url']
+
+
+def division_payload(matches, resolver):
+    """Arrow bytes a division page sends: one frame per round and per zone."""
+    df = fixtures_frame(matches, resolver)
+    total = sum(arrow_bytes(group[COLUMNS]) for _, group in df.groupby('Fecha Numero', sort=False))
+    for df_standings in StandingsState.from_matches(matches).frames():
+        df_standings['Logo'] = resolver.logos(df_standings['Team'])
+        total += arrow_bytes(df_standings)
+    return total
+
+
+def logo_files_bytes(matches, resolver):
+    """Bytes of the distinct logo files a first visit downloads in url mode."""
+    urls = {resolver.logo(team) for match in matches for team in (match.home, match.away)}
+    return sum(os.path.getsize(os.path.join(STATIC_LOGO_PATH, os.path.basename(url))) for url in urls if url)
+
+
+def first_render_time(matches, resolver, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        division_payload(matches, resolver)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    resolvers = {mode: TeamResolver(build_logo_dict(LOGO_WIDTH, mode)[0]) for mode in MODES}
+    print(f"{'category':>9} {'mode':>5} {'rerun KB':>9} {'first visit KB':>15} {'render ms':>10}")
+    for slug in SLUGS:
+        matches, _ = load_category_matches(slug)
+        for mode, resolver in resolvers.items():
+            rerun = division_payload(matches, resolver)
+            first_visit = rerun + (logo_files_bytes(matches, resolver) if mode == 'url' else 0)
+            render = first_render_time(matches, resolver)
+            print(f"{slug:>9} {mode:>5} {rerun / 1024:>9.0f} {first_visit / 1024:>15.0f} {render * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
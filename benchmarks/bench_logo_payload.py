@@ -0,0 +1,63 @@
+"""Websocket payload of the fixture tables: full-size logo data URIs vs thumbnails.
+
+Streamlit ships every st.dataframe as an Arrow IPC buffer, so the payload of
+a fixture tab is the Arrow size of each round's frame, summed over rounds.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logo_payload
+"""
+import base64
+import logging
+import mimetypes
+
+import pyarrow as pa
+
+from torneos.fixtures import fixtures_frame
+from torneos.loader import ROOT_PATH, read_json
+from torneos.logos import LOGO_WIDTH, MOBILE_LOGO_WIDTH, TeamResolver, build_logo_dict
+from torneos.store import load_category_matches
+
+COLUMNS = ['Fecha', 'Local_Logo', 'Local', 'GL', 'Visitante_Logo', 'Visitante', 'GV', 'Cancha']
+
+
+# The logo dict as it was built before thumbnails: every source JPEG inlined
+def full_size_logo_dict():
+    logo_dict = {}
+    for item in read_json('logos.json'):
+        path = f"{ROOT_PATH}{item['logo']}"
+        mime_type, _ = mimetypes.guess_type(path)
+        with open(path, 'rb') as image_file:
+            logo_dict[item['equipo']] = f"data:{mime_type};base64,{base64.b64encode(image_file.read()).decode('utf-8')}"
+    return logo_dict
+
+
+def arrow_bytes(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def fixture_payload(matches, logo_dict):
+    df = fixtures_frame(matches, TeamResolver(logo_dict))
+    return sum(arrow_bytes(group[COLUMNS]) for _, group in df.groupby('Fecha Numero', sort=False))
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    dicts = {
+        'full size': full_size_logo_dict(),
+        f'{LOGO_WIDTH}px': build_logo_dict(LOGO_WIDTH)[0],
+        f'{MOBILE_LOGO_WIDTH}px': build_logo_dict(MOBILE_LOGO_WIDTH)[0],
+    }
+    print(f"{'logos':>10} {'avg logo KB':>12} " + " ".join(f"{slug + ' KB':>12}" for slug in ['c13', 'copa2025']))
+    for name, logo_dict in dicts.items():
+        avg = sum(len(uri) for uri in logo_dict.values()) / len(logo_dict) / 1024
+        payloads = [fixture_payload(load_category_matches(slug)[0], logo_dict) / 1024 for slug in ['c13', 'copa2025']]
+        print(f"{name:>10} {avg:>12.1f} " + " ".join(f"{p:>12.0f}" for p in payloads))
+
+
+if __name__ == '__main__':
+    main()
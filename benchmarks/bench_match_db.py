@@ -0,0 +1,135 @@
+"""Cross-category lookups: scanning Match lists vs the indexed SQLite database.
+
+Lookups of one week by day, venue, referee and club are timed as the data
+grows to many seasons: the scan grows with the data while indexed lookups
+only grow with the number of matches they return, which stays the same.
+Then reader threads query while a single writer records results, to check
+WAL readers never fail or wait on the writer.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_match_db
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_category_json
+from torneos.logos import normalize_team
+from torneos.match_db import MatchDB, create_db
+from torneos.store import category_matches
+
+N_CATEGORIES = 13
+SEASONS = [1, 10, 50]
+ROUNDS_PER_SEASON = 30
+MATCHES_PER_ROUND = 8
+DAY = pd.Timestamp('2015-03-08').date()
+WEEK_END = pd.Timestamp('2015-03-14').date()
+
+
+def synthetic_season_matches(seasons):
+    start = pd.Timestamp('2015-03-01')
+    return [
+        match
+        for i in range(N_CATEGORIES)
+        for match in category_matches(f"cat{i}", synthetic_category_json(ROUNDS_PER_SEASON * seasons, MATCHES_PER_ROUND, start, seed=i))
+    ]
+
+
+def in_week(match):
+    return match.kickoff is not None and DAY <= match.kickoff.date() <= WEEK_END
+
+
+def is_club_team(team, key):
+    team = normalize_team(team)
+    return team == key or team.startswith(f"{key} ")
+
+
+def scan_lookups(matches):
+    return [
+        [m for m in matches if m.kickoff is not None and m.kickoff.date() == DAY],
+        [m for m in matches if normalize_team(m.venue) == 'cancha 3' and in_week(m)],
+        [m for m in matches if 'Arbitro 7' in (m.referee_1, m.referee_2) and in_week(m)],
+        [m for m in matches if (is_club_team(m.home, 'team 1') or is_club_team(m.away, 'team 1')) and in_week(m)],
+    ]
+
+
+def db_lookups(db):
+    return [
+        db.on(DAY),
+        db.at_venues(['Cancha 3'], DAY, WEEK_END),
+        db.refereed_by('Arbitro 7', DAY, WEEK_END),
+        db.involving('Team 1', start=DAY, end=WEEK_END),
+    ]
+
+
+def per_call(func, *args, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def concurrent_readers(db, matches, n_readers=8, seconds=1.0):
+    """Reader latencies and writes done while readers and one writer run together."""
+    stop = threading.Event()
+    latencies = []
+    errors = []
+    writes = [0]
+
+    def reader():
+        try:
+            while not stop.is_set():
+                start = time.perf_counter()
+                db.refereed_by('Arbitro 7', DAY, WEEK_END)
+                latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(e)
+
+    def writer():
+        try:
+            for match in matches:
+                if stop.is_set():
+                    break
+                db.record_result(match.category, match.round, match.home, match.away, 1, 1)
+                writes[0] += 1
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(n_readers)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)], writes[0]
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"{'seasons':>8} {'matches':>8} {'scan ms':>8} {'db ms':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for seasons in SEASONS:
+            matches = synthetic_season_matches(seasons)
+            path = os.path.join(tmp, f"matches-{seasons}.sqlite")
+            create_db(path, matches)
+            db = MatchDB(path)
+            scanned, scan_time = per_call(scan_lookups, matches)
+            found, db_time = per_call(db_lookups, db)
+            for scan_result, db_result in zip(scanned, found):
+                assert sorted(scan_result, key=lambda m: (m.kickoff, m.category, m.round)) == \
+                    sorted(db_result, key=lambda m: (m.kickoff, m.category, m.round))
+            print(f"{seasons:>8} {len(matches):>8} {scan_time * 1000:>8.1f} {db_time * 1000:>7.2f}")
+        median, p99, writes = concurrent_readers(db, matches)
+        print(f"8 readers + 1 writer: reader median {median * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, {writes} writes/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Today's matches: full scan of every category file vs the date index.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_match_index
+"""
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_category_json
+from torneos.match_index import MatchIndex
+from torneos.store import category_matches
+
+N_CATEGORIES = 13
+
+
+# What get_todays_matches did for every new date key
+def legacy_scan(data_by_category, current_date_str):
+    found = []
+    for category, data in data_by_category.items():
+        for table in data:
+            for match in table['Data']:
+                if match['Fecha'].startswith(current_date_str):
+                    found.append(match)
+    return found
+
+
+def per_call(func, *args, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    print(f"{'seasons':>8} {'matches':>8} {'scan ms':>9} {'on() us':>9} {'7 days us':>10} {'build ms':>9}")
+    for seasons in [1, 5, 20, 50]:
+        start_day = pd.Timestamp('2025-03-01')
+        data_by_category = {
+            f"Cat {c}": synthetic_category_json(30 * seasons, 8, start_day, seed=c)
+            for c in range(N_CATEGORIES)
+        }
+        n_matches = sum(len(r['Data']) for data in data_by_category.values() for r in data)
+        build_start = time.perf_counter()
+        matches = [match for slug, data in data_by_category.items() for match in category_matches(slug, data)]
+        index = MatchIndex(matches)
+        build_time = time.perf_counter() - build_start
+        day = index.dates[len(index.dates) // 2]
+        scan_time, expected = per_call(legacy_scan, data_by_category, day.strftime('%d/%m/%Y'), repeat=3)
+        on_time, found = per_call(index.on, day)
+        week_time, _ = per_call(index.between, day, day + timedelta(days=7))
+        assert len(found) == len(expected)
+        print(f"{seasons:>8} {n_matches:>8} {scan_time * 1000:>9.2f} {on_time * 1e6:>9.2f} "
+              f"{week_time * 1e6:>10.2f} {build_time * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""Player identity index: blocking by surname key vs comparing every pair of scorer names.
+
+Synthetic players, each scoring in one to four categories, are spelt a
+little differently in every row, like the statistics files do: accents
+or a mangled "?" in their place, mixed case, stray spaces around the
+comma, a typo in the given name and the squad suffix of their club. The
+index must put the rows of each player together and no others. Then its
+build is timed against the all-pairs comparison it avoids, estimated
+from a sample, and a career lookup against filtering every row. Last,
+on a copy of data/, dropping a club from logos.json alone must rebuild
+the index and the fixtures and standings that show the club's logo.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_player_index
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from torneos import loader
+from torneos.artifacts import ArtifactGraph
+from torneos.categories import CATEGORIES
+from torneos.ingest import LOGOS_FILE, data_versions
+from torneos.logos import LOGO_WIDTH, TeamResolver, team_resolver
+from torneos.players import PlayerIndex, fold_name, same_given_names, split_player, surname_key
+from torneos.snapshot import statistics_table
+
+N_ROWS = 100_000
+SYLLABLES = ['BA', 'CA', 'DA', 'FE', 'GO', 'LE', 'LU', 'MA', 'MO', 'NA', 'NI', 'PE', 'RA', 'RI', 'RO', 'SA', 'TA',
+             'TO', 'VE', 'ZA']
+GIVEN_NAMES = ['AGUSTIN', 'BENJAMIN', 'CRISTIAN', 'EZEQUIEL', 'FACUNDO', 'FEDERICO', 'GASTON', 'JOAQUIN', 'JUAN',
+               'JUAN PABLO', 'LAUTARO', 'LUCAS', 'MARTIN', 'MATIAS', 'MAXIMILIANO', 'NICOLAS', 'RAMON', 'SANTIAGO',
+               'SEBASTIAN', 'TOMAS', 'VALENTIN', 'MARIA', 'LOURDES', 'VALENTINA']
+CLUBS = ['Amaral', 'Bachillerato', 'Banco Mza', 'CDA', 'Cuadro Nacional', 'El Porvenir', 'Huracan', 'Los Andes',
+         'Pedal', 'Pescadores', 'Tenis', 'Utn']
+SQUADS = ['', ' A', ' B', ' C', ' AZUL', ' BLANCO']
+ACCENTS = {'A': ['Á', 'á', '?'], 'E': ['É', 'é', '?'], 'I': ['Í', 'í', '?'], 'O': ['Ó', 'ó', '?']}
+SAMPLE = 2_000
+
+
+def synthetic_players(n_rows, seed=0):
+    """(scorer tables by category, true player of every row in table order) with ``n_rows`` rows in all."""
+    rng = np.random.default_rng(seed)
+    players, taken, total = [], {}, 0
+    while total < n_rows:
+        surname = "".join(rng.choice(SYLLABLES, rng.integers(2, 5)))
+        given = GIVEN_NAMES[rng.integers(len(GIVEN_NAMES))]
+        club = CLUBS[rng.integers(len(CLUBS))]
+        # Players nothing could tell apart are one player
+        block = taken.setdefault((surname_key(surname), fold_name(club)), [])
+        if any(same_given_names(given, other) for other in block):
+            continue
+        block.append(given)
+        players.append((surname, given, club, int(rng.integers(1, 5))))
+        total += players[-1][-1]
+
+    rows = {category.slug: [] for category in CATEGORIES}
+    for player_id, (surname, given, club, appearances) in enumerate(players):
+        squad = SQUADS[rng.integers(len(SQUADS))]
+        # Most rows spell a name right, so every player has one that does
+        for n, slug in enumerate(rng.choice(list(rows), appearances, replace=False)):
+            name = misspell(rng, surname, given) if n else f"{surname}, {given}"
+            rows[slug].append((int(rng.geometric(0.35)), name, f"{club.upper()}{squad}", player_id))
+    tables, truth = {}, {}
+    for slug, category_rows in rows.items():
+        df = pd.DataFrame(category_rows, columns=['Goals', 'Player', 'Club', 'truth'])
+        df = df.sort_values(by=['Goals', 'Player'], ascending=[False, True], ignore_index=True)
+        tables[slug] = statistics_table(slug, df[['Goals', 'Player', 'Club']])
+        truth[slug] = df['truth'].to_numpy()
+    return tables, truth
+
+
+def misspell(rng, surname, given):
+    """``SURNAME, GIVEN`` as some row of the statistics files might spell it, its initial kept."""
+    if rng.random() < 0.3:
+        vowels = [i for i, char in enumerate(given) if char in ACCENTS and i > 0]
+        if vowels:
+            i = vowels[rng.integers(len(vowels))]
+            given = given[:i] + ACCENTS[given[i]][rng.integers(3)] + given[i + 1:]
+    elif rng.random() < 0.2 and len(given) >= 7:
+        # A typo past the first letter of a long given name
+        i = int(rng.integers(1, len(given)))
+        if given[i] != ' ' and given[i - 1] != ' ':
+            given = given[:i] + ('E' if given[i] != 'E' else 'A') + given[i + 1:]
+    name = f"{surname}{' ' * int(rng.integers(0, 3))}, {given}"
+    return name.lower() if rng.random() < 0.1 else name
+
+
+def assert_identities(index, truth):
+    """Rows share a player in the index exactly when they share a true player."""
+    found = np.concatenate([index.row_players[slug] for slug in truth])
+    expected = np.concatenate(list(truth.values()))
+    pairs = np.unique(np.stack([found, expected]), axis=1)
+    assert len(np.unique(pairs[0])) == pairs.shape[1], "players merged"
+    assert len(np.unique(pairs[1])) == pairs.shape[1], "players split"
+    assert len(index) == len(np.unique(expected))
+
+
+def all_pairs(spellings):
+    """Compare every pair of (player, club) spellings, as matching without blocks would."""
+    folded = [(split_player(player), fold_name(club)) for player, club in spellings]
+    matches = 0
+    for i in range(len(folded)):
+        (surname, given), club = folded[i]
+        for (other_surname, other_given), other_club in folded[i + 1:]:
+            if (surname_key(surname) == surname_key(other_surname) and club == other_club
+                    and same_given_names(given, other_given)):
+                matches += 1
+    return matches
+
+
+def logos_edit(slug='c13'):
+    """Dropping a club from logos.json rebuilds the index and the fixtures and standings showing its logo."""
+    data_path = loader.DATA_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(data_path, os.path.join(tmp, 'data'))
+        loader.DATA_PATH = os.path.join(tmp, 'data')
+        try:
+            graph = ArtifactGraph(os.path.join(tmp, 'artifacts'))
+            keys = [('player_index',), ('fixtures', slug, LOGO_WIDTH), ('standings', slug)]
+            before = [graph.get(key, data_versions()) for key in keys]
+            team = before[1]['Local'].iloc[0]
+            club = team_resolver().club(team)
+            with open(loader.data_file(LOGOS_FILE)) as file:
+                logos = json.load(file)
+            with open(loader.data_file(LOGOS_FILE), 'w') as file:
+                json.dump([item for item in logos if item['equipo'] != club], file, ensure_ascii=False)
+            after = [graph.get(key, data_versions()) for key in keys]
+        finally:
+            loader.DATA_PATH = data_path
+    assert all(new is not old for new, old in zip(after, before))
+
+    def team_logos(fixtures, standings):
+        logos = set(fixtures.loc[fixtures['Local'] == team, 'Local_Logo'])
+        return logos | {logo for df in standings[1] for logo in df.loc[df['Team'] == team, 'Logo']}
+
+    assert "" not in team_logos(*before[1:]), team
+    assert team_logos(*after[1:]) == {""}, team
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    tables, truth = synthetic_players(N_ROWS)
+    resolver = TeamResolver({club: "" for club in CLUBS})
+    start = time.perf_counter()
+    index = PlayerIndex(tables, resolver)
+    build = time.perf_counter() - start
+    assert_identities(index, truth)
+    n_rows = sum(len(table) for table in tables.values())
+    print(f"{n_rows} rows of {len(index)} players in {len(tables)} categories: identities match")
+
+    spellings = list({
+        spelling for table in tables.values()
+        for spelling in zip(table.column('Player').to_pylist(), table.column('Club').to_pylist())
+    })
+    start = time.perf_counter()
+    all_pairs(spellings[:SAMPLE])
+    per_pair = (time.perf_counter() - start) / (SAMPLE * (SAMPLE - 1) / 2)
+    estimate = per_pair * len(spellings) * (len(spellings) - 1) / 2
+    print(f"{'spellings':>10} {'index build s':>14} {'all pairs s (est.)':>19}")
+    print(f"{len(spellings):>10} {build:>14.2f} {estimate:>19.0f}")
+
+    # A player's rows: one index hit vs folding and filtering every row
+    rows = pd.concat([table.to_pandas() for table in tables.values()], ignore_index=True)
+    rng = np.random.default_rng(1)
+    lookups = rng.integers(0, len(index), 20)
+    start = time.perf_counter()
+    for player_id in lookups:
+        index.rows(player_id)
+    hit = (time.perf_counter() - start) / len(lookups)
+    start = time.perf_counter()
+    for player_id in lookups[:3]:
+        surname, given = split_player(index.names[player_id])
+        folded = rows['Player'].map(split_player)
+        rows[folded.map(lambda name: surname_key(name[0]) == surname_key(surname)
+                        and same_given_names(name[1], given))]
+    scan = (time.perf_counter() - start) / 3
+    print(f"{'career lookup':>14} {'index µs':>9} {'scan ms':>8}")
+    print(f"{'':>14} {hit * 1e6:>9.0f} {scan * 1000:>8.0f}")
+
+    logos_edit()
+    print("a logos.json edit rebuilds the index, fixtures and standings")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""Elo ratings: one result at a time vs replaying the whole history.
+
+A synthetic history of several seasons for 13 categories, hundreds of
+thousands of matches in all, is rated from scratch and checked against
+a plain replay in Python. Then the last results arrive one by one and
+results are corrected at different depths of the history; after each
+the incremental ratings must equal a fresh rating of the same results,
+and correcting a copy must leave the ratings it was copied from alone.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ratings
+"""
+import gc
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from torneos.ratings import ELO_SCALE, HOME_ADVANTAGE, INITIAL_RATING, K_FACTOR, Ratings, margin_multiplier
+
+CATEGORIES = 13
+TEAMS = 24
+SEASONS = 40
+ROUNDS = (TEAMS - 1) * 2
+APPENDED = 2_000
+
+
+def synthetic_history(seed=0):
+    """Results keyed as ``Ratings.match_results``: a double round-robin a season, one round a week."""
+    rng = np.random.default_rng(seed)
+    strength = rng.normal(0, 0.4, (CATEGORIES, TEAMS))
+    results = {}
+    for category in range(CATEGORIES):
+        for season in range(SEASONS):
+            start = pd.Timestamp('1990-03-01') + pd.DateOffset(years=season)
+            order = rng.permutation(TEAMS)
+            for round_number in range(ROUNDS):
+                # Circle method: team order[0] stays put, the rest rotate
+                rotated = np.concatenate([order[:1], np.roll(order[1:], round_number)])
+                pairs = zip(rotated[:TEAMS // 2], rotated[::-1][:TEAMS // 2])
+                day = start + pd.Timedelta(days=7 * round_number)
+                for home, away in pairs:
+                    if round_number >= ROUNDS // 2:
+                        home, away = away, home
+                    kickoff = (day + pd.Timedelta(hours=int(rng.integers(9, 23)))).to_pydatetime()
+                    home_goals = int(rng.poisson(3.0 * np.exp(strength[category, home] - strength[category, away])))
+                    away_goals = int(rng.poisson(2.6 * np.exp(strength[category, away] - strength[category, home])))
+                    key = (f"cat{category}", f"Fecha {round_number + 1} ({season + 1990})", f"Team {home}", f"Team {away}")
+                    results[key] = (kickoff, home_goals, away_goals)
+    return results
+
+
+def replay(results):
+    """(category, team) -> rating, rating every result in kickoff order with a dict."""
+    rating = {}
+    for kickoff, category, round, home, away in sorted((kickoff, *key) for key, (kickoff, _, _) in results.items()):
+        _, home_goals, away_goals = results[(category, round, home, away)]
+        home_rating = rating.get((category, home), INITIAL_RATING)
+        away_rating = rating.get((category, away), INITIAL_RATING)
+        score = 1.0 if home_goals > away_goals else 0.5 if home_goals == away_goals else 0.0
+        expected = 1 / (1 + 10 ** ((away_rating - home_rating - HOME_ADVANTAGE) / ELO_SCALE))
+        change = K_FACTOR * margin_multiplier(home_goals - away_goals) * (score - expected)
+        rating[(category, home)] = home_rating + change
+        rating[(category, away)] = away_rating - change
+    return rating
+
+
+def assert_same(ratings, expected):
+    assert len(ratings.teams) == len(expected)
+    for team, value in expected.items():
+        assert abs(ratings.of(*team) - value) < 1e-9, team
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    results = synthetic_history()
+    by_date = sorted(results, key=lambda key: (results[key][0], *key))
+    # Keep full collections of the long-lived history out of the timings
+    gc.collect()
+    gc.freeze()
+    print(f"{len(results):,} matches, {CATEGORIES} categories, {SEASONS} seasons")
+
+    expected, replay_time = timed(replay, results)
+    ratings = Ratings()
+    _, build_time = timed(ratings.sync, results)
+    assert_same(ratings, expected)
+    team = ratings.teams[0]
+    assert ratings.history(*team)['Rating'].iloc[-1] == ratings.of(*team)
+    print(f"{'full replay, dict loop':>34} {replay_time * 1000:>10.1f} ms")
+    print(f"{'full build, Ratings':>34} {build_time * 1000:>10.1f} ms")
+
+    # The last results arrive one at a time
+    incremental = Ratings()
+    incremental.sync({key: results[key] for key in by_date[:-APPENDED]})
+    start = time.perf_counter()
+    for key in by_date[-APPENDED:]:
+        assert incremental.update({key: results[key]}) == 1
+    append_time = (time.perf_counter() - start) / APPENDED
+    assert_same(incremental, expected)
+    print(f"{'one new result':>34} {append_time * 1e6:>10.1f} µs")
+
+    # A corrected result replays the matches after it; a removed one too
+    for depth in (0.999, 0.99, 0.9, 0.5):
+        key = by_date[int(depth * len(by_date))]
+        kickoff, home_goals, away_goals = results[key]
+        corrected = dict(results)
+        corrected[key] = (kickoff, away_goals + 2, home_goals)
+        replayed, correct_time = timed(incremental.update, {key: corrected[key]})
+        assert_same(incremental, replay(corrected))
+        print(f"{f'correction at {depth:.1%} ({replayed:,} replayed)':>34} {correct_time * 1000:>10.1f} ms")
+        incremental.update({key: results[key]})
+    removed = by_date[len(by_date) // 2]
+    incremental.update({}, [removed])
+    assert_same(incremental, replay({key: result for key, result in results.items() if key != removed}))
+    incremental.update({removed: results[removed]})
+    assert_same(incremental, expected)
+    # A new version of the data rates a copy; the ratings handed out stay as they were
+    key = by_date[len(by_date) // 2]
+    kickoff, home_goals, away_goals = results[key]
+    history = incremental.history(*key[::2])
+    updated, copy_time = timed(incremental.copy)
+    updated.update({key: (kickoff, away_goals + 2, home_goals)})
+    assert_same(incremental, expected)
+    assert incremental.history(*key[::2]).equals(history)
+    assert not updated.history(*key[::2]).equals(history)
+    print(f"{'copy for a new version':>34} {copy_time * 1000:>10.1f} ms")
+    # A result moved to another date leaves its old place in the history
+    key = by_date[len(by_date) // 3]
+    kickoff, home_goals, away_goals = results[key]
+    moved = dict(results)
+    moved[key] = (kickoff + pd.Timedelta(days=400), home_goals, away_goals)
+    incremental.sync(moved)
+    assert len(incremental) == len(results)
+    assert_same(incremental, replay(moved))
+    print("incremental ratings match a full replay after appends, corrections, removals and moves")
+
+
+if __name__ == '__main__':
+    main()
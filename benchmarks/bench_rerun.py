@@ -0,0 +1,103 @@
+"""Per-rerun cost of fetching a division's data: st.cache_data copies vs the shared artifacts.
+
+``st.cache_data`` stores a pickle and unpickles it on every call, so each
+rerun of each session paid for a full copy of the JSON and of the fixtures
+frame with its base64 logos. The shared artifacts the division pages
+read now, frozen match records and the tables built from them, are
+handed out as references.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_rerun
+"""
+import logging
+import time
+
+import pandas as pd
+import streamlit as st
+
+from benchmarks import bench_standings
+from torneos.fixtures import fixture_rounds
+from torneos.logos import build_logo_dict
+from torneos.loader import read_json
+from torneos.standings import category_standings
+from torneos.ingest import data_versions
+from torneos.store import load_category_matches
+
+SLUGS = ['c13', 'copa2025']
+
+
+# The cached helpers as the division pages used them before the artifacts
+def team_logo(team, logo_dict):
+    for base_name in logo_dict.keys():
+        if team.startswith(base_name):
+            return logo_dict[base_name]
+    return logo_dict.get(team, "")
+
+
+@st.cache_data
+def legacy_load_json(file_name):
+    return read_json(file_name)
+
+
+@st.cache_data
+def legacy_process_fixtures(_data, category):
+    logo_dict, _ = build_logo_dict()
+    all_matches = []
+    for fecha in _data:
+        for match in fecha['Data']:
+            match['Fecha Numero'] = fecha['Fecha']
+            all_matches.append(match)
+    df = pd.DataFrame(all_matches)
+    df['Fecha'] = pd.to_datetime(df['Fecha'], format='%d/%m/%Y %H:%M', errors='coerce')
+    df['Local_Logo'] = df['Local'].apply(lambda x: team_logo(x, logo_dict))
+    df['Visitante_Logo'] = df['Visitante'].apply(lambda x: team_logo(x, logo_dict))
+    return df
+
+
+@st.cache_data
+def legacy_standings(_data, category):
+    logo_dict, _ = build_logo_dict()
+    rows = [m for f in _data if f['Fecha'].startswith('Fecha ') for m in f['Data']
+            if m['Visitante'].strip() and m['GL'] != '' and m['GV'] != '']
+    df_matches = pd.DataFrame(rows)
+    df_matches['GL'] = df_matches['GL'].astype(int)
+    df_matches['GV'] = df_matches['GV'].astype(int)
+    all_standings = bench_standings.legacy_standings(df_matches)
+    for df_standings in all_standings:
+        df_standings['Logo'] = df_standings['Team'].apply(lambda x: team_logo(x, logo_dict))
+    return all_standings
+
+
+def legacy_rerun(slug):
+    data = legacy_load_json(f'{slug}.json')
+    legacy_process_fixtures(data, slug)
+    legacy_standings(data, slug)
+
+
+def shared_rerun(slug):
+    versions = data_versions()
+    load_category_matches(slug, versions)
+    fixture_rounds(slug, versions)
+    category_standings(slug, versions)
+
+
+def per_call(func, *args, repeat=50):
+    func(*args)  # warm the caches
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"{'category':>9} {'cache_data ms':>14} {'shared ms':>10} {'speedup':>8}")
+    for slug in SLUGS:
+        legacy_time = per_call(legacy_rerun, slug)
+        shared_time = per_call(shared_rerun, slug)
+        print(f"{slug:>9} {legacy_time * 1000:>14.2f} {shared_time * 1000:>10.3f} {legacy_time / shared_time:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Current round: bisecting a precomputed round calendar vs scanning the matches on every rerun.
+
+Synthetic categories of growing length, one round a week, are asked for
+the current round at random moments before, during, between and after
+their rounds. Both ways must agree before they are timed.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_round_calendar
+"""
+import logging
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_category_json
+from torneos.round_calendar import ROUND_GRACE, RoundCalendar
+from torneos.store import category_matches
+
+# (rounds, matches per round)
+SIZES = [(15, 8), (200, 40), (2_000, 50)]
+QUERIES = 2_000
+
+
+def scan_current(matches, now):
+    """The current round by scanning every match: the earliest-starting round not yet over."""
+    spans = {}
+    for match in matches:
+        if match.kickoff is not None:
+            first, last = spans.get(match.round, (match.kickoff, match.kickoff))
+            spans[match.round] = (min(first, match.kickoff), max(last, match.kickoff))
+    if not spans:
+        return None
+    ordered = sorted(spans.items(), key=lambda item: item[1])
+    latest = None
+    for round, (_, last) in ordered:
+        latest = last if latest is None else max(latest, last)
+        if latest >= now - ROUND_GRACE:
+            return round
+    return ordered[-1][0]
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"{'rounds':>7} {'matches':>8} {'build ms':>9} {'scan µs':>10} {'bisect µs':>10} {'speedup':>8}")
+    for n_rounds, per_round in SIZES:
+        start_day = pd.Timestamp('2025-03-01')
+        matches = category_matches('synthetic', synthetic_category_json(n_rounds, per_round, start_day, seed=n_rounds))
+        rng = np.random.default_rng(n_rounds)
+        span = timedelta(days=7 * n_rounds + 14)
+        nows = [(start_day - timedelta(days=7) + span * fraction).to_pydatetime() for fraction in rng.random(QUERIES)]
+
+        start = time.perf_counter()
+        calendar = RoundCalendar(matches)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        current = [calendar.current(now) for now in nows]
+        bisect_time = (time.perf_counter() - start) / QUERIES
+        # The scan is slow enough on long seasons to sample fewer moments
+        sampled = range(0, QUERIES, max(1, QUERIES * n_rounds * per_round // 2_000_000))
+        start = time.perf_counter()
+        expected = [scan_current(matches, nows[i]) for i in sampled]
+        scan_time = (time.perf_counter() - start) / len(sampled)
+        assert [current[i] for i in sampled] == expected
+        print(f"{n_rounds:>7} {len(matches):>8} {build_time * 1000:>9.1f} {scan_time * 1e6:>10.0f} "
+              f"{bisect_time * 1e6:>10.2f} {scan_time / bisect_time:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""Resident memory: 14 per-page cache namespaces vs the shared core.
+
+Before the shared package, Home.py and each of the 13 division pages had
+its own ``st.cache_data`` functions, so every namespace parsed logos.json,
+base64-encoded every logo and kept its own pickled copies. ``legacy`` replays
+that work once per namespace; ``shared`` warms the torneos caches for every
+page. Each scenario runs in fresh interpreters: memory is the Python heap
+still held by the caches afterwards, as reported by tracemalloc, and the
+cold start is timed in separate runs without it. The shared core is about
+memory; its cold start is on par with the legacy pages, as splitting the
+fixtures into rounds costs what the 14 namespaces used to.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_shared_cache
+"""
+import gc
+import json
+import subprocess
+import sys
+import time
+
+CATEGORY_FILES = [
+    'elite', 'a1', 'a2', 'a3', 'senior', 'veteranos', 'femenino',
+    'c13', 'c15', 'c17', 'c20a1', 'c20a2', 'copa2025',
+]
+N_NAMESPACES = len(CATEGORY_FILES) + 1  # the division pages plus Home.py
+# Fresh interpreters timed per scenario, keeping the fastest
+REPEAT = 3
+
+
+# The per-page cached helpers as every division page defined them, with the
+# category suffix that gave each page its own cache namespace
+LEGACY_PAGE_SOURCE = """
+@st.cache_data
+def load_json_{slug}(file_path, category="{slug}"):
+    with open(file_path, 'r') as file:
+        return json.load(file)
+
+@st.cache_data
+def image_to_base64(image_path, _category="{slug}"):
+    mime_type, _ = mimetypes.guess_type(image_path)
+    with open(image_path, "rb") as image_file:
+        encoded = base64.b64encode(image_file.read()).decode('utf-8')
+    return f"data:{{mime_type}};base64,{{encoded}}"
+
+@st.cache_data
+def build_logo_dict(_logos_data, root_path, _category="{slug}"):
+    return {{item['equipo']: image_to_base64(f"{{root_path}}{{item['logo']}}", _category="{slug}") for item in _logos_data}}
+
+@st.cache_data
+def process_fixtures_{slug}(_data, category="{slug}"):
+    all_matches = []
+    for fecha in _data:
+        for match in fecha['Data']:
+            match['Fecha Numero'] = fecha['Fecha']
+            all_matches.append(match)
+    df = pd.DataFrame(all_matches)
+    df['Local_Logo'] = df['Local'].apply(lambda x: logo_dict.get(get_base_team_name(x), ""))
+    df['Visitante_Logo'] = df['Visitante'].apply(lambda x: logo_dict.get(get_base_team_name(x), ""))
+    return df
+
+def get_base_team_name(team):
+    for base_name in logo_dict.keys():
+        if team.startswith(base_name):
+            return base_name
+    return team
+
+logos_data = load_json_{slug}(f'{{root_path}}/data/logos.json', category="{slug}")
+logo_dict = build_logo_dict(logos_data, root_path, _category="{slug}")
+data = load_json_{slug}(f'{{root_path}}/data/{file_name}', category="{slug}")
+process_fixtures_{slug}(data, category="{slug}")
+"""
+
+
+def run_legacy():
+    import base64
+    import mimetypes
+
+    import pandas as pd
+    import streamlit as st
+
+    from torneos.loader import ROOT_PATH
+
+    # Home.py read every category file through its own namespace as well
+    for namespace, slug in enumerate(CATEGORY_FILES + ['home']):
+        file_name = f"{CATEGORY_FILES[namespace % len(CATEGORY_FILES)]}.json"
+        source = LEGACY_PAGE_SOURCE.format(slug=slug, file_name=file_name)
+        code = compile(source, f"pages/{slug}.py", 'exec')
+        exec(code, {
+            'st': st, 'json': json, 'pd': pd, 'base64': base64,
+            'mimetypes': mimetypes, 'root_path': ROOT_PATH, '__name__': slug,
+        })
+
+
+def run_shared():
+    from torneos.fixtures import fixture_rounds
+    from torneos.logos import build_logo_dict
+    from torneos.ingest import data_versions
+
+    build_logo_dict()
+    versions = data_versions()
+    for slug in CATEGORY_FILES:
+        fixture_rounds(slug, versions)
+
+
+def scenario(name, measure):
+    import logging
+
+    import tracemalloc
+
+    import pandas as pd
+    import streamlit as st
+
+    logging.disable(logging.CRITICAL)
+    # Load the caching and date parsing machinery before measuring
+    st.cache_data(lambda: pd.DataFrame({'a': [1]}))()
+    st.cache_resource(lambda: None)()
+    pd.to_datetime('09/08/2025 16:00', format='%d/%m/%Y %H:%M')
+    gc.collect()
+    if measure == 'memory':
+        tracemalloc.start()
+    start = time.perf_counter()
+    {'legacy': run_legacy, 'shared': run_shared}[name]()
+    elapsed = time.perf_counter() - start
+    if measure == 'memory':
+        gc.collect()
+        print(json.dumps(tracemalloc.get_traced_memory()[0]))
+    else:
+        print(json.dumps(elapsed))
+
+
+def run_scenario(name, measure):
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_shared_cache', name, measure],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'scenario':>8} {'cold start ms':>14} {'cached MB':>10}")
+    for name in ['legacy', 'shared']:
+        # Timed without tracemalloc, which slows every allocation down
+        seconds = min(run_scenario(name, 'time') for _ in range(REPEAT))
+        retained = run_scenario(name, 'memory')
+        print(f"{name:>8} {seconds * 1000:>14.1f} {retained / 2 ** 20:>10.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        scenario(*sys.argv[1:])
+    else:
+        main()
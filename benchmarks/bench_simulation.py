@@ -0,0 +1,214 @@
+"""Season simulator: vectorized batches over a process pool vs one simulation at a time.
+
+Checks first, on the real data, that every zone's place probabilities
+sum to one per team and per place, that a zone with nothing left to play
+keeps its table, that the pool gives exactly the in-process odds, that
+simulated tables are ranked as ``table_order`` ranks a real one and that
+the simulations artifact of a category is only re-simulated when its
+results change. A worker killed in the shared pool must only cost a new pool,
+and other artifacts must keep building while the simulations do.
+Then a synthetic league of 13 categories with a season half played is
+refreshed with growing numbers of workers, and a Python loop that plays
+one simulation at a time is timed for comparison.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_simulation
+"""
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_category_json
+from torneos.artifacts import RULES, ArtifactGraph
+from torneos.categories import CATEGORIES, CATEGORIES_BY_SLUG
+from torneos.ingest import data_versions
+from torneos.loader import read_json
+from torneos.ratings import build_ratings
+from torneos.simulation import (SIMULATIONS, build_simulations, simulate_categories, simulate_in_pool, simulated_tables,
+                                simulation_pool, zone_seasons)
+from torneos.standings import POINTS_DRAW, POINTS_WIN, StandingsState
+from torneos.store import category_matches
+from torneos.tiebreakers import DEFAULT_TIEBREAKERS, GOAL_DIFFERENCE, GOALS_FOR, H2H_POINTS, table_order, table_places
+
+LOOP_SIMULATIONS = 2_000
+TIE_BREAK_SIMULATIONS = 200
+CHAINS = [DEFAULT_TIEBREAKERS, (GOAL_DIFFERENCE, H2H_POINTS, GOALS_FOR)]
+
+
+def check_real_data():
+    matches_by_slug = {category.slug: category_matches(category.slug, read_json(category.json_file)) for category in CATEGORIES}
+    odds = simulate_categories(matches_by_slug, n_simulations=20_000)
+    with ProcessPoolExecutor(2) as pool:
+        pooled = simulate_categories(matches_by_slug, n_simulations=20_000, pool=pool)
+    for slug, zones in odds.items():
+        state = StandingsState.from_matches(matches_by_slug[slug], CATEGORIES_BY_SLUG[slug].tiebreakers)
+        for zone_odds, zone_pooled in zip(zones, pooled[slug]):
+            assert np.array_equal(zone_odds.probabilities, zone_pooled.probabilities)
+            assert np.allclose(zone_odds.probabilities.sum(axis=0), 1)
+            assert np.allclose(zone_odds.probabilities.sum(axis=1), 1)
+            if not zone_odds.remaining:
+                assert list(zone_odds.teams) == [row[0] for row in state.table(zone_odds.zone)]
+                assert np.array_equal(zone_odds.probabilities, np.eye(len(zone_odds.teams)))
+
+
+def tie_breaks():
+    """Simulated tables, ties and all, get the places ``table_order`` gives each of them."""
+    for category in CATEGORIES:
+        matches = category_matches(category.slug, read_json(category.json_file))
+        for criteria in CHAINS:
+            for season in zone_seasons(matches, criteria):
+                if len(season.home) == 0:
+                    continue
+                tables = simulated_tables(season, TIE_BREAK_SIMULATIONS, np.random.default_rng(0))
+                places = table_places(season.teams, *tables, criteria=criteria)
+                for simulation in range(TIE_BREAK_SIMULATIONS):
+                    order = table_order(season.teams, *(stat[simulation] for stat in tables), None, criteria)
+                    assert places[simulation, order].tolist() == list(range(len(order)))
+
+
+def incremental_artifact():
+    """After one category changes, only its simulations artifact is simulated again."""
+    loaded = [(category_matches(category.slug, read_json(category.json_file)), None) for category in CATEGORIES]
+    ratings = build_ratings(*loaded)
+    previous = [build_simulations(ratings, matches, category.slug) for category, matches in zip(CATEGORIES, loaded)]
+    edited = list(loaded)
+    matches = list(edited[0][0])
+    first_pending = next(i for i, match in enumerate(matches) if match.regular_season and not match.played and not match.is_bye)
+    matches[first_pending] = replace(matches[first_pending], home_goals=3, away_goals=1)
+    edited[0] = (tuple(matches), None)
+    ratings = build_ratings(*edited, previous=ratings)
+    updated = [
+        build_simulations(ratings, matches, category.slug, previous=value)
+        for category, matches, value in zip(CATEGORIES, edited, previous)
+    ]
+    changed = [category.slug for category, new, old in zip(CATEGORIES, updated, previous) if new is not old]
+    assert changed == [CATEGORIES[0].slug]
+    assert updated[0][1][0].remaining == previous[0][1][0].remaining - 1
+
+
+def broken_pool():
+    """A worker killed in the shared pool breaks it; the next simulation replaces it and succeeds."""
+    matches_by_slug = {category.slug: category_matches(category.slug, read_json(category.json_file)) for category in CATEGORIES}
+    pool = simulation_pool()
+    list(pool.map(abs, range(2)))
+    for process in list(pool._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+    time.sleep(0.5)
+    odds = simulate_in_pool(matches_by_slug, None)
+    assert simulation_pool() is not pool
+    assert set(odds) == set(matches_by_slug)
+
+
+def concurrent_builds():
+    """While the simulations artifact builds, another session still gets other artifacts built."""
+    rule = RULES['simulations']
+    started, release = threading.Event(), threading.Event()
+    simulate = rule.build
+
+    def slow_build(*args, **kwargs):
+        started.set()
+        release.wait(60)
+        return simulate(*args, **kwargs)
+
+    rule.build = slow_build
+    try:
+        with tempfile.TemporaryDirectory() as path:
+            graph = ArtifactGraph(path)
+            versions = data_versions()
+            simulations = threading.Thread(target=graph.get, args=(('simulations', CATEGORIES[0].slug), versions))
+            simulations.start()
+            assert started.wait(60)
+            start = time.perf_counter()
+            graph.get(('standings', CATEGORIES[0].slug), versions)
+            assert simulations.is_alive(), "standings waited for the simulations"
+            seconds = time.perf_counter() - start
+            release.set()
+            simulations.join()
+    finally:
+        rule.build = simulate
+        release.set()
+    return seconds
+
+
+def synthetic_league():
+    return {
+        f"cat{i}": category_matches(f"cat{i}", synthetic_category_json(30, 8, pd.Timestamp('2025-03-01'), seed=i, played=0.5))
+        for i in range(13)
+    }
+
+
+def loop_simulations(matches, n_simulations):
+    """Place counts of one zone, playing every simulation match by match in Python."""
+    season = zone_seasons(matches, DEFAULT_TIEBREAKERS)[0]
+    rng = np.random.default_rng(0)
+    n_teams = len(season.teams)
+    counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    for _ in range(n_simulations):
+        points = season.points.tolist()
+        goal_difference = season.goal_difference.tolist()
+        goals_for = season.goals_for.tolist()
+        pair_points = season.pair_points.copy()
+        pair_goals = season.pair_goals.copy()
+        for home, away, home_rate, away_rate in zip(season.home, season.away, season.home_rate, season.away_rate):
+            home_goals, away_goals = rng.poisson(home_rate), rng.poisson(away_rate)
+            points[home] += POINTS_WIN if home_goals > away_goals else POINTS_DRAW if home_goals == away_goals else 0
+            points[away] += POINTS_WIN if away_goals > home_goals else POINTS_DRAW if home_goals == away_goals else 0
+            goal_difference[home] += home_goals - away_goals
+            goal_difference[away] += away_goals - home_goals
+            goals_for[home] += home_goals
+            goals_for[away] += away_goals
+            pair_points[home, away] += POINTS_WIN if home_goals > away_goals else POINTS_DRAW if home_goals == away_goals else 0
+            pair_points[away, home] += POINTS_WIN if away_goals > home_goals else POINTS_DRAW if home_goals == away_goals else 0
+            pair_goals[home, away] += home_goals
+            pair_goals[away, home] += away_goals
+        order = table_order(season.teams, points, goal_difference, goals_for, pair_points, pair_goals, None, season.tiebreakers)
+        for place, team in enumerate(order):
+            counts[team, place] += 1
+    return counts
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    check_real_data()
+    print("real data: probabilities sum to one, finished zones keep their table, pool matches in-process")
+    tie_breaks()
+    print("simulated tables are ranked by the tie-breakers like the real ones")
+    incremental_artifact()
+    print("a new result re-simulates only its own category")
+    broken_pool()
+    print("a killed worker only costs a new pool")
+    seconds = concurrent_builds()
+    print(f"standings built in {seconds * 1000:.0f} ms while the simulations were building")
+
+    league = synthetic_league()
+    remaining = sum(not match.played for matches in league.values() for match in matches)
+    print(f"synthetic league: {len(league)} categories, {remaining} matches left, {SIMULATIONS:,} simulations each")
+    start = time.perf_counter()
+    loop_simulations(league['cat0'], LOOP_SIMULATIONS)
+    loop_time = (time.perf_counter() - start) / LOOP_SIMULATIONS * SIMULATIONS * len(league)
+    print(f"{'one at a time (extrapolated)':>30} {loop_time:>8.1f} s")
+    start = time.perf_counter()
+    simulate_categories(league)
+    print(f"{'vectorized, no pool':>30} {time.perf_counter() - start:>8.1f} s")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ProcessPoolExecutor(workers) as pool:
+            # Start the workers before timing
+            list(pool.map(abs, range(workers)))
+            start = time.perf_counter()
+            simulate_categories(league, pool=pool)
+            print(f"{f'vectorized, {workers} workers':>30} {time.perf_counter() - start:>8.1f} s")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
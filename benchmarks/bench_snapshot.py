@@ -0,0 +1,99 @@
+"""Loading matches: JSON parse plus Python flattening vs the memory-mapped snapshot.
+
+Checks first that the matches built from the snapshot hold exactly the
+records the JSON loader produces, on the real data, and that the scorers
+match the CSV path. Then times both loaders on multi-season synthetic data.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_snapshot
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_category_json
+from torneos.categories import CATEGORIES
+from torneos.ingest import data_versions
+from torneos.loader import read_json
+from torneos.snapshot import matches_table, read_statistics, read_table, write_table
+from torneos.statistics import category_statistics
+from torneos.store import category_matches, load_category_matches, table_matches
+
+N_CATEGORIES = 13
+SEASONS = [1, 5, 20]
+ROUNDS_PER_SEASON = 30
+MATCHES_PER_ROUND = 8
+
+
+def check_real_data():
+    versions = data_versions()
+    for category in CATEGORIES:
+        matches, _ = load_category_matches(category.slug, versions)
+        assert matches == category_matches(category.slug, read_json(category.json_file))
+        df = read_statistics(category.stats_file).sort_values(by=['Goals', 'Player'], ascending=[False, True])
+        df_stats = category_statistics(category.slug, versions)
+        assert df_stats['Player'].tolist() == df['Player'].tolist()
+        assert df_stats['Goals'].tolist() == df['Goals'].tolist()
+        assert df_stats['Club'].astype(str).tolist() == df['Club'].tolist()
+
+
+def json_load(paths):
+    matches = []
+    for slug, path in paths.items():
+        with open(path) as file:
+            matches.extend(category_matches(slug, json.load(file)))
+    return matches
+
+
+def snapshot_columns(path):
+    return read_table(path)
+
+
+def snapshot_load(path):
+    return list(table_matches(read_table(path)))
+
+
+def best_of(func, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    check_real_data()
+    print(f"{'seasons':>8} {'matches':>8} {'json ms':>8} {'snapshot ms':>12} {'columns ms':>11} {'json MB':>8} {'arrow MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for seasons in SEASONS:
+            data_by_slug = {
+                f"cat{i}": synthetic_category_json(ROUNDS_PER_SEASON * seasons, MATCHES_PER_ROUND, pd.Timestamp('2015-03-01'), seed=i)
+                for i in range(N_CATEGORIES)
+            }
+            paths = {}
+            for slug, data in data_by_slug.items():
+                paths[slug] = os.path.join(tmp, f"{slug}.json")
+                with open(paths[slug], 'w') as file:
+                    json.dump(data, file)
+            snapshot_path = os.path.join(tmp, f"matches-{seasons}.arrow")
+            write_table(snapshot_path, matches_table(data_by_slug))
+
+            from_json, json_time = best_of(json_load, paths)
+            from_snapshot, snapshot_time = best_of(snapshot_load, snapshot_path)
+            _, columns_time = best_of(snapshot_columns, snapshot_path)
+            assert from_json == from_snapshot
+            json_size = sum(os.path.getsize(path) for path in paths.values()) / 2**20
+            arrow_size = os.path.getsize(snapshot_path) / 2**20
+            print(f"{seasons:>8} {len(from_json):>8} {json_time * 1000:>8.0f} {snapshot_time * 1000:>12.0f} "
+                  f"{columns_time * 1000:>11.2f} {json_size:>8.1f} {arrow_size:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
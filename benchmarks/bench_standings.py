@@ -0,0 +1,84 @@
+"""Compare the standings engine the pages use with the old per-row loop.
+
+The engine is ``StandingsState.from_results``, the one-pass build every
+category's standings start from, and the tables it gives. The old loop
+broke ties by goal difference and name only, so the engine is run with
+goal difference as its single tie-breaker for the comparison.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_standings
+"""
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import frame_results, synthetic_matches
+from torneos.standings import StandingsState
+from torneos.tiebreakers import GOAL_DIFFERENCE
+
+
+# The iterrows loop every division page used before the shared engine
+def legacy_standings(df_matches):
+    all_standings = []
+    for zona in sorted(df_matches['Zona'].unique()):
+        df_zona = df_matches[df_matches['Zona'] == zona]
+        teams = pd.unique(df_zona[['Local', 'Visitante']].values.ravel('K'))
+        standings = {team: {'MP': 0, 'W': 0, 'D': 0, 'L': 0, 'Pts': 0, 'GF': 0, 'GA': 0, 'GD': 0} for team in teams}
+        for _, match in df_zona.iterrows():
+            local = match['Local']
+            visitante = match['Visitante']
+            gl = match['GL']
+            gv = match['GV']
+            standings[local]['MP'] += 1
+            standings[visitante]['MP'] += 1
+            standings[local]['GF'] += gl
+            standings[local]['GA'] += gv
+            standings[visitante]['GF'] += gv
+            standings[visitante]['GA'] += gl
+            if gl > gv:
+                standings[local]['W'] += 1
+                standings[local]['Pts'] += 2
+                standings[visitante]['L'] += 1
+            elif gl < gv:
+                standings[local]['L'] += 1
+                standings[visitante]['W'] += 1
+                standings[visitante]['Pts'] += 2
+            else:
+                standings[local]['D'] += 1
+                standings[local]['Pts'] += 1
+                standings[visitante]['D'] += 1
+                standings[visitante]['Pts'] += 1
+        for team in standings:
+            standings[team]['GD'] = standings[team]['GF'] - standings[team]['GA']
+        df_standings = pd.DataFrame([{'Zona': zona, 'Team': team, **stats} for team, stats in standings.items()])
+        df_standings = df_standings.sort_values(by=['Pts', 'GD', 'Team'], ascending=[False, False, True])
+        all_standings.append(df_standings.reset_index(drop=True))
+    return all_standings
+
+
+def best_of(func, *args, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    print(f"{'matches':>8} {'zones':>6} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}")
+    for n_matches, n_zones in [(100, 1), (1_000, 1), (5_000, 8), (20_000, 8), (100_000, 32)]:
+        df_matches = synthetic_matches(n_matches, n_teams=16, n_zones=n_zones, seed=n_matches)
+        repeat = 1 if n_matches >= 20_000 else 3
+        legacy_time, expected = best_of(legacy_standings, df_matches, repeat=repeat)
+        results = frame_results(df_matches)
+        engine_time, result = best_of(lambda: StandingsState.from_results(results, (GOAL_DIFFERENCE,)).frames())
+        for want, got in zip(expected, result):
+            pd.testing.assert_frame_equal(want, got[want.columns], check_dtype=False)
+        print(f"{n_matches:>8} {n_zones:>6} {legacy_time * 1000:>10.1f} {engine_time * 1000:>10.1f} "
+              f"{legacy_time / engine_time:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
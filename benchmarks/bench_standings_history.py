@@ -0,0 +1,64 @@
+"""Standings after every round: one cumulative pass vs replaying the rounds.
+
+For synthetic seasons of growing length, the table after each round is
+checked against a ``StandingsState`` given the results one round at a
+time, which is also the way of getting the history this replaces: one
+table per zone and round, each re-sorted in Python.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_standings_history
+"""
+import logging
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_category_json
+from torneos.standings import DEFAULT_ZONE, StandingsState, standings_history
+from torneos.store import category_matches
+
+ROUNDS = [15, 60, 240]
+MATCHES_PER_ROUND = 10
+
+
+def per_round_replay(matches):
+    """Zone tables after each round with results, entering each round's results into one state."""
+    rounds = {}
+    for i, match in enumerate(matches):
+        if match.regular_season and match.played:
+            rounds.setdefault(match.round, []).append((i, match))
+    state = StandingsState()
+    tables = []
+    for round_matches in rounds.values():
+        # Keyed by position, as a synthetic round may pair two teams twice
+        for i, match in round_matches:
+            state.set_result(i, match.home, match.away, match.zone or DEFAULT_ZONE, match.home_goals, match.away_goals)
+        tables.append(state.frames())
+    return tables
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"{'rounds':>7} {'matches':>8} {'replay ms':>13} {'cumulative ms':>14} {'speedup':>8}")
+    for n_rounds in ROUNDS:
+        matches = category_matches(
+            'synthetic', synthetic_category_json(n_rounds, MATCHES_PER_ROUND, pd.Timestamp('2015-03-01'), seed=n_rounds, played=0.9)
+        )
+        expected, replay_time = timed(per_round_replay, matches)
+        (history,), cumulative_time = timed(standings_history, matches)
+        assert len(expected) == len(history.rounds)
+        for round_index, (want,) in enumerate(expected):
+            pd.testing.assert_frame_equal(want, history.table(round_index), check_dtype=False)
+        print(f"{n_rounds:>7} {len(matches):>8} {replay_time * 1000:>13.1f} {cumulative_time * 1000:>14.1f} "
+              f"{replay_time / cumulative_time:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
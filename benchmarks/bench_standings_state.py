@@ -0,0 +1,167 @@
+"""Incremental standings: one result at a time vs recomputing the whole table.
+
+Random seasons get random sequences of new results, score corrections and
+removed results. After every change the incremental tables must equal
+those of a fresh state given only the results entered so far. The standings
+artifact, updated from its previous value, must also equal a fresh build
+after a file edit. Last, the cost of one change is timed against building
+the state again as seasons grow.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_standings_state
+"""
+import logging
+import time
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import standings_frames, synthetic_category_json
+from torneos.ingest import LOGOS_FILE
+from torneos.loader import data_file
+from torneos.standings import STAT_COLUMNS, StandingsState, build_standings
+from torneos.store import category_matches
+
+SEEDS = range(5)
+CHANGES_PER_SEASON = 400
+SIZES = [1_000, 10_000, 100_000]
+
+
+def season_fixtures(rng, n_zones, teams_per_zone, n_rounds):
+    """(round, home, away, zone) of a season where no pairing repeats within a round."""
+    fixtures = []
+    for round_number in range(n_rounds):
+        for zone in range(n_zones):
+            teams = rng.permutation(teams_per_zone)
+            for home, away in zip(teams[::2], teams[1::2]):
+                fixtures.append((f"Fecha {round_number + 1}", f"Team {zone}-{home}", f"Team {zone}-{away}", f"ZONA {zone + 1}"))
+    return fixtures
+
+
+def results_frame(results):
+    return pd.DataFrame(
+        [(home, away, home_goals, away_goals, zone) for (_, home, away), (zone, home_goals, away_goals) in results.items()],
+        columns=['Local', 'Visitante', 'GL', 'GV', 'Zona'],
+    )
+
+
+def assert_same_tables(state, results, frames=False):
+    expected = standings_frames(results_frame(results))
+    assert state.zones() == [df['Zona'].iloc[0] for df in expected]
+    for want in expected:
+        have = state.table(want['Zona'].iloc[0])
+        assert have == list(want[['Team'] + STAT_COLUMNS].itertuples(index=False, name=None))
+    if frames:
+        for want, have in zip(expected, state.frames()):
+            pd.testing.assert_frame_equal(want, have, check_dtype=False)
+
+
+def random_changes(seed):
+    """Apply random changes to a state and check it against a fresh one after each."""
+    rng = np.random.default_rng(seed)
+    fixtures = season_fixtures(rng, n_zones=int(rng.integers(1, 5)), teams_per_zone=int(rng.integers(4, 12)) * 2, n_rounds=15)
+    state = StandingsState()
+    results = {}
+    for _ in range(CHANGES_PER_SEASON):
+        action = rng.random()
+        if results and action < 0.15:
+            key = list(results)[rng.integers(len(results))]
+            del results[key]
+            state.remove_result(*key)
+        else:
+            if results and action < 0.35:
+                round, home, away = list(results)[rng.integers(len(results))]
+                zone = results[(round, home, away)][0]
+            else:
+                round, home, away, zone = fixtures[rng.integers(len(fixtures))]
+            result = (zone, int(rng.poisson(3.0)), int(rng.poisson(2.6)))
+            results[(round, home, away)] = result
+            state.set_result(round, home, away, *result)
+        assert_same_tables(state, results)
+    assert_same_tables(state, results, frames=True)
+    return len(results)
+
+
+def snapshot(value):
+    state, frames, _ = value
+    return len(state), {zone: state.table(zone) for zone in state.zones()}, [df.copy() for df in frames]
+
+
+def assert_unchanged(value, before):
+    """``value`` still holds what ``snapshot`` took of it: an update never writes what sessions were handed."""
+    after = snapshot(value)
+    assert after[:2] == before[:2]
+    for have, want in zip(after[2], before[2], strict=True):
+        pd.testing.assert_frame_equal(have, want)
+
+
+def incremental_artifact():
+    """The standings artifact updated from its previous value equals a fresh build and leaves the previous value as it was."""
+    matches = category_matches('synthetic', synthetic_category_json(30, 8, pd.Timestamp('2025-03-01'), seed=3, played=0.8))
+    previous = build_standings((matches, None), data_file(LOGOS_FILE), 'c13')
+    before = snapshot(previous)
+    edited = list(matches)
+    for i, match in enumerate(edited[:40]):
+        if i % 3 == 0:
+            edited[i] = replace(match, home_goals=(match.home_goals or 0) + 1, away_goals=match.away_goals or 0)
+        elif i % 3 == 1:
+            edited[i] = replace(match, home_goals=None, away_goals=None)
+    updated = build_standings((tuple(edited), None), data_file(LOGOS_FILE), 'c13', previous=previous)
+    assert updated[0] is not previous[0]
+    assert_unchanged(previous, before)
+    fresh = build_standings((tuple(edited), None), data_file(LOGOS_FILE), 'c13')
+    assert len(updated[1]) == len(fresh[1])
+    for have, want in zip(updated[1], fresh[1]):
+        pd.testing.assert_frame_equal(have, want)
+
+    # Back to the original results from the update, which shares zones with both
+    edited_before = snapshot(updated)
+    reverted = build_standings((matches, None), data_file(LOGOS_FILE), 'c13', previous=updated)
+    assert_unchanged(updated, edited_before)
+    assert_unchanged(previous, before)
+    assert_unchanged(reverted, before)
+
+
+def change_cost(n_results):
+    rng = np.random.default_rng(n_results)
+    fixtures = season_fixtures(rng, n_zones=8, teams_per_zone=20, n_rounds=n_results // 80 + 1)[:n_results]
+    results = {
+        (round, home, away): (zone, int(rng.poisson(3.0)), int(rng.poisson(2.6)))
+        for round, home, away, zone in fixtures
+    }
+    state = StandingsState()
+    state.sync(results)
+
+    keys = list(results)
+    repeat = 200
+    start = time.perf_counter()
+    for i in range(repeat):
+        round, home, away = keys[i]
+        zone = results[(round, home, away)][0]
+        state.set_result(round, home, away, zone, i % 5, 2)
+        state.table(zone)
+    incremental = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    StandingsState.from_results(results).frames()
+    full = time.perf_counter() - start
+    return incremental, full
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    for seed in SEEDS:
+        entered = random_changes(seed)
+        print(f"season {seed}: {CHANGES_PER_SEASON} random changes, {entered} results left, tables match after each")
+    incremental_artifact()
+    print("standings artifact updated from its previous value matches a fresh build, previous value untouched")
+    print(f"{'results':>8} {'change + re-sort us':>20} {'full rebuild ms':>18}")
+    for n_results in SIZES:
+        incremental, full = change_cost(n_results)
+        print(f"{n_results:>8} {incremental * 1e6:>20.1f} {full * 1000:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Team -> logo resolution: linear prefix scan per row vs the TeamResolver.
+
+The scan tried every club with ``startswith`` for every row, so its cost was
+rows x clubs, and its answer depended on the order of logos.json when one
+club name prefixes another. The resolver does one dict hit per word of each
+distinct name.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_team_resolver
+"""
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from torneos.categories import CATEGORIES
+from torneos.logos import TeamResolver, build_logo_dict
+from torneos.store import load_category_matches
+
+SUFFIXES = ['', ' A', ' B', ' C', ' Azul', ' Blanco']
+
+
+def get_base_team_name(team, logo_dict):
+    for base_name in logo_dict.keys():
+        if team.startswith(base_name):
+            return base_name
+    return team
+
+
+def scan_logos(teams, logo_dict):
+    return teams.apply(lambda team: logo_dict.get(get_base_team_name(team, logo_dict), ""))
+
+
+def synthetic_teams(n_clubs, n_rows, seed=0):
+    """Logo dict of ``n_clubs`` clubs and ``n_rows`` team names drawn from their squads."""
+    rng = np.random.default_rng(seed)
+    logo_dict = {f"Club {i}": f"logo-{i}" for i in range(n_clubs)}
+    squads = [f"Club {i}{suffix}" for i in range(n_clubs) for suffix in SUFFIXES]
+    teams = pd.Series(np.array(squads, dtype=object)[rng.integers(0, len(squads), n_rows)])
+    return logo_dict, teams
+
+
+def check_real_teams():
+    """Both agree on every team in the data, with either club order, and every team has a logo."""
+    logo_dict, _ = build_logo_dict()
+    teams = pd.Series(sorted({
+        team for category in CATEGORIES for match in load_category_matches(category.slug)[0]
+        for team in (match.home, match.away)
+    }))
+    expected = TeamResolver(logo_dict).logos(teams)
+    for ordered in (logo_dict, dict(sorted(logo_dict.items(), key=lambda item: -len(item[0])))):
+        assert scan_logos(teams, ordered).equals(expected)
+        assert TeamResolver(ordered).logos(teams).equals(expected)
+    assert (expected[teams != ""] != "").all()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    check_real_teams()
+    print(f"{'clubs':>6} {'rows':>8} {'scan ms':>9} {'resolver ms':>12} {'speedup':>8}")
+    for n_clubs, n_rows in [(20, 10_000), (200, 100_000), (2_000, 100_000)]:
+        logo_dict, teams = synthetic_teams(n_clubs, n_rows)
+        # Longest names first so the scan finds "Club 12" before "Club 1"
+        logo_dict = dict(sorted(logo_dict.items(), key=lambda item: -len(item[0])))
+        scanned, scan_time = timed(scan_logos, teams, logo_dict)
+        resolved, resolver_time = timed(lambda: TeamResolver(logo_dict).logos(teams))
+        assert scanned.equals(resolved)
+        print(f"{n_clubs:>6} {n_rows:>8} {scan_time * 1000:>9.1f} {resolver_time * 1000:>12.1f} {scan_time / resolver_time:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
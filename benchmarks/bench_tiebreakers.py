@@ -0,0 +1,141 @@
+"""Tie-breakers: pairwise matrices vs rescanning the matches of every tie group.
+
+Low-scoring synthetic leagues with few matches per team leave many teams
+level on points, up to groups of hundreds. Every zone is ordered by
+``table_order`` on its precomputed head-to-head matrices and by a
+brute-force rescan that recomputes each tie group's head-to-head table
+from the matches among its teams, for several criteria chains and with
+and without fair play points. Both start from the same per-zone inputs,
+built once outside the timings; the orders must match.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tiebreakers
+"""
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import frame_results
+from torneos.standings import POINTS_DRAW, POINTS_WIN, StandingsState, fair_play_points
+from torneos.tiebreakers import (DEFAULT_TIEBREAKERS, FAIR_PLAY, GOAL_DIFFERENCE, GOALS_FOR, H2H_GOAL_DIFFERENCE,
+                                 H2H_POINTS, table_order)
+
+CHAINS = [
+    DEFAULT_TIEBREAKERS,
+    (GOAL_DIFFERENCE, H2H_POINTS, GOALS_FOR),
+    (FAIR_PLAY, H2H_GOAL_DIFFERENCE),
+]
+# (teams per zone, matches per zone, zones)
+LEAGUES = [(8, 20, 4), (20, 120, 8), (200, 600, 2), (2_000, 3_000, 1)]
+
+
+def tied_league(n_teams, n_matches, n_zones, seed):
+    rng = np.random.default_rng(seed)
+    zone = np.repeat(np.arange(n_zones), n_matches)
+    home = rng.integers(0, n_teams, len(zone))
+    away = (home + rng.integers(1, n_teams, len(zone))) % n_teams
+    return pd.DataFrame({
+        'Local': [f"Team {z}-{t}" for z, t in zip(zone, home)],
+        'Visitante': [f"Team {z}-{t}" for z, t in zip(zone, away)],
+        'GL': rng.poisson(0.8, len(zone)),
+        'GV': rng.poisson(0.7, len(zone)),
+        'Zona': [f"ZONA {z + 1}" for z in zone],
+    })
+
+
+def match_table(matches, teams):
+    """team -> [points, goal difference, goals for] over ``matches`` (Local, Visitante, GL, GV tuples)."""
+    table = {team: [0, 0, 0] for team in teams}
+    for home, away, home_goals, away_goals in matches:
+        for team, goals_for, goals_against in ((home, home_goals, away_goals), (away, away_goals, home_goals)):
+            row = table[team]
+            row[0] += POINTS_WIN if goals_for > goals_against else POINTS_DRAW if goals_for == goals_against else 0
+            row[1] += goals_for - goals_against
+            row[2] += goals_for
+    return table
+
+
+def rescan_order(matches, teams, criteria, fair_play):
+    """Table order of one zone's ``teams``, rescanning the matches among each tie group."""
+    table = match_table(matches, teams)
+
+    def value(criterion, team, group):
+        if criterion in (H2H_POINTS, H2H_GOAL_DIFFERENCE):
+            among = [match for match in matches if match[0] in group and match[1] in group]
+            return match_table(among, group)[team][0 if criterion == H2H_POINTS else 1]
+        if criterion == GOAL_DIFFERENCE:
+            return table[team][1]
+        if criterion == GOALS_FOR:
+            return table[team][2]
+        return -(fair_play or {}).get(team, 0)
+
+    def resolve(group):
+        if len(group) == 1:
+            return group
+        for criterion in criteria:
+            values = {team: value(criterion, team, set(group)) for team in group}
+            if len(set(values.values())) > 1:
+                return [
+                    team
+                    for level in sorted(set(values.values()), reverse=True)
+                    for team in resolve(sorted(team for team in group if values[team] == level))
+                ]
+        return sorted(group)
+
+    order = []
+    for level in sorted({row[0] for row in table.values()}, reverse=True):
+        order.extend(resolve([team for team in teams if table[team][0] == level]))
+    return order
+
+
+def zone_inputs(df_matches):
+    """zone -> (matches, teams, table_order arguments) of every zone of ``df_matches``."""
+    state = StandingsState.from_results(frame_results(df_matches))
+    inputs = {}
+    for zone in state.zones():
+        df_zone = df_matches[df_matches['Zona'] == zone]
+        teams = sorted(state._zone_rows(zone))
+        stats = [state._zone_rows(zone)[team] for team in teams]
+        arguments = (
+            teams,
+            [w * POINTS_WIN + d * POINTS_DRAW for _, w, d, _, _, _ in stats],
+            [gf - ga for _, _, _, _, gf, ga in stats],
+            [gf for _, _, _, _, gf, _ in stats],
+            *state._pair_block(zone, teams),
+        )
+        matches = list(df_zone[['Local', 'Visitante', 'GL', 'GV']].itertuples(index=False, name=None))
+        inputs[zone] = matches, teams, arguments
+    return inputs
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"{'teams':>6} {'matches':>8} {'zones':>6} {'largest tie':>12} {'rescan ms':>10} {'engine ms':>10}")
+    for n_teams, n_matches, n_zones in LEAGUES:
+        df_matches = tied_league(n_teams, n_matches, n_zones, seed=n_teams)
+        rng = np.random.default_rng(n_matches)
+        teams = sorted(set(df_matches['Local']) | set(df_matches['Visitante']))
+        fair_play = {team: int(points) for team, points in zip(teams, rng.integers(0, 4, len(teams))) if points}
+        inputs = zone_inputs(df_matches)
+        rescan_time = engine_time = 0
+        for criteria in CHAINS:
+            for zone_fair_play in (None, fair_play):
+                for matches, teams, arguments in inputs.values():
+                    points = fair_play_points(teams, zone_fair_play)
+                    start = time.perf_counter()
+                    order = table_order(*arguments, points, criteria)
+                    engine_time += time.perf_counter() - start
+                    start = time.perf_counter()
+                    expected = rescan_order(matches, teams, criteria, zone_fair_play)
+                    rescan_time += time.perf_counter() - start
+                    assert [teams[i] for i in order] == expected, criteria
+        largest = max(max(np.unique(arguments[1], return_counts=True)[1]) for _, _, arguments in inputs.values())
+        print(f"{n_teams:>6} {n_matches * n_zones:>8} {n_zones:>6} {largest:>12} "
+              f"{rescan_time * 1000:>10.1f} {engine_time * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""What-if standings: per-session overlays vs a copy of the shared tables per session.
+
+A league with half its season played is the shared base. Many sessions
+each enter random hypothetical results for the next rounds, correct and
+clear some of them; after every edit a session's table must equal a
+fresh ``StandingsState`` holding the real and hypothetical results, and
+the base must be untouched. A corrected real result in the base must show up
+in every session's tables. Then the cost of one edit, and the memory a
+session holds, are measured for overlays and for per-session copies.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_what_if
+"""
+import copy
+import logging
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.bench_standings_state import season_fixtures
+from torneos.standings import StandingsOverlay, StandingsState
+
+N_ZONES = 8
+TEAMS_PER_ZONE = 16
+N_ROUNDS = 30
+PLAYED_ROUNDS = 15
+WHAT_IF_ROUNDS = 3
+CHECKED_SESSIONS = 20
+EDITS_PER_SESSION = 40
+TIMED_SESSIONS = 1_000
+
+
+def league(seed=0):
+    """(base results, upcoming fixtures) of a season played up to PLAYED_ROUNDS."""
+    rng = np.random.default_rng(seed)
+    fixtures = season_fixtures(rng, N_ZONES, TEAMS_PER_ZONE, N_ROUNDS)
+    played = {f"Fecha {round_number + 1}" for round_number in range(PLAYED_ROUNDS)}
+    upcoming = {f"Fecha {round_number + 1}" for round_number in range(PLAYED_ROUNDS, PLAYED_ROUNDS + WHAT_IF_ROUNDS)}
+    results = {
+        (round, home, away): (zone, int(rng.poisson(3.0)), int(rng.poisson(2.6)))
+        for round, home, away, zone in fixtures if round in played
+    }
+    return results, [fixture for fixture in fixtures if fixture[0] in upcoming]
+
+
+def random_edit(rng, hypothetical, upcoming):
+    """(key, result, zone) of a new, corrected or cleared (result None) hypothetical result.
+
+    ``hypothetical`` is updated to match.
+    """
+    if hypothetical and rng.random() < 0.15:
+        key = list(hypothetical)[rng.integers(len(hypothetical))]
+        return key, None, hypothetical.pop(key)[0]
+    round, home, away, zone = upcoming[rng.integers(len(upcoming))]
+    result = (zone, int(rng.poisson(3.0)), int(rng.poisson(2.6)))
+    hypothetical[(round, home, away)] = result
+    return (round, home, away), result, zone
+
+
+def apply_edit(state, key, result):
+    if result is None:
+        return state.remove_result(*key)
+    return state.set_result(*key, *result)
+
+
+def assert_same(overlay, expected):
+    assert overlay.zones() == expected.zones()
+    for zone in expected.zones():
+        assert overlay.table(zone) == expected.table(zone)
+
+
+def check_sessions(base, results, upcoming):
+    rng = np.random.default_rng(1)
+    base_tables = {zone: base.table(zone) for zone in base.zones()}
+    version = base.version
+    sessions = []
+    for _ in range(CHECKED_SESSIONS):
+        overlay, hypothetical = StandingsOverlay(base), {}
+        for _ in range(EDITS_PER_SESSION):
+            key, result, _ = random_edit(rng, hypothetical, upcoming)
+            apply_edit(overlay, key, result)
+            assert_same(overlay, fresh_state({**results, **hypothetical}))
+        sessions.append((overlay, hypothetical))
+    assert base.version == version
+    assert {zone: base.table(zone) for zone in base.zones()} == base_tables
+
+    # A corrected real result
+    key = next(iter(results))
+    results[key] = (results[key][0], 4, 0)
+    base.set_result(*key, *results[key])
+    for overlay, hypothetical in sessions:
+        assert_same(overlay, fresh_state({**results, **hypothetical}))
+
+
+def fresh_state(results):
+    state = StandingsState()
+    state.sync(results)
+    return state
+
+
+def timed_edits(sessions, upcoming, seed):
+    """Seconds per edit: set or clear one result and read the table of its zone."""
+    rng = np.random.default_rng(seed)
+    edits = [(state, *random_edit(rng, hypothetical, upcoming)) for state, hypothetical in sessions]
+    times = []
+    for state, key, result, zone in edits:
+        start = time.perf_counter()
+        apply_edit(state, key, result)
+        state.table(zone)
+        times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+def session_bytes(make_session, n_sessions):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [make_session() for _ in range(n_sessions)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return sessions, used / n_sessions
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    results, upcoming = league()
+    base = fresh_state(results)
+    check_sessions(base, dict(results), upcoming)
+    print(f"{CHECKED_SESSIONS} sessions x {EDITS_PER_SESSION} edits: overlays match a fresh state, base untouched")
+
+    results, upcoming = league()
+    base = fresh_state(results)
+    for zone in base.zones():
+        base.table(zone)
+    print(f"base: {len(base)} results in {N_ZONES} zones of {TEAMS_PER_ZONE}; {TIMED_SESSIONS} sessions, "
+          f"{len(upcoming)} matches open to edit")
+    print(f"{'':>14} {'KB/session':>11} {'mean µs':>8} {'p99 µs':>8}")
+    for name, make_session in (
+        ('overlay', lambda: (StandingsOverlay(base), {})),
+        ('deep copy', lambda: (copy.deepcopy(base), {})),
+    ):
+        sessions, per_session = session_bytes(make_session, TIMED_SESSIONS)
+        # A few hypothetical results in every session before timing
+        for seed in range(5):
+            timed_edits(sessions, upcoming, seed)
+        times = np.concatenate([timed_edits(sessions, upcoming, seed) for seed in range(5, 10)])
+        print(f"{name:>14} {per_session / 1024:>11.1f} {times.mean() * 1e6:>8.1f} {np.percentile(times, 99) * 1e6:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Synthetic league generators shared by the benchmark scripts."""
+import numpy as np
+import pandas as pd
+
+from torneos.standings import StandingsState
+from torneos.tiebreakers import DEFAULT_TIEBREAKERS
+
+
+def synthetic_matches(n_matches, n_teams=20, n_zones=1, seed=0):
+    """Played matches as the pages build them: Local, Visitante, GL, GV, Zona."""
+    rng = np.random.default_rng(seed)
+    zone = rng.integers(0, n_zones, n_matches)
+    local = rng.integers(0, n_teams, n_matches)
+    # Shift the away side so a team never plays itself
+    visitante = (local + rng.integers(1, n_teams, n_matches)) % n_teams
+    return pd.DataFrame({
+        'Local': [f"Team {z}-{t}" for z, t in zip(zone, local)],
+        'Visitante': [f"Team {z}-{t}" for z, t in zip(zone, visitante)],
+        'GL': rng.poisson(3.0, n_matches),
+        'GV': rng.poisson(2.6, n_matches),
+        'Zona': [f"ZONA {z + 1}" for z in zone],
+    })
+
+
+def frame_results(df_matches):
+    """Results of played matches as ``synthetic_matches`` lays them out, keyed like ``StandingsState``.
+
+    Every row is a match of its own, keyed by position, so a pairing may repeat.
+    """
+    rows = df_matches[['Local', 'Visitante', 'GL', 'GV', 'Zona']].itertuples(index=False, name=None)
+    return {
+        (i, home, away): (zone, int(home_goals), int(away_goals))
+        for i, (home, away, home_goals, away_goals, zone) in enumerate(rows)
+    }
+
+
+def standings_frames(df_matches, tiebreakers=DEFAULT_TIEBREAKERS, fair_play=None):
+    """Zone tables of played matches as ``synthetic_matches`` lays them out, from a fresh ``StandingsState``."""
+    return StandingsState.from_results(frame_results(df_matches), tiebreakers, fair_play).frames()
+
+
+def synthetic_category_json(n_rounds, matches_per_round, start, seed=0, played=1.0):
+    """Category data in the data/*.json layout, one round a week from ``start``."""
+    rng = np.random.default_rng(seed)
+    data = []
+    for round_number in range(n_rounds):
+        day = start + pd.Timedelta(days=7 * round_number)
+        matches = []
+        for _ in range(matches_per_round):
+            kickoff = day + pd.Timedelta(hours=int(rng.integers(9, 23)))
+            is_played = rng.random() < played
+            matches.append({
+                'Fecha': kickoff.strftime('%d/%m/%Y %H:%M'),
+                'Local': f"Team {rng.integers(0, 20)}",
+                'GL': str(rng.poisson(3.0)) if is_played else '',
+                'Visitante': f"Team {rng.integers(0, 20)}",
+                'GV': str(rng.poisson(2.6)) if is_played else '',
+                'OBS': '',
+                'Zona': 'ZONA 1',
+                'Cancha': f"Cancha {rng.integers(0, 10)}",
+                'Arbitro 1': f"Arbitro {rng.integers(0, 30)}",
+                'Arbitro 2': '',
+            })
+        data.append({'Fecha': f"Fecha {round_number + 1}", 'Data': matches})
+    return data
+
+
+def synthetic_scorers(n_players, n_clubs=40, seed=0):
+    """Scorers of a category as ``read_statistics`` returns them: Goals, Player, Club."""
+    rng = np.random.default_rng(seed)
+    surnames = rng.integers(0, max(1, n_players // 4), n_players)
+    names = rng.integers(0, 200, n_players)
+    return pd.DataFrame({
+        'Goals': rng.geometric(0.35, n_players),
+        'Player': [f"APELLIDO{s}, NOMBRE{n}" for s, n in zip(surnames, names)],
+        'Club': [f"CLUB {c}" for c in rng.integers(0, n_clubs, n_players)],
+    })
@@ -0,0 +1 @@
+"""Shared tournament core used by the Streamlit pages."""
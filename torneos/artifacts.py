@@ -0,0 +1,275 @@
+import hashlib
+import importlib
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pyarrow as pa
+import streamlit as st
+
+from torneos.ingest import data_versions, file_version
+from torneos.loader import ROOT_PATH, data_file
+from torneos.snapshot import read_table, write_table
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_PATH = os.path.join(ROOT_PATH, '.cache', 'artifacts')
+# Kind of the leaves of the graph: data files, named by file name
+SOURCE = 'file'
+# Ingests kept for the data page
+INGEST_HISTORY = 10
+
+# kind -> Rule, filled in by the modules that define each artifact
+RULES = {}
+# Every module that defines rules. The graph imports them all before its
+# first build, so an artifact's inputs are there whichever module asked for it
+RULE_MODULES = [
+    'torneos.store', 'torneos.fixtures', 'torneos.standings', 'torneos.statistics', 'torneos.ranking',
+    'torneos.bracket', 'torneos.match_index', 'torneos.round_calendar', 'torneos.ratings', 'torneos.simulation',
+    'torneos.leaderboard', 'torneos.players',
+]
+
+
+class Rule:
+    """How to build every artifact of one kind, like a make pattern rule.
+
+    An artifact is named by its kind followed by parameters, for instance
+    ``('fixtures', 'c13', 60)``. ``inputs`` maps the parameters to the names
+    of the artifacts it is built from, and ``build`` receives their values
+    followed by the parameters. With ``persist`` the value, an Arrow table,
+    is also written to disk so a restart maps it back instead of rebuilding
+    it. With ``keep_going`` an input that failed is handed to ``build`` as
+    its exception instead of failing this artifact too. With ``incremental``
+    ``build`` also gets the artifact's previous value, or None, as
+    ``previous`` and may update it rather than start over; what callers were
+    handed must stay unchanged. Bump ``version`` when ``build`` changes what
+    it makes out of the same inputs.
+    """
+
+    def __init__(self, kind, build, inputs, persist=False, keep_going=False, incremental=False, version=1):
+        self.kind = kind
+        self.build = build
+        self.inputs = inputs
+        self.persist = persist
+        self.keep_going = keep_going
+        self.incremental = incremental
+        self.version = version
+
+
+def rule(kind, inputs=lambda: [], persist=False, keep_going=False, incremental=False, version=1):
+    """Register the decorated function as the build of ``kind`` artifacts."""
+    def register(build):
+        RULES[kind] = Rule(kind, build, inputs, persist, keep_going, incremental, version)
+        return build
+    return register
+
+
+def register_rules():
+    """Import every module of ``RULE_MODULES``, registering the rules they define."""
+    for module in RULE_MODULES:
+        importlib.import_module(module)
+
+
+def source(file_name):
+    return (SOURCE, file_name)
+
+
+def artifact_name(key):
+    return '/'.join(str(part) for part in key)
+
+
+@dataclass
+class Entry:
+    fingerprint: str
+    value: object = None
+    error: Optional[Exception] = None
+
+
+@dataclass
+class Build:
+    """One artifact built during an ingest, from disk or by running its rule."""
+    name: str
+    origin: str
+    seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class Ingest:
+    """Artifacts built for one set of data file versions."""
+    fingerprint: str
+    versions: dict
+    changed_files: list
+    started: float = field(default_factory=time.time)
+    builds: list = field(default_factory=list)
+
+
+class ArtifactGraph:
+    """Every derived artifact of the data files, rebuilt only when its inputs change.
+
+    The fingerprint of an artifact hashes its name, its rule version and the
+    fingerprints of its inputs, down to the content versions of the data
+    files. An artifact is served from memory while its fingerprint holds;
+    otherwise it is mapped back from disk if its rule persists it, or built.
+    Failures are kept like values, so a broken file is not re-read until it
+    changes. Each build is recorded in the ingest of the data versions it
+    was made for.
+
+    Each artifact has its own lock, so a slow build only holds up the
+    sessions waiting for that artifact. A build takes the locks of its
+    inputs after its own, always down the graph, so two builds never wait
+    on each other.
+    """
+
+    def __init__(self, path):
+        register_rules()
+        self.path = path
+        self.ingests = deque(maxlen=INGEST_HISTORY)
+        self._entries = {}
+        self._fingerprints = (None, {})
+        self._locks = {}
+        self._ingests_lock = threading.Lock()
+
+    def inputs(self, key):
+        if key[0] == SOURCE:
+            return ()
+        return tuple(RULES[key[0]].inputs(*key[1:]))
+
+    def fingerprint(self, key, versions):
+        versions_fingerprint, memo = self._fingerprints
+        if versions_fingerprint != versions.fingerprint:
+            memo = {}
+            self._fingerprints = (versions.fingerprint, memo)
+        fingerprint = memo.get(key)
+        if fingerprint is None:
+            if key[0] == SOURCE:
+                fingerprint = str(self.source_version(key[1], versions))
+            else:
+                parts = [RULES[key[0]].version] + [self.fingerprint(input_key, versions) for input_key in self.inputs(key)]
+                fingerprint = hashlib.blake2b(repr((key, parts)).encode(), digest_size=8).hexdigest()
+            memo[key] = fingerprint
+        return fingerprint
+
+    def source_version(self, file_name, versions):
+        if file_name in versions.versions:
+            return versions.versions[file_name]
+        return file_version(file_name)
+
+    def get(self, key, versions):
+        """Value of artifact ``key`` for ``versions``; raises the error that kept it from being built."""
+        fingerprint = self.fingerprint(key, versions)
+        entry = self._entries.get(key)
+        if entry is None or entry.fingerprint != fingerprint:
+            with self._locks.setdefault(key, threading.RLock()):
+                entry = self._entries.get(key)
+                if entry is None or entry.fingerprint != fingerprint:
+                    entry = self._build(key, fingerprint, versions)
+                    self._entries[key] = entry
+        if entry.error is not None:
+            raise entry.error.with_traceback(None)
+        return entry.value
+
+    def entries(self):
+        """(name, inputs, fingerprint, error) of every artifact in memory, sorted by name."""
+        return sorted(
+            (artifact_name(key), [artifact_name(input_key) for input_key in self.inputs(key)], entry.fingerprint, entry.error)
+            for key, entry in list(self._entries.items())
+        )
+
+    def _ingest(self, versions):
+        with self._ingests_lock:
+            for ingest in reversed(self.ingests):
+                if ingest.fingerprint == versions.fingerprint:
+                    return ingest
+            previous = self.ingests[-1].versions if self.ingests else {}
+            changed_files = sorted(name for name, version in versions.versions.items() if previous.get(name) != version)
+            ingest = Ingest(versions.fingerprint, dict(versions.versions), changed_files)
+            self.ingests.append(ingest)
+            return ingest
+
+    def _build(self, key, fingerprint, versions):
+        if key[0] == SOURCE:
+            path = data_file(key[1])
+            if self.source_version(key[1], versions) is None:
+                return Entry(fingerprint, error=FileNotFoundError(f"No such file or directory: '{path}'"))
+            return Entry(fingerprint, path)
+
+        rule = RULES[key[0]]
+        name = artifact_name(key)
+        start = time.perf_counter()
+        try:
+            value = self._load(key, fingerprint) if rule.persist else None
+            if value is not None:
+                origin = 'disk'
+            else:
+                values = []
+                for input_key in self.inputs(key):
+                    try:
+                        values.append(self.get(input_key, versions))
+                    except Exception as e:
+                        if not rule.keep_going:
+                            raise
+                        values.append(e)
+                # Inputs record their own builds
+                start = time.perf_counter()
+                origin = 'computed'
+                if rule.incremental:
+                    previous = self._entries.get(key)
+                    previous = None if previous is None or previous.error is not None else previous.value
+                    value = rule.build(*values, *key[1:], previous=previous)
+                else:
+                    value = rule.build(*values, *key[1:])
+                if rule.persist:
+                    value = self._save(key, fingerprint, value)
+            entry = Entry(fingerprint, value)
+        except Exception as e:
+            logger.warning(f"Could not build {name}: {str(e)}")
+            origin = 'error'
+            entry = Entry(fingerprint, error=e)
+        seconds = time.perf_counter() - start
+        self._ingest(versions).builds.append(Build(name, origin, seconds, None if entry.error is None else str(entry.error)))
+        logger.info(f"Built {name} ({origin}) in {seconds:.3f} seconds")
+        return entry
+
+    def _disk_path(self, key, fingerprint):
+        return os.path.join(self.path, f"{'-'.join(str(part) for part in key)}-{fingerprint}.arrow")
+
+    def _load(self, key, fingerprint):
+        path = self._disk_path(key, fingerprint)
+        if not os.path.exists(path):
+            return None
+        try:
+            return read_table(path)
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning(f"Ignoring unreadable {path}: {str(e)}")
+            return None
+
+    def _save(self, key, fingerprint, table):
+        os.makedirs(self.path, exist_ok=True)
+        path = self._disk_path(key, fingerprint)
+        write_table(path, table)
+        # Older fingerprints of the same artifact are no longer needed
+        prefix = f"{'-'.join(str(part) for part in key)}-"
+        for stale_name in os.listdir(self.path):
+            rest = stale_name[len(prefix):]
+            if stale_name.startswith(prefix) and '-' not in rest and rest.endswith('.arrow') and stale_name != os.path.basename(path):
+                try:
+                    os.remove(os.path.join(self.path, stale_name))
+                except OSError:
+                    pass
+        return read_table(path)
+
+
+# One graph per process, shared by every session
+@st.cache_resource
+def artifact_graph():
+    return ArtifactGraph(ARTIFACT_PATH)
+
+
+def artifact(kind, *params, versions=None):
+    """Value of the ``kind`` artifact for ``params`` at the current (or given) data versions."""
+    return artifact_graph().get((kind, *params), versions or data_versions())
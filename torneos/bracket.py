@@ -0,0 +1,225 @@
+import copy
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from torneos.artifacts import artifact, rule
+from torneos.categories import CATEGORIES_BY_SLUG
+from torneos.store import Match
+
+logger = logging.getLogger(__name__)
+
+# Knockout round names by the number of teams that play them
+KNOCKOUT_ROUNDS = {
+    64: 'Treintaidosavos de Final',
+    32: 'Dieciseisavos de Final',
+    16: 'Octavos de Final',
+    8: 'Cuartos de Final',
+    4: 'Semifinal',
+    2: 'Final',
+}
+
+
+def seeding_order(size):
+    """Seeds in bracket order: 1 meets ``size`` first, and 1 and 2 can only meet in the final."""
+    order = [1]
+    while len(order) < size:
+        order = [seed for top in order for seed in (top, 2 * len(order) + 1 - top)]
+    return order
+
+
+def match_winner(match):
+    """Winner of a played knockout match, or None while it is undecided.
+
+    There is no penalty shoot-out column: a draw is decided by its OBS
+    naming exactly one of the two teams.
+    """
+    if match is None or not match.played:
+        return None
+    if match.home_goals != match.away_goals:
+        return match.home if match.home_goals > match.away_goals else match.away
+    named = [team for team in (match.home, match.away) if team.lower() in match.obs.lower()]
+    return named[0] if len(named) == 1 else None
+
+
+@dataclass
+class Tie:
+    """One knockout tie; teams are None until the seeds or the ties feeding it decide them."""
+    round: str
+    home: Optional[str] = None
+    away: Optional[str] = None
+    match: Optional[Match] = None
+    winner: Optional[str] = None
+
+    def score(self):
+        """(home goals, away goals) from the tie's side, None until played."""
+        if self.match is None or not self.match.played:
+            return None
+        if self.match.home == self.home:
+            return self.match.home_goals, self.match.away_goals
+        return self.match.away_goals, self.match.home_goals
+
+
+class Bracket:
+    """Knockout ties linked round to round, updated one change at a time.
+
+    The first round is paired from the seeds in bracket order (1 v 16,
+    8 v 9, ...) and tie ``i`` of every later round is played by the winners
+    of ties ``2i`` and ``2i + 1`` of the round before. A new seed or result
+    only refreshes the tie it lands on and walks up the bracket while the
+    winner keeps changing. Seeds past ``n_seeds`` are byes.
+    """
+
+    def __init__(self, size, n_seeds=None):
+        if size < 2 or size & (size - 1):
+            raise ValueError(f"Unsupported bracket size: {size}")
+        self.size = size
+        self.n_seeds = size if n_seeds is None else n_seeds
+        self.seeds = [None] * size
+        # True while the seeds still depend on unplayed group matches
+        self.provisional = False
+        self.rounds = []
+        teams = size
+        while teams >= 2:
+            name = KNOCKOUT_ROUNDS.get(teams, f"Ronda de {teams}")
+            self.rounds.append([Tie(name) for _ in range(teams // 2)])
+            teams //= 2
+        self._order = seeding_order(size)
+        # (round, frozenset of both teams) -> match, and -> (round index, tie index) of the tie they play
+        self._matches = {}
+        self._ties = {}
+
+    def copy(self):
+        """A bracket with the same seeds and matches that can be changed while this one stays as it is."""
+        bracket = copy.copy(self)
+        bracket.seeds = list(self.seeds)
+        bracket.rounds = [[replace(tie) for tie in ties] for ties in self.rounds]
+        bracket._matches = dict(self._matches)
+        bracket._ties = dict(self._ties)
+        return bracket
+
+    @property
+    def round_names(self):
+        return [ties[0].round for ties in self.rounds]
+
+    def champion(self):
+        return self.rounds[-1][0].winner
+
+    def set_seeds(self, seeds):
+        """Place the teams ranked 1..n; returns the (round index, tie index) of the ties that changed."""
+        self.seeds = list(seeds) + [None] * (self.size - len(seeds))
+        changed = set()
+        for i, tie in enumerate(self.rounds[0]):
+            home_seed, away_seed = self._order[2 * i], self._order[2 * i + 1]
+            self._refresh(0, i, self.seeds[home_seed - 1], self.seeds[away_seed - 1], changed)
+        return changed
+
+    def set_match(self, match):
+        """Add or correct a knockout match; returns the ties that changed."""
+        key = (match.round, frozenset((match.home, match.away)))
+        if self._matches.get(key) == match:
+            return set()
+        self._matches[key] = match
+        return self._refresh_key(key)
+
+    def remove_match(self, round, home, away):
+        """Take back a knockout match; returns the ties that changed."""
+        key = (round, frozenset((home, away)))
+        if self._matches.pop(key, None) is None:
+            return set()
+        return self._refresh_key(key)
+
+    def set_matches(self, matches):
+        """Apply only the knockout matches that differ from the last call; returns the ties that changed."""
+        rounds = set(self.round_names)
+        current = {
+            (match.round, frozenset((match.home, match.away))): match
+            for match in matches
+            if match.round in rounds and not match.is_bye
+        }
+        changed = set()
+        for key in [key for key in self._matches if key not in current]:
+            round, teams = key
+            changed |= self.remove_match(round, *teams)
+        for match in current.values():
+            changed |= self.set_match(match)
+        return changed
+
+    def unplaced(self):
+        """Knockout matches whose teams do not meet in any tie of their round."""
+        return [match for key, match in self._matches.items() if key not in self._ties]
+
+    def _refresh_key(self, key):
+        changed = set()
+        position = self._ties.get(key)
+        if position is not None:
+            tie = self.rounds[position[0]][position[1]]
+            self._refresh(*position, tie.home, tie.away, changed)
+        return changed
+
+    def _refresh(self, round_index, tie_index, home, away, changed):
+        tie = self.rounds[round_index][tie_index]
+        before = (tie.home, tie.away, tie.match, tie.winner)
+        if (home, away) != before[:2]:
+            if tie.home and tie.away:
+                del self._ties[(tie.round, frozenset((tie.home, tie.away)))]
+            if home and away:
+                self._ties[(tie.round, frozenset((home, away)))] = (round_index, tie_index)
+        tie.home, tie.away = home, away
+        tie.match = self._matches.get((tie.round, frozenset((home, away)))) if home and away else None
+        if round_index == 0 and (home is None) != (away is None) and self._is_bye(tie_index):
+            tie.winner = home or away
+        else:
+            tie.winner = match_winner(tie.match)
+        if (tie.home, tie.away, tie.match, tie.winner) == before:
+            return
+        changed.add((round_index, tie_index))
+        if tie.winner != before[3] and round_index + 1 < len(self.rounds):
+            parent = self.rounds[round_index + 1][tie_index // 2]
+            if tie_index % 2 == 0:
+                self._refresh(round_index + 1, tie_index // 2, tie.winner, parent.away, changed)
+            else:
+                self._refresh(round_index + 1, tie_index // 2, parent.home, tie.winner, changed)
+
+    def _is_bye(self, tie_index):
+        return max(self._order[2 * tie_index], self._order[2 * tie_index + 1]) > self.n_seeds
+
+
+def bracket_size(n_teams):
+    size = 2
+    while size < n_teams:
+        size *= 2
+    return size
+
+
+def seed_qualifiers(df_ranking, qualifiers):
+    """The top ``qualifiers`` of every zone, in the order of the cross-zone ranking."""
+    df_qualified = df_ranking[df_ranking['Posición'] <= qualifiers]
+    return df_qualified.sort_values('General')['Team'].tolist()
+
+
+# Copied from the previous version of the category file, which sessions may
+# still be reading: new results only refresh the ties they reach, and new
+# group tables only reseed the first round
+@rule('bracket', inputs=lambda slug: [('cross_zone_ranking', slug), ('matches', slug)], incremental=True)
+def build_bracket(df_ranking, loaded, slug, previous=None):
+    """Knockout bracket of a category seeded from its group tables, or None without one."""
+    start = time.time()
+    qualifiers = CATEGORIES_BY_SLUG[slug].qualifiers
+    matches, _ = loaded
+    if not qualifiers or df_ranking.empty:
+        return None
+    seeds = seed_qualifiers(df_ranking, qualifiers)
+    if previous is None or previous.size != bracket_size(len(seeds)) or previous.n_seeds != len(seeds):
+        bracket = Bracket(bracket_size(len(seeds)), len(seeds))
+    else:
+        bracket = previous.copy()
+    changed = bracket.set_matches(matches) | bracket.set_seeds(seeds)
+    bracket.provisional = any(match.regular_season and not match.is_bye and not match.played for match in matches)
+    logger.info(f"Updated {len(changed)} bracket ties of {slug} in {time.time() - start:.4f} seconds")
+    return bracket
+
+
+def category_bracket(slug, versions=None):
+    return artifact('bracket', slug, versions=versions)
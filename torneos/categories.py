@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+
+from torneos.tiebreakers import (DEFAULT_TIEBREAKERS, FAIR_PLAY, GOAL_DIFFERENCE, GOALS_FOR, H2H_GOAL_DIFFERENCE,
+                                 H2H_POINTS)
+
+
+@dataclass(frozen=True)
+class Category:
+    """A division: its data files under data/, how it is labelled in the app,
+    how teams level on points are ordered in its tables and, for a cup, how
+    many teams of each zone go on to the knockout rounds.
+    """
+    slug: str
+    name: str
+    nav_title: str
+    tiebreakers: tuple = DEFAULT_TIEBREAKERS
+    qualifiers: int = 0
+
+    @property
+    def json_file(self):
+        return f"{self.slug}.json"
+
+    @property
+    def stats_file(self):
+        return f"{self.slug}-statistics.csv"
+
+    @property
+    def url_path(self):
+        return self.nav_title.replace(' ', '_')
+
+
+# Category registry, in sidebar order. Adding a division is one entry here
+# plus its data/<slug>.json and data/<slug>-statistics.csv files.
+CATEGORIES = [
+    Category('elite', 'Elite', 'Elite'),
+    Category('a1', 'A1', 'A1'),
+    Category('a2', 'A2', 'A2'),
+    Category('a3', 'A3', 'A3'),
+    Category('c20a1', 'C20 A1', 'C20 A1'),
+    Category('c20a2', 'C20 A2', 'C20 A2'),
+    Category('c17', 'C17', 'C17'),
+    Category('c15', 'C15', 'C15'),
+    Category('c13', 'C13', 'C13'),
+    Category('senior', 'Senior', 'Senior'),
+    Category('veteranos', 'Veteranos', 'Veteranos'),
+    Category('femenino', 'Femenino', 'Femenino'),
+    # The cup ranks its zones on goal difference before head-to-head
+    Category('copa2025', 'COPA 2025', 'Copa 2025',
+             tiebreakers=(GOAL_DIFFERENCE, GOALS_FOR, H2H_POINTS, H2H_GOAL_DIFFERENCE, FAIR_PLAY), qualifiers=2),
+]
+
+CATEGORIES_BY_SLUG = {category.slug: category for category in CATEGORIES}
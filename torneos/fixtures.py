@@ -0,0 +1,71 @@
+import logging
+import time
+
+import pandas as pd
+
+from torneos.artifacts import artifact, rule, source
+from torneos.ingest import LOGOS_FILE
+from torneos.logos import LOGO_WIDTH, team_resolver
+from torneos.store import goals_text
+
+logger = logging.getLogger(__name__)
+
+
+FIXTURE_COLUMNS = [
+    'Fecha', 'Local', 'GL', 'Visitante', 'GV', 'OBS', 'Zona', 'Cancha',
+    'Arbitro 1', 'Arbitro 2', 'Fecha Numero', 'Local_Logo', 'Visitante_Logo',
+]
+
+
+def fixtures_frame(matches, resolver):
+    if not matches:
+        return pd.DataFrame(columns=FIXTURE_COLUMNS)
+    df = pd.DataFrame([
+        {
+            'Fecha': match.kickoff,
+            'Local': match.home,
+            'GL': goals_text(match.home_goals),
+            'Visitante': match.away,
+            'GV': goals_text(match.away_goals),
+            'OBS': match.obs,
+            'Zona': match.zone,
+            'Cancha': match.venue,
+            'Arbitro 1': match.referee_1,
+            'Arbitro 2': match.referee_2,
+            'Fecha Numero': match.round,
+        }
+        for match in matches
+    ])
+    df['Fecha'] = pd.to_datetime(df['Fecha'])
+    df['Local_Logo'] = resolver.logos(df['Local'])
+    df['Visitante_Logo'] = resolver.logos(df['Visitante'])
+    return df
+
+
+# Shared read-only frame: callers copy before modifying it
+@rule('fixtures', inputs=lambda slug, logo_width: [('matches', slug), source(LOGOS_FILE)])
+def build_fixtures(loaded, logos, slug, logo_width):
+    logger.info(f"Processing fixtures for {slug}")
+    start = time.time()
+    matches, _ = loaded
+    df = fixtures_frame(matches, team_resolver(logo_width))
+    logger.info(f"Processed fixtures in {time.time() - start:.2f} seconds")
+    return df
+
+
+# Columns of the per-round fixture tables
+ROUND_COLUMNS = ['Fecha', 'Local_Logo', 'Local', 'GL', 'Visitante_Logo', 'Visitante', 'GV', 'Cancha']
+
+
+# Each round's table is split off once per version of the file, so a rerun
+# only looks up the rounds it shows
+@rule('fixture_rounds', inputs=lambda slug, logo_width: [('fixtures', slug, logo_width)])
+def build_fixture_rounds(df, slug, logo_width):
+    if df['Fecha'].isna().any():
+        logger.warning(f"Rows with invalid dates: {df[df['Fecha'].isna()][['Fecha Numero', 'Local', 'Visitante']].to_dict('records')}")
+    return tuple((fecha_num, group[ROUND_COLUMNS]) for fecha_num, group in df.groupby('Fecha Numero', sort=False))
+
+
+def fixture_rounds(slug, versions=None, logo_width=LOGO_WIDTH):
+    """(round, table) of every round of a category, in file order."""
+    return artifact('fixture_rounds', slug, logo_width, versions=versions)
@@ -0,0 +1,78 @@
+import hashlib
+import logging
+import os
+import threading
+from types import MappingProxyType
+
+from torneos.categories import CATEGORIES
+from torneos.loader import data_file
+
+logger = logging.getLogger(__name__)
+
+# Club names and logo paths, read by every artifact that shows logos
+LOGOS_FILE = 'logos.json'
+
+# file name -> ((mtime_ns, size), content hash), shared by every session
+_file_versions = {}
+_file_versions_lock = threading.Lock()
+
+
+def source_files():
+    """Every data file the pages are built from, in category order, then the logos."""
+    return [name for category in CATEGORIES for name in (category.json_file, category.stats_file)] + [LOGOS_FILE]
+
+
+def file_hash(file_name):
+    with open(data_file(file_name), 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()[:16]
+
+
+def file_version(file_name):
+    """Content hash of a data file, or None if it is missing.
+
+    The file is only re-read when its mtime or size changed, so checking
+    every file on each rerun costs one ``os.stat`` per file.
+    """
+    try:
+        stat = os.stat(data_file(file_name))
+    except FileNotFoundError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _file_versions_lock:
+        cached = _file_versions.get(file_name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        version = file_hash(file_name)
+    except FileNotFoundError:
+        return None
+    with _file_versions_lock:
+        if cached is not None and cached[1] != version:
+            logger.info(f"{file_name} changed")
+        _file_versions[file_name] = (key, version)
+    return version
+
+
+class DataVersions:
+    """Content versions of every data file at one point in time.
+
+    Artifacts derived from one file are cached on that file's version, so a
+    new result in one category only invalidates that category's fixtures,
+    standings, day index and scorers. ``fingerprint`` changes whenever any
+    file does, for the artifacts that combine every category. The logos
+    file is versioned too, so editing it rebuilds what shows logos.
+    """
+
+    def __init__(self, versions):
+        self.versions = MappingProxyType(dict(versions))
+        self.fingerprint = hashlib.blake2b(repr(sorted(self.versions.items())).encode(), digest_size=8).hexdigest()
+
+    def matches(self, category):
+        return self.versions[category.json_file]
+
+    def statistics(self, category):
+        return self.versions[category.stats_file]
+
+
+def data_versions():
+    return DataVersions({file_name: file_version(file_name) for file_name in source_files()})
@@ -0,0 +1,129 @@
+import heapq
+import logging
+import time
+from itertools import islice, repeat
+
+import pandas as pd
+
+from torneos.artifacts import artifact, rule
+from torneos.categories import CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_COLUMNS = ['Goals', 'Player', 'Club', 'category']
+CLUB_COLUMNS = ['Club', 'Goals', 'Players']
+
+
+class Leaderboard:
+    """Scorers of every category together, and goals per club across categories.
+
+    Each category keeps its scorers as lists in the order of its scorer
+    table, already sorted by goals then player, so a global top N is a
+    k-way heap merge of those lists that stops after N rows. Club totals
+    are kept per category and summed into ``club_goals``; a changed file
+    takes its category's old totals out and puts the new ones in.
+
+    A leaderboard is never changed once made: ``update`` makes a new one
+    that shares the lists of the categories that did not change.
+    """
+
+    def __init__(self):
+        # slug -> (scorer table, negated goals, players, clubs, {club: (goals, players)})
+        self._categories = {}
+        self.club_goals = {}
+        self.club_players = {}
+
+    def __len__(self):
+        return sum(len(entry[1]) for entry in self._categories.values())
+
+    def update(self, tables):
+        """(leaderboard of ``tables``, how many categories changed); this one stays as it is.
+
+        ``tables`` is ``{slug: scorer table or None}``. Only categories
+        whose table is a different object are reloaded; a category that is
+        None or absent is left out.
+        """
+        leaderboard = Leaderboard()
+        leaderboard._categories = dict(self._categories)
+        leaderboard.club_goals = dict(self.club_goals)
+        leaderboard.club_players = dict(self.club_players)
+        return leaderboard, leaderboard._sync(tables)
+
+    def _sync(self, tables):
+        changed = 0
+        for slug in list(self._categories):
+            if tables.get(slug) is None:
+                self._remove(slug)
+                changed += 1
+        for slug, table in tables.items():
+            entry = self._categories.get(slug)
+            if table is None or (entry is not None and entry[0] is table):
+                continue
+            if entry is not None:
+                self._remove(slug)
+            self._add(slug, table)
+            changed += 1
+        return changed
+
+    def _add(self, slug, table):
+        clubs = table.column('Club').to_pylist()
+        totals = {}
+        for row in table.group_by('Club').aggregate([('Goals', 'sum'), ('Goals', 'count')]).to_pylist():
+            totals[row['Club']] = (row['Goals_sum'], row['Goals_count'])
+            self.club_goals[row['Club']] = self.club_goals.get(row['Club'], 0) + row['Goals_sum']
+            self.club_players[row['Club']] = self.club_players.get(row['Club'], 0) + row['Goals_count']
+        goals = [-goals for goals in table.column('Goals').to_pylist()]
+        self._categories[slug] = (table, goals, table.column('Player').to_pylist(), clubs, totals)
+
+    def _remove(self, slug):
+        for club, (goals, players) in self._categories.pop(slug)[4].items():
+            self.club_players[club] -= players
+            if self.club_players[club]:
+                self.club_goals[club] -= goals
+            else:
+                del self.club_players[club]
+                del self.club_goals[club]
+
+    def top(self, n=None):
+        """The ``n`` leading scorers of all categories, every scorer when ``n`` is None.
+
+        Sorted by goals then player; a tie on both keeps the categories' registry order.
+        """
+        order = {category.slug: position for position, category in enumerate(CATEGORIES)}
+        merged = heapq.merge(*(
+            zip(goals, players, repeat(order.get(slug, len(order))), repeat(slug), clubs)
+            for slug, (_, goals, players, clubs, _) in self._categories.items()
+        ))
+        rows = list(islice(merged, n))
+        return pd.DataFrame({
+            'Goals': [-row[0] for row in rows],
+            'Player': [row[1] for row in rows],
+            'Club': [row[4] for row in rows],
+            'category': [row[3] for row in rows],
+        }, columns=LEADERBOARD_COLUMNS)
+
+    def clubs(self, n=None):
+        """Goals and scorers of each club across categories, most goals first."""
+        ranked = sorted(self.club_goals.items(), key=lambda item: (-item[1], item[0]))
+        return pd.DataFrame(
+            [(club, goals, self.club_players[club]) for club, goals in islice(ranked, n)],
+            columns=CLUB_COLUMNS
+        )
+
+
+# A missing or invalid file leaves its category out instead of the whole leaderboard
+@rule('leaderboard', inputs=lambda: [('scorer_table', category.slug) for category in CATEGORIES],
+      keep_going=True, incremental=True)
+def build_leaderboard(*tables, previous=None):
+    start = time.time()
+    leaderboard, changed = (previous if previous is not None else Leaderboard()).update({
+        category.slug: None if isinstance(table, Exception) else table
+        for category, table in zip(CATEGORIES, tables)
+    })
+    logger.info(f"Merged {changed} categories into a leaderboard of {len(leaderboard)} scorers "
+                f"in {time.time() - start:.4f} seconds")
+    return leaderboard
+
+
+def scorer_leaderboard(versions=None):
+    return artifact('leaderboard', versions=versions)
@@ -0,0 +1,26 @@
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Repository root, so paths do not depend on the working directory
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(ROOT_PATH, 'data')
+# Kickoff format of the category files
+DATE_FORMAT = '%d/%m/%Y %H:%M'
+
+
+def data_file(file_name):
+    return os.path.join(DATA_PATH, file_name)
+
+
+def read_json(file_name):
+    file_path = data_file(file_name)
+    logger.info(f"Loading JSON: {file_path}")
+    start = time.time()
+    with open(file_path, 'r') as file:
+        data = json.load(file)
+    logger.info(f"Loaded JSON in {time.time() - start:.2f} seconds")
+    return data
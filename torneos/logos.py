@@ -0,0 +1,115 @@
+import logging
+import os
+import time
+
+import streamlit as st
+
+from torneos.ingest import LOGOS_FILE, file_version
+from torneos.loader import ROOT_PATH, read_json
+from torneos.thumbnails import publish_thumbnail, thumbnail_data_uri
+
+logger = logging.getLogger(__name__)
+
+
+# Column widths the tables render logos at
+LOGO_WIDTH = 40
+MOBILE_LOGO_WIDTH = 30
+
+# How tables reference logos: "data" inlines each thumbnail as a data URI in
+# every cell, "url" points at published files the browser downloads once.
+LOGO_MODE = os.environ.get('TORNEOS_LOGO_MODE', 'data')
+# Base URL of published logos: Streamlit static serving by default, or the
+# long-cache endpoint of asgi.py
+LOGO_BASE_URL = os.environ.get('TORNEOS_LOGO_BASE_URL', 'app/static/logos')
+
+
+def logo_thumbnail(image_path, width, mode):
+    try:
+        if mode == 'url':
+            return f"{LOGO_BASE_URL}/{publish_thumbnail(image_path, width)}"
+        return thumbnail_data_uri(image_path, width)
+    except (OSError, ValueError):
+        logger.warning(f"Failed to load image: {image_path}")
+        return ""
+
+
+# Built once per process, display width, mode and version of the logos file,
+# shared by every page and session
+@st.cache_resource
+def versioned_logo_dict(width, mode, version):
+    logos_data = read_json(LOGOS_FILE)
+    logo_dict = {}
+    missing_logos = []
+    start = time.time()
+    for item in logos_data:
+        team = item['equipo']
+        logo_path = f"{ROOT_PATH}{item['logo']}"
+        logo_url = logo_thumbnail(logo_path, width, mode)
+        if logo_url:
+            logo_dict[team] = logo_url
+        else:
+            missing_logos.append(f"{team}: {logo_path}")
+    logger.info(f"Built {width}px {mode} logo dict with {len(logo_dict)} logos in {time.time() - start:.2f} seconds")
+    return logo_dict, missing_logos
+
+
+def build_logo_dict(width=LOGO_WIDTH, mode=LOGO_MODE):
+    """(team -> logo, missing logos) of the current logos file."""
+    return versioned_logo_dict(width, mode, file_version(LOGOS_FILE))
+
+
+# Team names that don't start with their club's name, mapped to the club.
+# Prefix matches (e.g. "Tenis Azul" -> "Tenis") need no entry here.
+TEAM_ALIASES = {}
+
+
+def normalize_team(team):
+    return " ".join(team.casefold().split())
+
+
+class TeamResolver:
+    """Maps team names to the club they belong to and its logo.
+
+    A team belongs to the longest club name (or alias) that prefixes it word
+    by word, compared case-insensitively, so "CDA A" resolves to CDA however
+    the clubs are ordered and "UTN B" to Utn. Each lookup costs one dict hit
+    per word of the name, and every distinct name is resolved only once.
+    """
+
+    def __init__(self, logo_dict, aliases=TEAM_ALIASES):
+        self.logo_dict = logo_dict
+        self.clubs = {normalize_team(club): club for club in logo_dict}
+        self.clubs.update({normalize_team(alias): club for alias, club in aliases.items()})
+        self.max_words = max((len(key.split()) for key in self.clubs), default=0)
+        self.resolved = {}
+
+    def club(self, team):
+        club = self.resolved.get(team)
+        if club is None:
+            words = normalize_team(team).split()
+            club = team
+            for n_words in range(min(len(words), self.max_words), 0, -1):
+                prefix = " ".join(words[:n_words])
+                if prefix in self.clubs:
+                    club = self.clubs[prefix]
+                    break
+            self.resolved[team] = club
+        return club
+
+    def logo(self, team):
+        return self.logo_dict.get(self.club(team), "")
+
+    def logos(self, teams):
+        """Logo column for a Series of team names, resolving each distinct name once."""
+        return teams.map({team: self.logo(team) for team in teams.unique()})
+
+
+# Shared by every page and session, like the logo dict it wraps
+@st.cache_resource
+def versioned_team_resolver(width, mode, version):
+    logo_dict, _ = versioned_logo_dict(width, mode, version)
+    return TeamResolver(logo_dict)
+
+
+def team_resolver(width=LOGO_WIDTH, mode=LOGO_MODE):
+    return versioned_team_resolver(width, mode, file_version(LOGOS_FILE))
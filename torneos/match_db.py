@@ -0,0 +1,289 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import fields
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from torneos.categories import CATEGORIES
+from torneos.ingest import data_versions
+from torneos.loader import ROOT_PATH
+from torneos.logos import normalize_team
+from torneos.store import Match, load_category_matches
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.path.join(ROOT_PATH, '.cache', 'db', 'matches.sqlite')
+# Bumped whenever SCHEMA changes, so older files are rebuilt
+SCHEMA_VERSION = 2
+KICKOFF_FORMAT = '%Y-%m-%d %H:%M'
+
+SCHEMA = f"""
+PRAGMA user_version = {SCHEMA_VERSION};
+CREATE TABLE category_versions (category TEXT PRIMARY KEY, version TEXT);
+CREATE TABLE matches (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    round TEXT NOT NULL,
+    kickoff TEXT,
+    home TEXT NOT NULL,
+    away TEXT NOT NULL,
+    home_goals INTEGER,
+    away_goals INTEGER,
+    zone TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    referee_1 TEXT NOT NULL,
+    referee_2 TEXT NOT NULL,
+    obs TEXT NOT NULL,
+    venue_key TEXT NOT NULL
+);
+CREATE TABLE team_keys (team_key TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE match_teams (team_key TEXT NOT NULL, kickoff TEXT, match_id INTEGER NOT NULL REFERENCES matches(id));
+CREATE TABLE match_referees (referee_key TEXT NOT NULL, kickoff TEXT, match_id INTEGER NOT NULL REFERENCES matches(id));
+CREATE INDEX matches_kickoff ON matches (kickoff);
+CREATE INDEX matches_category ON matches (category, id);
+CREATE INDEX matches_venue ON matches (venue_key, kickoff);
+CREATE INDEX matches_result ON matches (category, round, home, away);
+-- Kickoff is copied into the lookup tables so a team's or referee's matches
+-- of a few days are one index range, however many seasons are stored
+CREATE INDEX match_teams_team ON match_teams (team_key, kickoff, match_id);
+CREATE INDEX match_referees_referee ON match_referees (referee_key, kickoff, match_id);
+"""
+MATCH_COLUMNS = ', '.join(f"m.{field.name}" for field in fields(Match))
+
+
+def kickoff_text(kickoff):
+    return None if kickoff is None else kickoff.strftime(KICKOFF_FORMAT)
+
+
+def row_match(row):
+    kickoff = None if row[2] is None else datetime.fromisoformat(row[2])
+    return Match(row[0], row[1], kickoff, *row[3:])
+
+
+def day_window(start, end, column='m.kickoff'):
+    """SQL condition and parameters for kickoffs from ``start`` to ``end``, both days included."""
+    conditions = []
+    params = []
+    if start is not None:
+        conditions.append(f"{column} >= ?")
+        params.append(start.isoformat())
+    if end is not None:
+        conditions.append(f"{column} < ?")
+        params.append((end + timedelta(days=1)).isoformat())
+    return "".join(f" AND {condition}" for condition in conditions), params
+
+
+def insert_matches(connection, matches):
+    """Add ``matches`` after the last stored id, so each category keeps its file order."""
+    first_id = connection.execute("SELECT COALESCE(MAX(id), -1) + 1 FROM matches").fetchone()[0]
+    numbered = list(enumerate(matches, first_id))
+    connection.executemany(
+        "INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (match_id, match.category, match.round, kickoff_text(match.kickoff), match.home, match.away,
+             match.home_goals, match.away_goals, match.zone, match.venue, match.referee_1, match.referee_2,
+             match.obs, normalize_team(match.venue))
+            for match_id, match in numbered
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO match_teams VALUES (?, ?, ?)",
+        ((normalize_team(team), kickoff_text(match.kickoff), match_id) for match_id, match in numbered
+         for team in (match.home, match.away) if team.strip()),
+    )
+    connection.execute(
+        "INSERT OR IGNORE INTO team_keys SELECT DISTINCT team_key FROM match_teams WHERE match_id >= ?", (first_id,)
+    )
+    connection.executemany(
+        "INSERT INTO match_referees VALUES (?, ?, ?)",
+        ((normalize_team(referee), kickoff_text(match.kickoff), match_id) for match_id, match in numbered
+         for referee in (match.referee_1, match.referee_2) if referee.strip()),
+    )
+
+
+def delete_category(connection, slug):
+    for table in ('match_teams', 'match_referees'):
+        connection.execute(f"DELETE FROM {table} WHERE match_id IN (SELECT id FROM matches WHERE category = ?)", (slug,))
+    connection.execute("DELETE FROM matches WHERE category = ?", (slug,))
+
+
+def create_db(path, matches=()):
+    """Write ``matches`` to a new database at ``path``, replacing any previous file atomically."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    with connection:
+        connection.executescript(SCHEMA)
+        insert_matches(connection, matches)
+        connection.execute("ANALYZE")
+    # WAL lets every session read while the single writer records results
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.close()
+    os.replace(tmp_path, path)
+
+
+class MatchDB:
+    """SQLite copy of every category's matches for queries across categories.
+
+    Each thread reads through its own connection; WAL mode keeps readers
+    from blocking on the single writer, which ``record_result`` serializes
+    with a lock. Queries return Match records ordered by kickoff. Team,
+    venue and referee lookups ignore case and spacing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._synced = None
+
+    def connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            # Safe with WAL: a crash can only lose the last commits, never corrupt the file
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def query(self, sql, params=()):
+        return [row_match(row) for row in self.connection().execute(sql, params)]
+
+    def values(self, sql, params=()):
+        return [row[0] for row in self.connection().execute(sql, params)]
+
+    def category(self, slug):
+        """Matches of a category in file order."""
+        return self.query(f"SELECT {MATCH_COLUMNS} FROM matches m WHERE m.category = ? ORDER BY m.id", (slug,))
+
+    def between(self, start, end):
+        """Matches from ``start`` to ``end``, both days included."""
+        window, params = day_window(start, end)
+        return self.query(f"SELECT {MATCH_COLUMNS} FROM matches m WHERE 1{window} ORDER BY m.kickoff, m.id", params)
+
+    def on(self, day):
+        return self.between(day, day)
+
+    def at_venues(self, venues, start=None, end=None):
+        """Matches at any of ``venues``; ``start`` and ``end`` optionally bound the days."""
+        keys = [normalize_team(venue) for venue in venues]
+        window, params = day_window(start, end)
+        return self.query(
+            f"SELECT {MATCH_COLUMNS} FROM matches m WHERE m.venue_key IN ({', '.join('?' * len(keys))}){window} "
+            "ORDER BY m.kickoff, m.id",
+            keys + params,
+        )
+
+    def refereed_by(self, referee, start=None, end=None):
+        window, params = day_window(start, end, 'r.kickoff')
+        return self.query(
+            f"SELECT {MATCH_COLUMNS} FROM match_referees r JOIN matches m ON m.id = r.match_id "
+            f"WHERE r.referee_key = ?{window} ORDER BY m.kickoff, m.id",
+            [normalize_team(referee)] + params,
+        )
+
+    def involving(self, team, category=None, exact=False, start=None, end=None):
+        """Matches of ``team``, or unless ``exact`` of every team of that club:
+        "Tenis" also finds "Tenis Azul" and "TENIS B".
+        """
+        key = normalize_team(team)
+        keys = "?"
+        params = [key]
+        if not exact:
+            # The name alone or followed by a space: "tenis " <= team_key < "tenis!"
+            keys = "SELECT team_key FROM team_keys WHERE team_key = ? OR (team_key >= ? AND team_key < ?)"
+            params += [f"{key} ", f"{key}!"]
+        window, window_params = day_window(start, end, 't.kickoff')
+        sql = (
+            f"SELECT {MATCH_COLUMNS} FROM matches m WHERE m.id IN "
+            f"(SELECT t.match_id FROM match_teams t WHERE t.team_key IN ({keys}){window})"
+        )
+        params += window_params
+        if category is not None:
+            sql += " AND m.category = ?"
+            params.append(category)
+        return self.query(sql + " ORDER BY m.kickoff, m.id", params)
+
+    def teams(self, category=None):
+        if category is None:
+            return self.values("SELECT home FROM matches WHERE home != '' UNION SELECT away FROM matches WHERE away != '' ORDER BY 1")
+        return self.values(
+            "SELECT home FROM matches WHERE category = ? AND home != '' "
+            "UNION SELECT away FROM matches WHERE category = ? AND away != '' "
+            "ORDER BY 1",
+            (category, category),
+        )
+
+    def referees(self):
+        return self.values(
+            "SELECT referee_1 FROM matches WHERE referee_1 != '' UNION SELECT referee_2 FROM matches WHERE referee_2 != '' "
+            "ORDER BY 1"
+        )
+
+    def venues(self):
+        """One spelling of each venue; lookups match the others anyway."""
+        return self.values("SELECT MIN(venue) FROM matches WHERE venue != '' GROUP BY venue_key ORDER BY 1")
+
+    def record_result(self, category, round, home, away, home_goals, away_goals):
+        """Set the score of a match; returns whether a match was found. Only one write runs at a time."""
+        with self._write_lock:
+            connection = self.connection()
+            with connection:
+                cursor = connection.execute(
+                    "UPDATE matches SET home_goals = ?, away_goals = ? "
+                    "WHERE category = ? AND round = ? AND home = ? AND away = ?",
+                    (home_goals, away_goals, category, round, home, away),
+                )
+        return cursor.rowcount > 0
+
+    def sync(self, versions):
+        """Replace the rows of each category whose file changed since the last sync.
+
+        Other categories are left untouched. Results recorded with
+        ``record_result`` last until their category file changes.
+        """
+        if self._synced == versions.fingerprint:
+            return
+        with self._write_lock:
+            connection = self.connection()
+            stored = dict(connection.execute("SELECT category, version FROM category_versions"))
+            for category in CATEGORIES:
+                version = versions.matches(category)
+                if stored.get(category.slug) == version:
+                    continue
+                start = time.time()
+                matches, _ = load_category_matches(category.slug, versions)
+                with connection:
+                    delete_category(connection, category.slug)
+                    insert_matches(connection, matches)
+                    connection.execute(
+                        "INSERT OR REPLACE INTO category_versions VALUES (?, ?)", (category.slug, version)
+                    )
+                logger.info(f"Synced {len(matches)} matches of {category.slug} in {time.time() - start:.3f} seconds")
+            self._synced = versions.fingerprint
+
+
+# One database file per process, synced category by category with the data files
+@st.cache_resource
+def build_match_db():
+    exists = os.path.exists(DB_PATH)
+    if exists:
+        connection = sqlite3.connect(DB_PATH)
+        exists = connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        connection.close()
+    if not exists:
+        logger.info("Creating match database")
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        create_db(DB_PATH)
+    return MatchDB(DB_PATH)
+
+
+def match_db(versions=None):
+    db = build_match_db()
+    db.sync(versions or data_versions())
+    return db
@@ -0,0 +1,79 @@
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from itertools import chain
+
+from torneos.artifacts import artifact, rule
+from torneos.categories import CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+
+class MatchIndex:
+    """Match records of every category keyed by calendar day.
+
+    Matches without a valid kickoff are left out. ``dates`` is kept sorted so
+    range queries are two bisects plus the matches they cover.
+    """
+
+    def __init__(self, matches):
+        by_date = {}
+        for match in sorted((m for m in matches if m.kickoff is not None), key=lambda m: m.kickoff):
+            by_date.setdefault(match.kickoff.date(), []).append(match)
+        self.by_date = {day: tuple(day_matches) for day, day_matches in by_date.items()}
+        self.dates = sorted(self.by_date)
+
+    @classmethod
+    def combine(cls, indexes):
+        """One index over ``indexes``; only days that several of them share are re-sorted."""
+        parts_by_date = {}
+        for index in indexes:
+            for day, matches in index.by_date.items():
+                parts_by_date.setdefault(day, []).append(matches)
+        combined = cls(())
+        combined.by_date = {
+            day: parts[0] if len(parts) == 1 else tuple(sorted(chain(*parts), key=lambda m: m.kickoff))
+            for day, parts in parts_by_date.items()
+        }
+        combined.dates = sorted(combined.by_date)
+        return combined
+
+    def __len__(self):
+        return sum(len(matches) for matches in self.by_date.values())
+
+    def on(self, day):
+        return self.by_date.get(day, ())
+
+    def between(self, start, end):
+        """Matches from ``start`` to ``end``, both days included, by kickoff."""
+        lo = bisect_left(self.dates, start)
+        hi = bisect_right(self.dates, end)
+        return [match for day in self.dates[lo:hi] for match in self.by_date[day]]
+
+    def upcoming(self, day, days=7):
+        """Matches in the ``days`` days after ``day``."""
+        return self.between(day + timedelta(days=1), day + timedelta(days=days))
+
+    def results(self, day):
+        """Played matches of ``day``."""
+        return [match for match in self.on(day) if match.played]
+
+
+@rule('day_index', inputs=lambda slug: [('matches', slug)])
+def build_category_match_index(loaded, slug):
+    matches, _ = loaded
+    return MatchIndex(matches)
+
+
+# Recombined from the per-category indexes when any category file changes
+@rule('match_index', inputs=lambda: [('day_index', category.slug) for category in CATEGORIES])
+def build_match_index(*indexes):
+    start = time.time()
+    index = MatchIndex.combine(indexes)
+    logger.info(f"Indexed {len(index)} matches on {len(index.dates)} dates in {time.time() - start:.2f} seconds")
+    return index
+
+
+def match_index(versions=None):
+    return artifact('match_index', versions=versions)
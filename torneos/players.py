@@ -0,0 +1,223 @@
+import logging
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from torneos.artifacts import artifact, rule, source
+from torneos.categories import CATEGORIES
+from torneos.ingest import LOGOS_FILE
+from torneos.loader import read_json
+from torneos.logos import TeamResolver
+
+logger = logging.getLogger(__name__)
+
+# Given names of one surname and club this alike are the same player:
+# "NICOLAS" and a mangled "NICOLS", "VALENTIN" and "VELENTIN"
+GIVEN_NAME_SIMILARITY = 0.85
+# Spellings that sound the same in Spanish, folded for the surname key
+SURNAME_SOUNDS = [(re.compile(pattern), sound) for pattern, sound in [
+    (r'H', ''), (r'LL', 'Y'), (r'QU', 'K'), (r'C(?=[EI])', 'S'), (r'C', 'K'), (r'Z', 'S'), (r'V', 'B'),
+    (r'(.)\1+', r'\1'),
+]]
+NOT_NAME = re.compile(r"[^A-Z0-9 ]+")
+CAREER_COLUMNS = ['Player', 'Club', 'Goals', 'Categories']
+APPEARANCE_COLUMNS = ['category', 'Goals', 'Player', 'Club']
+
+
+def fold_name(text):
+    """Uppercase ASCII letters, digits and single spaces: "  Nicolás " -> "NICOLAS", "D'ERASMO" -> "DERASMO"."""
+    # Decomposed, accents are combining marks the ASCII encoding drops
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().upper()
+    return " ".join(NOT_NAME.sub("", text).split())
+
+
+def split_player(player):
+    """(surname, given names) of a "SURNAME, GIVEN" scorer name, folded."""
+    surname, _, given = player.partition(',')
+    return fold_name(surname), fold_name(given)
+
+
+def surname_key(surname):
+    """Blocking key of a folded surname: no spaces and Spanish spellings that sound alike folded."""
+    key = surname.replace(' ', '')
+    for pattern, sound in SURNAME_SOUNDS:
+        key = pattern.sub(sound, key)
+    return key
+
+
+def same_given_names(first, second):
+    """Whether two folded given names of players with the same surname key and club are one player."""
+    if not first or not second:
+        return first == second
+    if first[0] != second[0]:
+        return False
+    # "JUAN" and "JUAN PABLO"
+    if (first + ' ').startswith(second + ' ') or (second + ' ').startswith(first + ' '):
+        return True
+    matcher = SequenceMatcher(None, first, second)
+    return (matcher.real_quick_ratio() >= GIVEN_NAME_SIMILARITY
+            and matcher.quick_ratio() >= GIVEN_NAME_SIMILARITY
+            and matcher.ratio() >= GIVEN_NAME_SIMILARITY)
+
+
+class PlayerIndex:
+    """Who each scorer row of every category is, so a player's goals add up across rows.
+
+    Scorer names are folded (accents, case, stray spaces and punctuation)
+    and clubs resolved to the club their team belongs to, so "PEDAL A" and
+    "PEDAL" are one club. Rows are then blocked by surname key and club:
+    only given names within a block are compared, never all pairs of rows,
+    and those alike enough are one player. Career totals and every row of a
+    player are precomputed, so lookups are index hits.
+    """
+
+    def __init__(self, tables, resolver):
+        # Each distinct (player, club) spelling is folded and blocked once; how many rows use it
+        spellings = {}
+        for table in tables.values():
+            for spelling in zip(table.column('Player').to_pylist(), table.column('Club').to_pylist()):
+                spellings[spelling] = spellings.get(spelling, 0) + 1
+        blocks, club_keys, surname_keys = {}, {}, {}
+        for spelling in spellings:
+            player, club = spelling
+            surname, given = split_player(player)
+            if club not in club_keys:
+                club_keys[club] = fold_name(resolver.club(club))
+            if surname not in surname_keys:
+                surname_keys[surname] = surname_key(surname)
+            block = blocks.setdefault((surname_keys[surname], club_keys[club]), {})
+            block.setdefault(given, []).append(spelling)
+
+        player_of = {}
+        self.names = []
+        self.clubs = []
+        for given_names in blocks.values():
+            for group in self._group_given_names(list(given_names)):
+                player_id = len(self.names)
+                group_spellings = [spelling for given in group for spelling in given_names[given]]
+                for spelling in group_spellings:
+                    player_of[spelling] = player_id
+                self.names.append(self._display_name(group_spellings, spellings))
+                self.clubs.append(resolver.club(group_spellings[0][1]))
+
+        # Rows of every category, grouped by player
+        slugs, codes, goals, players, clubs, ids = [], [], [], [], [], []
+        self.row_players = {}
+        for code, (slug, table) in enumerate(tables.items()):
+            table_players = table.column('Player').to_pylist()
+            table_clubs = table.column('Club').to_pylist()
+            row_ids = np.fromiter((player_of[spelling] for spelling in zip(table_players, table_clubs)),
+                                  dtype=np.int64, count=len(table_players))
+            self.row_players[slug] = row_ids
+            slugs += [slug] * len(table_players)
+            codes.append(np.full(len(table_players), code))
+            goals.append(table.column('Goals').to_numpy())
+            players += table_players
+            clubs += table_clubs
+            ids.append(row_ids)
+        ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+        goals = np.concatenate(goals) if goals else np.empty(0, dtype=np.int64)
+        order = np.argsort(ids, kind='stable')
+        self._offsets = np.searchsorted(ids[order], np.arange(len(self.names) + 1))
+        self._rows = pd.DataFrame({
+            'category': np.array(slugs, dtype=object)[order],
+            'Goals': goals[order],
+            'Player': np.array(players, dtype=object)[order],
+            'Club': np.array(clubs, dtype=object)[order],
+        }, columns=APPEARANCE_COLUMNS)
+        self.goals = np.bincount(ids, weights=goals, minlength=len(self.names)).astype(np.int64)
+        codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int64)
+        scored_in = np.unique(ids * max(1, len(tables)) + codes) // max(1, len(tables))
+        self.n_categories = np.bincount(scored_in, minlength=len(self.names))
+        # Folded "SURNAME GIVEN" of every player, sorted for prefix search
+        self._search = sorted(
+            (fold_name(name.replace(',', ' ')), player_id) for player_id, name in enumerate(self.names)
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def _group_given_names(given_names):
+        """Partition the folded given names of one block into players, comparing only within the block."""
+        parent = list(range(len(given_names)))
+
+        def root(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i in range(len(given_names)):
+            for j in range(i + 1, len(given_names)):
+                if same_given_names(given_names[i], given_names[j]):
+                    parent[root(j)] = root(i)
+        groups = {}
+        for i, given in enumerate(given_names):
+            groups.setdefault(root(i), []).append(given)
+        return list(groups.values())
+
+    @staticmethod
+    def _display_name(spellings, rows):
+        """The spelling most rows of a player use, with the stray spaces around its comma removed."""
+        counts = {}
+        for spelling in spellings:
+            surname, _, given = spelling[0].partition(',')
+            name = f"{' '.join(surname.split())}, {' '.join(given.split())}".upper()
+            counts[name] = counts.get(name, 0) + rows[spelling]
+        return max(counts, key=lambda name: (counts[name], name))
+
+    def rows(self, player_id):
+        """Every scorer row of a player: category, Goals and the Player and Club as spelt there."""
+        return self._rows.iloc[self._offsets[player_id]:self._offsets[player_id + 1]].reset_index(drop=True)
+
+    def search(self, text, limit=20):
+        """Players whose folded "SURNAME GIVEN" starts with ``text`` folded, at most ``limit``."""
+        key = fold_name(text.replace(',', ' '))
+        found = []
+        position = bisect_left(self._search, (key, -1))
+        while position < len(self._search) and len(found) < limit:
+            name, player_id = self._search[position]
+            if not name.startswith(key):
+                break
+            found.append(player_id)
+            position += 1
+        return found
+
+    def careers(self, n=None):
+        """Career goals of the ``n`` leading players, all when None, and how many categories they scored in."""
+        order = np.lexsort((np.array(self.names, dtype=object), -self.goals))[:n]
+        return pd.DataFrame({
+            'Player': np.array(self.names, dtype=object)[order],
+            'Club': np.array(self.clubs, dtype=object)[order],
+            'Goals': self.goals[order],
+            'Categories': self.n_categories[order],
+        }, columns=CAREER_COLUMNS)
+
+
+def club_resolver():
+    """Resolves a scorer's team to its club by the club names of logos.json."""
+    return TeamResolver({item['equipo']: "" for item in read_json(LOGOS_FILE)})
+
+
+# Every category's scorers in one index; a missing or invalid file leaves its category out
+@rule('player_index', keep_going=True, inputs=lambda: (
+    [source(LOGOS_FILE)] + [('scorer_table', category.slug) for category in CATEGORIES]
+))
+def build_player_index(logos, *tables):
+    start = time.time()
+    resolver = TeamResolver({}) if isinstance(logos, Exception) else club_resolver()
+    index = PlayerIndex({
+        category.slug: table for category, table in zip(CATEGORIES, tables) if not isinstance(table, Exception)
+    }, resolver)
+    logger.info(f"Indexed {len(index)} players in {time.time() - start:.4f} seconds")
+    return index
+
+
+def player_index(versions=None):
+    return artifact('player_index', versions=versions)
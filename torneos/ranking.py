@@ -0,0 +1,62 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from torneos.artifacts import artifact, rule
+
+logger = logging.getLogger(__name__)
+
+RANKING_COLUMNS = ['Zona', 'Team', 'Posición', 'MP', 'Pts', 'PPM', 'GD', 'GF', 'Ranking', 'General']
+
+
+def cross_zone_ranking(frames, per_match=True):
+    """Rank the teams of every zone table against the other zones in one pass.
+
+    ``frames`` are zone tables in table order, as ``StandingsState.frames``
+    returns them. ``Ranking`` orders the teams that finished in the same
+    place of their zones (the best runners-up, the best thirds, ...) and
+    ``General`` orders every team. Both compare points, goal difference and
+    goals for per match played, so zones of different sizes stay comparable,
+    then names; ``per_match=False`` compares the totals instead.
+    """
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=RANKING_COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    sizes = np.array([len(frame) for frame in frames])
+    position = np.arange(len(df)) - np.repeat(np.cumsum(sizes) - sizes, sizes) + 1
+
+    scale = df['MP'].to_numpy(dtype=np.float64) if per_match else np.ones(len(df))
+    points = df['Pts'].to_numpy() / scale
+    goal_difference = df['GD'].to_numpy() / scale
+    goals_for = df['GF'].to_numpy() / scale
+    teams = df['Team'].to_numpy(dtype=str)
+
+    # The same sort keys with and without the zone position in front
+    keys = (teams, -goals_for, -goal_difference, -points)
+    general = np.empty(len(df), dtype=np.int64)
+    general[np.lexsort(keys)] = np.arange(1, len(df) + 1)
+    by_position = np.lexsort(keys + (position,))
+    sorted_position = position[by_position]
+    first = np.searchsorted(sorted_position, sorted_position, side='left')
+    ranking = np.empty(len(df), dtype=np.int64)
+    ranking[by_position] = np.arange(len(df)) - first + 1
+
+    df_ranking = df.assign(**{'Posición': position, 'PPM': df['Pts'] / df['MP'], 'Ranking': ranking, 'General': general})
+    columns = RANKING_COLUMNS + (['Logo'] if 'Logo' in df else [])
+    return df_ranking.iloc[by_position][columns].reset_index(drop=True)
+
+
+# Rebuilt with the group tables it is computed from
+@rule('cross_zone_ranking', inputs=lambda slug: [('standings', slug)])
+def build_cross_zone_ranking(standings, slug):
+    start = time.time()
+    df_ranking = cross_zone_ranking(standings[1])
+    logger.info(f"Ranked {len(df_ranking)} teams across zones of {slug} in {time.time() - start:.4f} seconds")
+    return df_ranking
+
+
+def category_cross_zone_ranking(slug, versions=None):
+    return artifact('cross_zone_ranking', slug, versions=versions)
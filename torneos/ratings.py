@@ -0,0 +1,228 @@
+import logging
+import time
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from torneos.artifacts import artifact, rule
+from torneos.categories import CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32
+# Rating points the home side gets in the expectation; many matches are at a shared venue
+HOME_ADVANTAGE = 0.0
+# Rating difference at which the stronger side expects ten times the weaker one's score
+ELO_SCALE = 400
+
+
+def expected_score(rating, opponent):
+    """Expected score of ``rating`` against ``opponent``: win 1, draw 0.5, loss 0."""
+    return 1 / (1 + 10 ** ((opponent - rating) / ELO_SCALE))
+
+
+def margin_multiplier(goal_difference):
+    """Weight of a result by its margin, as in the World Football Elo ratings."""
+    margin = abs(goal_difference)
+    if margin <= 1:
+        return 1.0
+    if margin == 2:
+        return 1.5
+    return (11 + margin) / 8
+
+
+class Ratings:
+    """Elo ratings of every team, kept current one result at a time.
+
+    A team is a name within a category, so a club's squads are rated
+    apart. Current ratings are one array indexed by team id. The history
+    is parallel arrays with one row per rated match in kickoff order: both
+    team ids, their ratings before the match and the points the home side
+    took. A result after the last rated one is applied on its own; a late
+    or corrected result rewinds the matches after it and replays only
+    those. Ratings handed out are never changed: the ratings rule updates
+    a copy.
+    """
+
+    def __init__(self):
+        # (category, team) -> id, and back
+        self.index = {}
+        self.teams = []
+        self.rating = np.empty(0)
+        # (category, round, home, away) -> (kickoff, home goals, away goals) of every rated match
+        self._results = {}
+        # (kickoff, category, round, home, away) of each history row, for bisecting
+        self._order = []
+        self.home = np.empty(0, dtype=np.int32)
+        self.away = np.empty(0, dtype=np.int32)
+        self.home_before = np.empty(0)
+        self.away_before = np.empty(0)
+        self.delta = np.empty(0)
+
+    def __len__(self):
+        return len(self._order)
+
+    def copy(self):
+        """Ratings to update while these, which other sessions may be reading, stay as they are."""
+        ratings = Ratings()
+        ratings.index = dict(self.index)
+        ratings.teams = list(self.teams)
+        ratings.rating = self.rating.copy()
+        ratings._results = dict(self._results)
+        ratings._order = list(self._order)
+        for name in ('home', 'away', 'home_before', 'away_before', 'delta'):
+            setattr(ratings, name, getattr(self, name).copy())
+        return ratings
+
+    @staticmethod
+    def match_results(matches):
+        """Results of the played ``matches`` with a kickoff, keyed like the ratings."""
+        return {
+            (match.category, match.round, match.home, match.away): (match.kickoff, match.home_goals, match.away_goals)
+            for match in matches
+            if match.played and match.kickoff is not None
+        }
+
+    def of(self, category, team):
+        team_id = self.index.get((category, team))
+        return INITIAL_RATING if team_id is None else float(self.rating[team_id])
+
+    def category_ratings(self, category):
+        """team -> current rating of every rated team of ``category``."""
+        return {team: float(self.rating[team_id]) for (slug, team), team_id in self.index.items() if slug == category}
+
+    def history(self, category, team):
+        """Kickoff and rating after each rated match of a team, oldest first."""
+        team_id = self.index.get((category, team))
+        if team_id is None:
+            return pd.DataFrame({'Fecha': pd.Series(dtype='datetime64[ns]'), 'Rating': pd.Series(dtype=float)})
+        n = len(self)
+        at_home = self.home[:n] == team_id
+        rows = np.flatnonzero(at_home | (self.away[:n] == team_id))
+        after = np.where(
+            at_home[rows], self.home_before[rows] + self.delta[rows], self.away_before[rows] - self.delta[rows]
+        )
+        return pd.DataFrame({'Fecha': pd.to_datetime([self._order[row][0] for row in rows]), 'Rating': after})
+
+    def sync(self, results):
+        """Bring the ratings in line with ``results``, every rated match keyed as ``match_results`` does."""
+        if not self._results:
+            return self.update(results)
+        changed = {key: result for key, result in results.items() if self._results.get(key) != result}
+        removed = [key for key in self._results if key not in results]
+        return self.update(changed, removed)
+
+    def update(self, changed, removed=()):
+        """Rate the new or corrected ``changed`` results and forget the ``removed`` matches.
+
+        Returns how many history rows were replayed: one per result when
+        they all come after the last rated match.
+        """
+        removed = [key for key in removed if key in self._results]
+        if not changed and not removed:
+            return 0
+        # Everything from the earliest row a change touches is rewound
+        added = [(kickoff, *key) for key, (kickoff, _, _) in changed.items()]
+        moved = [(self._results[key][0], *key) for key in removed + [key for key in changed if key in self._results]]
+        first = bisect_left(self._order, min(added + moved))
+        rewound = self._order[first:]
+        self._rewind(first)
+        for key in removed:
+            del self._results[key]
+        self._results.update(changed)
+        # The rewound matches that are still there, at their current kickoff, and the new ones
+        if rewound:
+            replay = sorted(
+                {(self._results[order[1:]][0], *order[1:]) for order in rewound if order[1:] in self._results}
+                | set(added)
+            )
+        else:
+            replay = sorted(added)
+        self._apply(replay)
+        return len(replay)
+
+    def _rewind(self, first):
+        """Drop history rows from ``first`` on, restoring every team's rating from before them."""
+        n = len(self)
+        if first >= n:
+            return
+        # A team's rating before the rewound rows is its rating before the first of them it played
+        team_ids = np.stack([self.home[first:n], self.away[first:n]], axis=1).ravel()
+        before = np.stack([self.home_before[first:n], self.away_before[first:n]], axis=1).ravel()
+        team_ids, earliest = np.unique(team_ids, return_index=True)
+        self.rating[team_ids] = before[earliest]
+        del self._order[first:]
+
+    def _apply(self, orders):
+        """Rate the matches of ``orders`` after the current history, in that order."""
+        first = len(self)
+        last = first + len(orders)
+        self._reserve(last)
+        index, teams, results = self.index, self.teams, self._results
+        rating = self.rating.tolist()
+        # Weight and home score of each goal difference, worked out once
+        outcomes = {}
+        history = []
+        for _, category, round, home, away in orders:
+            home_id = index.get((category, home))
+            if home_id is None:
+                home_id = index[(category, home)] = len(teams)
+                teams.append((category, home))
+                rating.append(INITIAL_RATING)
+            away_id = index.get((category, away))
+            if away_id is None:
+                away_id = index[(category, away)] = len(teams)
+                teams.append((category, away))
+                rating.append(INITIAL_RATING)
+            _, home_goals, away_goals = results[(category, round, home, away)]
+            outcome = outcomes.get(home_goals - away_goals)
+            if outcome is None:
+                score = 1.0 if home_goals > away_goals else 0.5 if home_goals == away_goals else 0.0
+                outcome = outcomes[home_goals - away_goals] = (
+                    K_FACTOR * margin_multiplier(home_goals - away_goals), score
+                )
+            weight, score = outcome
+            home_rating, away_rating = rating[home_id], rating[away_id]
+            change = weight * (score - 1 / (1 + 10 ** ((away_rating - home_rating - HOME_ADVANTAGE) / ELO_SCALE)))
+            rating[home_id] = home_rating + change
+            rating[away_id] = away_rating - change
+            history.append((home_id, away_id, home_rating, away_rating, change))
+        self.rating = np.array(rating)
+        if history:
+            home_ids, away_ids, home_before, away_before, delta = zip(*history)
+            self.home[first:last] = home_ids
+            self.away[first:last] = away_ids
+            self.home_before[first:last] = home_before
+            self.away_before[first:last] = away_before
+            self.delta[first:last] = delta
+        self._order.extend(orders)
+
+    def _reserve(self, size):
+        """Grow the history arrays, doubling, to hold ``size`` rows."""
+        capacity = len(self.home)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 1024)
+        for name in ('home', 'away', 'home_before', 'away_before', 'delta'):
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+
+# Kept across versions of the data files: a copy of the previous ratings
+# rates a new result on its own, and only an out-of-order one replays the
+# matches after it
+@rule('ratings', inputs=lambda: [('matches', category.slug) for category in CATEGORIES], incremental=True)
+def build_ratings(*loaded, previous=None):
+    start = time.time()
+    ratings = previous.copy() if previous is not None else Ratings()
+    replayed = ratings.sync(Ratings.match_results(match for matches, _ in loaded for match in matches))
+    logger.info(f"Rated {replayed} of {len(ratings)} matches in {time.time() - start:.4f} seconds")
+    return ratings
+
+
+def team_ratings(versions=None):
+    return artifact('ratings', versions=versions)
@@ -0,0 +1,71 @@
+import logging
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import accumulate
+from zoneinfo import ZoneInfo
+
+from torneos.artifacts import artifact, rule
+
+logger = logging.getLogger(__name__)
+
+ARGENTINA_TZ = ZoneInfo('America/Argentina/Buenos_Aires')
+# A round stays current this long after its last kickoff, so its results lead that night
+ROUND_GRACE = timedelta(hours=6)
+
+
+def argentina_now():
+    """Wall-clock time in Argentina, naive like the kickoffs in the data files."""
+    return datetime.now(ARGENTINA_TZ).replace(tzinfo=None)
+
+
+class RoundCalendar:
+    """First and last kickoff of every round of a category, sorted by first kickoff.
+
+    ``reach`` is the latest last kickoff of each round and the rounds
+    before it, so it is sorted too and the current round is one bisect.
+    Rounds without any valid kickoff are left out.
+    """
+
+    def __init__(self, matches):
+        spans = {}
+        for match in matches:
+            if match.kickoff is None:
+                continue
+            span = spans.get(match.round)
+            spans[match.round] = (match.kickoff, match.kickoff) if span is None else (
+                min(span[0], match.kickoff), max(span[1], match.kickoff)
+            )
+        ordered = sorted(spans.items(), key=lambda item: item[1])
+        self.rounds = tuple(round for round, _ in ordered)
+        self.starts = [first for _, (first, _) in ordered]
+        self.ends = [last for _, (_, last) in ordered]
+        self.reach = list(accumulate(self.ends, max))
+
+    def __len__(self):
+        return len(self.rounds)
+
+    def current(self, now=None):
+        """The round being played at ``now`` or, between rounds, the next one; the last once all are over.
+
+        ``now`` defaults to the time in Argentina.
+        """
+        if not self.rounds:
+            return None
+        now = argentina_now() if now is None else now
+        position = bisect_left(self.reach, now - ROUND_GRACE)
+        return self.rounds[min(position, len(self.rounds) - 1)]
+
+
+# Once per version of the category file; reruns only bisect it
+@rule('round_calendar', inputs=lambda slug: [('matches', slug)])
+def build_round_calendar(loaded, slug):
+    start = time.time()
+    matches, _ = loaded
+    calendar = RoundCalendar(matches)
+    logger.info(f"Built the calendar of {len(calendar)} rounds of {slug} in {time.time() - start:.4f} seconds")
+    return calendar
+
+
+def round_calendar(slug, versions=None):
+    return artifact('round_calendar', slug, versions=versions)
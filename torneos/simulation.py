@@ -0,0 +1,311 @@
+import logging
+import math
+import multiprocessing
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from torneos.artifacts import artifact, rule
+from torneos.categories import CATEGORIES_BY_SLUG
+from torneos.ratings import HOME_ADVANTAGE, INITIAL_RATING, expected_score
+from torneos.standings import DEFAULT_ZONE, POINTS_DRAW, POINTS_WIN, StandingsState
+from torneos.tiebreakers import DEFAULT_TIEBREAKERS, table_places
+
+logger = logging.getLogger(__name__)
+
+SIMULATIONS = 100_000
+BATCH_SIZE = 10_000
+# Matches of league-average scoring every team starts from, so a few results do not make a team unbeatable
+PRIOR_MATCHES = 3
+# Goals per team and match when a category has no results yet
+DEFAULT_GOALS = 3.0
+# Goal draws stop once the Poisson tail left is below this, or at MAX_GOALS
+GOALS_TAIL = 1e-9
+MAX_GOALS = 60
+
+
+@dataclass
+class ZoneSeason:
+    """What is left of a zone's season: current totals and the remaining matches with their expected goals."""
+    zone: str
+    teams: tuple
+    tiebreakers: tuple
+    points: np.ndarray
+    goal_difference: np.ndarray
+    goals_for: np.ndarray
+    # Head-to-head points and goals of each team against each other so far
+    pair_points: np.ndarray
+    pair_goals: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    home_rate: np.ndarray
+    away_rate: np.ndarray
+
+
+@dataclass
+class ZoneOdds:
+    """How often each team finished in each place of its zone; ``probabilities[team, place]``."""
+    zone: str
+    teams: tuple
+    probabilities: np.ndarray
+    remaining: int
+    simulations: int
+
+    def frame(self, qualifiers=0):
+        """Odds of every team as percentages: title, qualification, last place and every place."""
+        n_teams = len(self.teams)
+        percent = self.probabilities * 100
+        df = pd.DataFrame({'Team': list(self.teams), 'Campeón': percent[:, 0]})
+        if qualifiers:
+            df['Clasifica'] = percent[:, :qualifiers].sum(axis=1)
+        df['Último'] = percent[:, -1]
+        for place in range(n_teams):
+            df[f"{place + 1}°"] = percent[:, place]
+        # Most likely finish first
+        expected_place = self.probabilities @ np.arange(1, n_teams + 1)
+        return df.iloc[np.argsort(expected_place, kind='stable')].reset_index(drop=True)
+
+
+def scoring_rates(matches):
+    """(attack, defence, league average) from the played matches of a category.
+
+    A team's attack and defence are the goals it scored and conceded per
+    match relative to the league average, shrunk towards 1 by
+    PRIOR_MATCHES; a team without results is average.
+    """
+    scored, conceded, played = {}, {}, {}
+    for match in matches:
+        if not match.played:
+            continue
+        for team, goals_for, goals_against in (
+            (match.home, match.home_goals, match.away_goals), (match.away, match.away_goals, match.home_goals)
+        ):
+            scored[team] = scored.get(team, 0) + goals_for
+            conceded[team] = conceded.get(team, 0) + goals_against
+            played[team] = played.get(team, 0) + 1
+    n_sides = sum(played.values())
+    total = sum(scored.values())
+    average = total / n_sides if total else DEFAULT_GOALS
+    weight = PRIOR_MATCHES * average
+    attack = {team: (scored[team] + weight) / ((played[team] + PRIOR_MATCHES) * average) for team in played}
+    defence = {team: (conceded[team] + weight) / ((played[team] + PRIOR_MATCHES) * average) for team in played}
+    return attack, defence, average
+
+
+def zone_seasons(matches, tiebreakers, ratings=None):
+    """ZoneSeason of every zone of the regular season, and the current table order of each zone.
+
+    A remaining match expects as many goals as the two teams' attack and
+    defence give; with ``ratings`` (team -> Elo rating) those goals are
+    split between the teams by the home side's Elo expected score instead.
+    """
+    results = StandingsState.match_results(matches)
+    state = StandingsState.from_results(results, tiebreakers)
+    attack, defence, average = scoring_rates(matches)
+    remaining_by_zone = {}
+    for match in matches:
+        if match.regular_season and not match.is_bye and not match.played:
+            remaining_by_zone.setdefault(match.zone or DEFAULT_ZONE, []).append(match)
+
+    seasons = []
+    for zone in sorted(set(state.zones()) | set(remaining_by_zone)):
+        table = state.table(zone)
+        remaining = remaining_by_zone.get(zone, [])
+        teams = [row[0] for row in table]
+        for match in remaining:
+            teams.extend(team for team in (match.home, match.away) if team not in teams)
+        index = {team: i for i, team in enumerate(teams)}
+        totals = np.zeros((3, len(teams)), dtype=np.int64)
+        for team, _, _, _, _, points, goals_for, _, goal_difference in table:
+            totals[:, index[team]] = points, goal_difference, goals_for
+        pairs = np.zeros((2, len(teams), len(teams)), dtype=np.int64)
+        for (_, home, away), (result_zone, home_goals, away_goals) in results.items():
+            if result_zone != zone:
+                continue
+            for team, other, goals_for, goals_against in (
+                (index[home], index[away], home_goals, away_goals), (index[away], index[home], away_goals, home_goals)
+            ):
+                pairs[0, team, other] += POINTS_WIN if goals_for > goals_against else POINTS_DRAW if goals_for == goals_against else 0
+                pairs[1, team, other] += goals_for
+        home_rate = np.array([average * attack.get(match.home, 1) * defence.get(match.away, 1) for match in remaining])
+        away_rate = np.array([average * attack.get(match.away, 1) * defence.get(match.home, 1) for match in remaining])
+        if ratings is not None and remaining:
+            home_share = expected_score(
+                np.array([ratings.get(match.home, INITIAL_RATING) for match in remaining]) + HOME_ADVANTAGE,
+                np.array([ratings.get(match.away, INITIAL_RATING) for match in remaining]),
+            )
+            total = home_rate + away_rate
+            home_rate, away_rate = total * home_share, total * (1 - home_share)
+        seasons.append(ZoneSeason(
+            zone, tuple(teams), tiebreakers, totals[0], totals[1], totals[2], pairs[0], pairs[1],
+            np.array([index[match.home] for match in remaining], dtype=np.int64),
+            np.array([index[match.away] for match in remaining], dtype=np.int64),
+            home_rate, away_rate,
+        ))
+    return seasons
+
+
+def poisson_goals(rng, rates, n_simulations):
+    """Poisson goals ``[simulation, match]`` for the scoring ``rates`` of each match.
+
+    Inverts each match's cumulative distribution against one uniform draw,
+    a few times faster than ``Generator.poisson`` with a different rate per
+    column. Goals are float32, exact for any score, so the totals that
+    follow are BLAS matrix products.
+    """
+    goals = np.arange(MAX_GOALS)
+    log_factorial = np.array([math.lgamma(k + 1) for k in goals])
+    cdf = np.cumsum(np.exp(goals * np.log(rates)[:, None] - rates[:, None] - log_factorial), axis=1)
+    uniform = rng.random((n_simulations, len(rates)), dtype=np.float32)
+    drawn = np.zeros((n_simulations, len(rates)), dtype=np.float32)
+    for k in goals:
+        if cdf[:, k].min() > 1 - GOALS_TAIL:
+            break
+        drawn += uniform >= cdf[:, k].astype(np.float32)
+    return drawn
+
+
+def simulated_tables(season, n_simulations, rng):
+    """Points, goal difference, goals for ``[simulation, team]`` and head-to-head ``[simulation, team, other]``.
+
+    Every remaining match of every simulation is drawn at once as Poisson
+    goals; totals are the current ones plus one matrix product per stat.
+    """
+    n_teams = len(season.teams)
+    n_remaining = len(season.home)
+    home_goals = poisson_goals(rng, season.home_rate, n_simulations)
+    away_goals = poisson_goals(rng, season.away_rate, n_simulations)
+    margin = home_goals - away_goals
+    drawn = np.float32(POINTS_DRAW) * (margin == 0)
+    home_points = np.float32(POINTS_WIN) * (margin > 0) + drawn
+    away_points = np.float32(POINTS_WIN) * (margin < 0) + drawn
+
+    # Which team plays home and away in each remaining match
+    home_side = np.zeros((n_remaining, n_teams), dtype=np.float32)
+    home_side[np.arange(n_remaining), season.home] = 1
+    away_side = np.zeros((n_remaining, n_teams), dtype=np.float32)
+    away_side[np.arange(n_remaining), season.away] = 1
+    points = season.points + home_points @ home_side + away_points @ away_side
+    goal_difference = season.goal_difference + margin @ (home_side - away_side)
+    goals_for = season.goals_for + home_goals @ home_side + away_goals @ away_side
+
+    # Which head-to-head cell each side of each remaining match adds to, home sides first
+    cell = np.zeros((2 * n_remaining, n_teams * n_teams), dtype=np.float32)
+    cell[np.arange(2 * n_remaining), np.concatenate([season.home * n_teams + season.away, season.away * n_teams + season.home])] = 1
+    pair_points = np.concatenate([home_points, away_points], axis=1) @ cell
+    pair_points += season.pair_points.ravel().astype(np.float32)
+    pair_goals = np.concatenate([home_goals, away_goals], axis=1) @ cell
+    pair_goals += season.pair_goals.ravel().astype(np.float32)
+    shape = (n_simulations, n_teams, n_teams)
+    return points, goal_difference, goals_for, pair_points.reshape(shape), pair_goals.reshape(shape)
+
+
+def simulate_zone(season, n_simulations, seed):
+    """Place counts ``[team, place]`` of the zone over ``n_simulations`` random completions.
+
+    Simulated tables are ranked like the real one: by points, then the
+    zone's tie-breakers on the simulated head-to-head results.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(season.teams)
+    places = table_places(season.teams, *simulated_tables(season, n_simulations, rng), criteria=season.tiebreakers)
+    cells = np.arange(n_teams) * n_teams + places
+    return np.bincount(cells.ravel(), minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+
+
+def simulate_categories(matches_by_slug, n_simulations=SIMULATIONS, pool=None, ratings=None):
+    """ZoneOdds of every zone of each category, slug -> tuple.
+
+    ``ratings``, the Elo ratings of every category, split the expected
+    goals of each remaining match (see ``zone_seasons``).
+
+    Every zone with matches left is split into batches of BATCH_SIZE
+    simulations, and the batches of all categories go to ``pool`` together
+    (or run here without one). Seeds depend only on category, zone and
+    batch, so the same data always gives the same odds.
+    """
+    start = time.time()
+    seasons = {}
+    for slug, matches in matches_by_slug.items():
+        category = CATEGORIES_BY_SLUG.get(slug)
+        seasons[slug] = zone_seasons(
+            matches, category.tiebreakers if category else DEFAULT_TIEBREAKERS,
+            ratings.category_ratings(slug) if ratings is not None else None,
+        )
+    batches = []
+    for slug, zones in seasons.items():
+        for season in zones:
+            if len(season.home) == 0:
+                continue
+            zone_seed = zlib.crc32(f"{slug}/{season.zone}".encode())
+            for batch, first in enumerate(range(0, n_simulations, BATCH_SIZE)):
+                size = min(BATCH_SIZE, n_simulations - first)
+                batches.append(((slug, season.zone), (season, size, (zone_seed, batch))))
+    if pool is None:
+        results = [simulate_zone(*args) for _, args in batches]
+    else:
+        results = [future.result() for future in [pool.submit(simulate_zone, *args) for _, args in batches]]
+    counts = {}
+    for (key, _), result in zip(batches, results):
+        counts[key] = counts[key] + result if key in counts else result
+
+    odds = {}
+    for slug, zones in seasons.items():
+        odds[slug] = []
+        for season in zones:
+            n_teams = len(season.teams)
+            if (slug, season.zone) in counts:
+                probabilities = counts[(slug, season.zone)] / n_simulations
+                simulations = n_simulations
+            else:
+                # Nothing left to play: the current table is final
+                probabilities = np.eye(n_teams)
+                simulations = 0
+            odds[slug].append(ZoneOdds(season.zone, season.teams, probabilities, len(season.home), simulations))
+        odds[slug] = tuple(odds[slug])
+    logger.info(f"Simulated {len(matches_by_slug)} categories in {len(batches)} batches in {time.time() - start:.2f} seconds")
+    return odds
+
+
+# One pool per process; spawned workers do not inherit the server's threads
+@st.cache_resource
+def simulation_pool():
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn'))
+
+
+def simulate_in_pool(matches_by_slug, ratings):
+    """``simulate_categories`` in the shared pool, replaced and tried once more if a worker died."""
+    for attempt in range(2):
+        pool = simulation_pool()
+        try:
+            return simulate_categories(matches_by_slug, pool=pool, ratings=ratings)
+        except BrokenProcessPool:
+            # A crashed or killed worker breaks the pool for good; the next build gets a new one
+            logger.warning(f"Simulation pool broken on attempt {attempt + 1}, starting a new one")
+            pool.shutdown(wait=False, cancel_futures=True)
+            simulation_pool.clear()
+            if attempt:
+                raise
+
+
+# Per category, so the first odds of a category only simulate that one. A
+# result elsewhere moves the ratings but not this category's, which only
+# move with its own results, so the previous odds stand while its matches do
+@rule('simulations', inputs=lambda slug: [('ratings',), ('matches', slug)], incremental=True)
+def build_simulations(ratings, loaded, slug, previous=None):
+    matches, _ = loaded
+    if previous is not None and previous[0] == matches:
+        return previous
+    return matches, simulate_in_pool({slug: matches}, ratings)[slug]
+
+
+def category_odds(slug, versions=None):
+    """ZoneOdds of every zone of a category, cached until one of its results changes."""
+    return artifact('simulations', slug, versions=versions)[1]
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from torneos.loader import DATE_FORMAT, data_file
+
+MATCH_FIELDS = {
+    'Fecha': 'kickoff', 'Local': 'home', 'Visitante': 'away', 'GL': 'home_goals', 'GV': 'away_goals',
+    'Zona': 'zone', 'Cancha': 'venue', 'Arbitro 1': 'referee_1', 'Arbitro 2': 'referee_2', 'OBS': 'obs',
+}
+# Repeated labels are stored once per column as Arrow dictionaries
+LABEL = pa.dictionary(pa.int32(), pa.string())
+# Same field order as store.Match
+MATCH_SCHEMA = pa.schema([
+    ('category', LABEL), ('round', LABEL), ('kickoff', pa.timestamp('s')), ('home', LABEL), ('away', LABEL),
+    ('home_goals', pa.int16()), ('away_goals', pa.int16()), ('zone', LABEL), ('venue', LABEL),
+    ('referee_1', LABEL), ('referee_2', LABEL), ('obs', pa.string()),
+])
+STATISTICS_SCHEMA = pa.schema([('category', LABEL), ('Goals', pa.int32()), ('Player', pa.string()), ('Club', LABEL)])
+
+
+def parse_goals_column(goals):
+    """Vectorized ``store.parse_goals``: blank is unplayed, anything else non-integer counts as 0."""
+    text = goals.fillna('').astype(str).str.strip()
+    numbers = pd.to_numeric(text, errors='coerce')
+    numbers = numbers.where(numbers.isna() | (numbers == numbers.round()), np.nan)
+    return numbers.fillna(0).astype('Int16').mask(text == '')
+
+
+def category_rows(slug, data):
+    rows = []
+    for fecha in data:
+        for match in fecha['Data']:
+            row = {column: match.get(field, '') for field, column in MATCH_FIELDS.items()}
+            row['category'] = slug
+            row['round'] = fecha['Fecha']
+            rows.append(row)
+    return rows
+
+
+def matches_table(data_by_slug):
+    """Arrow table of the matches of category files, each category's rows contiguous and in file order."""
+    rows = []
+    for slug, data in data_by_slug.items():
+        rows.extend(category_rows(slug, data))
+    df = pd.DataFrame(rows, columns=['category', 'round', *MATCH_FIELDS.values()])
+    df['kickoff'] = pd.to_datetime(df['kickoff'], format=DATE_FORMAT, errors='coerce').astype('datetime64[s]')
+    df['home_goals'] = parse_goals_column(df['home_goals'])
+    df['away_goals'] = parse_goals_column(df['away_goals'])
+    for column in ['category', 'round', 'home', 'away', 'zone', 'venue', 'referee_1', 'referee_2', 'obs']:
+        df[column] = df[column].fillna('').astype(str)
+    return pa.Table.from_pandas(df, schema=MATCH_SCHEMA, preserve_index=False)
+
+
+def read_statistics(file_name):
+    df = pd.read_csv(data_file(file_name))
+    df.columns = df.columns.str.strip()
+    if 'Unnamed: 0' in df.columns:
+        df = df.drop(columns=['Unnamed: 0'])
+    return df.rename(columns={'Goles': 'Goals', 'Jugador': 'Player', 'Club': 'Club'})
+
+
+def statistics_table(slug, df):
+    """Arrow table of the scorers of a category, sorted by goals then player."""
+    df = df.sort_values(by=['Goals', 'Player'], ascending=[False, True])
+    df.insert(0, 'category', slug)
+    return pa.Table.from_pandas(df[STATISTICS_SCHEMA.names], schema=STATISTICS_SCHEMA, preserve_index=False)
+
+
+def write_table(path, table):
+    # Uncompressed IPC so readers can memory-map the columns without copying
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table.unify_dictionaries().combine_chunks())
+    os.replace(tmp_path, path)
+
+
+def read_table(path):
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
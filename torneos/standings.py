@@ -0,0 +1,550 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from torneos.artifacts import artifact, rule, source
+from torneos.categories import CATEGORIES_BY_SLUG
+from torneos.ingest import LOGOS_FILE
+from torneos.logos import team_resolver
+from torneos.tiebreakers import DEFAULT_TIEBREAKERS, table_order
+
+logger = logging.getLogger(__name__)
+
+# League points per result
+POINTS_WIN = 2
+POINTS_DRAW = 1
+
+STAT_COLUMNS = ['MP', 'W', 'D', 'L', 'Pts', 'GF', 'GA', 'GD']
+
+# Label used for matches without a Zona
+DEFAULT_ZONE = 'General'
+
+
+def fair_play_points(teams, fair_play):
+    """Disciplinary points of ``teams`` from a team -> points mapping, or None without one."""
+    if fair_play is None:
+        return None
+    return np.array([fair_play.get(team, 0) for team in teams], dtype=np.int64)
+
+
+class StandingsState:
+    """Standings of every zone, kept up to date one result at a time.
+
+    Results are keyed by match: round, home and away team. ``set_result``
+    adds or corrects a result and ``remove_result`` takes it back; either
+    only touches the rows of the two teams involved and their head-to-head
+    record, and a zone is re-sorted the next time its table is read.
+    ``frames`` gives one table per zone, in zone order, each sorted by
+    points and then by the ``tiebreakers`` chain, using ``fair_play``
+    disciplinary points if given.
+    """
+
+    def __init__(self, tiebreakers=DEFAULT_TIEBREAKERS, fair_play=None):
+        self.tiebreakers = tiebreakers
+        self.fair_play = fair_play
+        # (round, home, away) -> (zone, home goals, away goals)
+        self._results = {}
+        # zone -> team -> [MP, W, D, L, GF, GA]
+        self._rows = {}
+        # zone -> (team -> matrix index, points and goals matrices) of each team against each other
+        self._pairs = {}
+        # zone -> teams in table order, dropped when the zone changes
+        self._order = {}
+        # Zones whose rows and matrices another state also holds, copied before they are written
+        self._shared = set()
+        # Bumped on every change, so overlays know their cached tables are stale
+        self.version = 0
+
+    @staticmethod
+    def match_results(matches):
+        """Results of the played regular-season ``matches``, keyed like the state."""
+        return {
+            (match.round, match.home, match.away): (match.zone or DEFAULT_ZONE, match.home_goals, match.away_goals)
+            for match in matches
+            if match.regular_season and match.played
+        }
+
+    @classmethod
+    def from_matches(cls, matches, tiebreakers=DEFAULT_TIEBREAKERS, fair_play=None):
+        return cls.from_results(cls.match_results(matches), tiebreakers, fair_play)
+
+    @classmethod
+    def from_results(cls, results, tiebreakers=DEFAULT_TIEBREAKERS, fair_play=None):
+        """A state holding ``results``, keyed and valued as ``match_results`` gives them, built in one pass.
+
+        Every result adds one row for the home side and one for the away
+        side, keyed by (zone, team) slot, so the same club playing in two
+        zones gets two rows. Rows and head-to-head matrices are summed with
+        numpy instead of applying the results one at a time.
+        """
+        state = cls(tiebreakers, fair_play)
+        if not results:
+            return state
+        state._results = dict(results)
+        values = list(results.values())
+        n_results = len(results)
+        zone_codes, zone_names = pd.factorize(np.array([zone for zone, _, _ in values], dtype=object))
+        team_codes, team_names = pd.factorize(np.array(
+            [home for _, home, _ in results] + [away for _, _, away in results], dtype=object
+        ))
+        slots, slot_keys = pd.factorize(np.concatenate([zone_codes, zone_codes]) * len(team_names) + team_codes)
+        n_slots = len(slot_keys)
+
+        goals_for = np.array([goals for _, goals, _ in values] + [goals for _, _, goals in values], dtype=np.int64)
+        goals_against = np.concatenate([goals_for[n_results:], goals_for[:n_results]])
+        won = goals_for > goals_against
+        drawn = goals_for == goals_against
+        stats = np.stack([
+            np.bincount(slots, weights=weights, minlength=n_slots).astype(np.int64)
+            for weights in (None, won, drawn, goals_for < goals_against, goals_for, goals_against)
+        ], axis=1)
+
+        # Slots grouped by zone; a team's matrix index is its place in its zone's group
+        slot_zones = slot_keys // len(team_names)
+        by_zone = np.argsort(slot_zones, kind='stable')
+        zone_sizes = np.bincount(slot_zones, minlength=len(zone_names))
+        zone_starts = np.concatenate([[0], np.cumsum(zone_sizes)])
+        local = np.empty(n_slots, dtype=np.int64)
+        local[by_zone] = np.arange(n_slots) - np.repeat(zone_starts[:-1], zone_sizes)
+        # Matrices as long as _pair_matrices would have grown them, every zone's cells in one buffer
+        sizes = np.maximum(8, 2 ** np.ceil(np.log2(np.maximum(zone_sizes, 1))).astype(np.int64))
+        offsets = np.concatenate([[0], np.cumsum(sizes * sizes)])
+        home_slots, away_slots = slots[:n_results], slots[n_results:]
+        cells = np.concatenate([
+            offsets[zone_codes] + local[home_slots] * sizes[zone_codes] + local[away_slots],
+            offsets[zone_codes] + local[away_slots] * sizes[zone_codes] + local[home_slots],
+        ])
+        points = won * POINTS_WIN + drawn * POINTS_DRAW
+        pair_points = np.bincount(cells, weights=points, minlength=offsets[-1]).astype(np.int64)
+        pair_goals = np.bincount(cells, weights=goals_for, minlength=offsets[-1]).astype(np.int64)
+
+        teams = team_names[slot_keys[by_zone] % len(team_names)].tolist()
+        rows = stats[by_zone].tolist()
+        for zone_code, zone in enumerate(zone_names):
+            start, end, size = zone_starts[zone_code], zone_starts[zone_code + 1], sizes[zone_code]
+            cells = slice(offsets[zone_code], offsets[zone_code + 1])
+            state._rows[zone] = dict(zip(teams[start:end], rows[start:end]))
+            state._pairs[zone] = [
+                {team: i for i, team in enumerate(teams[start:end])},
+                pair_points[cells].reshape(size, size), pair_goals[cells].reshape(size, size),
+            ]
+        state.version = 1
+        return state
+
+    def __len__(self):
+        return len(self._results)
+
+    def copy(self):
+        """A state with the same results that can be changed while this one stays as it is.
+
+        Zones are shared until the copy changes them, so the cost of a copy
+        and an update is that of the zones updated.
+        """
+        state = StandingsState(self.tiebreakers, self.fair_play)
+        state._results = dict(self._results)
+        state._rows = dict(self._rows)
+        state._pairs = dict(self._pairs)
+        state._order = dict(self._order)
+        state.version = self.version
+        self._shared.update(self._rows)
+        state._shared = set(self._rows)
+        return state
+
+    def zones(self):
+        return sorted(self._rows)
+
+    def set_result(self, round, home, away, zone, home_goals, away_goals):
+        """Add or correct the result of a match; returns the zones whose table changed."""
+        key = (round, home, away)
+        result = (zone or DEFAULT_ZONE, int(home_goals), int(away_goals))
+        previous = self._results.get(key)
+        if previous == result:
+            return set()
+        changed = set()
+        if previous is not None:
+            changed.add(self._apply(key, previous, -1))
+        self._results[key] = result
+        changed.add(self._apply(key, result, 1))
+        return changed
+
+    def remove_result(self, round, home, away):
+        """Take back the result of a match; returns the zones whose table changed."""
+        key = (round, home, away)
+        previous = self._results.pop(key, None)
+        if previous is None:
+            return set()
+        return {self._apply(key, previous, -1)}
+
+    def sync(self, results):
+        """Apply only the differences from ``results``; returns the zones whose table changed."""
+        changed = set()
+        for key in [key for key in self._results if key not in results]:
+            changed |= self.remove_result(*key)
+        for key, result in results.items():
+            if self._results.get(key) != result:
+                changed |= self.set_result(*key, *result)
+        return changed
+
+    def _own(self, zone):
+        """Make the rows and matrices of ``zone`` this state's own before writing them."""
+        if zone in self._shared:
+            self._shared.discard(zone)
+            self._rows[zone] = {team: list(row) for team, row in self._rows[zone].items()}
+            index, pair_points, pair_goals = self._pairs[zone]
+            self._pairs[zone] = [dict(index), pair_points.copy(), pair_goals.copy()]
+
+    def _apply(self, key, result, sign):
+        zone, home_goals, away_goals = result
+        _, home, away = key
+        self._own(zone)
+        rows = self._rows.setdefault(zone, {})
+        index, pair_points, pair_goals = self._pair_matrices(zone, home, away)
+        for team, opponent, goals_for, goals_against in (
+            (home, away, home_goals, away_goals), (away, home, away_goals, home_goals)
+        ):
+            cell = (index[team], index[opponent])
+            pair_points[cell] += sign * (POINTS_WIN if goals_for > goals_against else POINTS_DRAW if goals_for == goals_against else 0)
+            pair_goals[cell] += sign * goals_for
+            row = rows.get(team)
+            if row is None:
+                row = rows[team] = [0, 0, 0, 0, 0, 0]
+            row[0] += sign
+            row[1] += sign * (goals_for > goals_against)
+            row[2] += sign * (goals_for == goals_against)
+            row[3] += sign * (goals_for < goals_against)
+            row[4] += sign * goals_for
+            row[5] += sign * goals_against
+            # A team is only listed while it has played in the zone
+            if row[0] == 0:
+                del rows[team]
+        if not rows:
+            del self._rows[zone]
+            del self._pairs[zone]
+        self._order.pop(zone, None)
+        self.version += 1
+        return zone
+
+    def table(self, zone):
+        """(team, MP, W, D, L, Pts, GF, GA, GD) rows of ``zone`` by points and tie-breakers."""
+        rows = self._zone_rows(zone)
+        order = self._order.get(zone)
+        if order is None:
+            order = self._order[zone] = self._table_order(rows, zone)
+        table = []
+        for team in order:
+            mp, w, d, l, gf, ga = rows[team]
+            table.append((team, mp, w, d, l, w * POINTS_WIN + d * POINTS_DRAW, gf, ga, gf - ga))
+        return table
+
+    def _pair_matrices(self, zone, *teams):
+        """Head-to-head matrices of ``zone``, grown to hold ``teams``; a team keeps its index."""
+        pairs = self._pairs.get(zone)
+        if pairs is None:
+            pairs = self._pairs[zone] = [{}, np.zeros((8, 8), dtype=np.int64), np.zeros((8, 8), dtype=np.int64)]
+        index = pairs[0]
+        for team in teams:
+            if team not in index:
+                index[team] = len(index)
+        size = len(pairs[1])
+        if len(index) > size:
+            while len(index) > size:
+                size *= 2
+            for i in (1, 2):
+                grown = np.zeros((size, size), dtype=np.int64)
+                grown[:len(pairs[i]), :len(pairs[i])] = pairs[i]
+                pairs[i] = grown
+        return pairs
+
+    def _zone_rows(self, zone):
+        return self._rows.get(zone, {})
+
+    def _pair_block(self, zone, teams):
+        """Head-to-head points and goals of ``teams`` against each other, in that order."""
+        index, pair_points, pair_goals = self._pairs[zone]
+        active = [index[team] for team in teams]
+        cells = np.ix_(active, active)
+        return pair_points[cells], pair_goals[cells]
+
+    def _table_order(self, rows, zone):
+        teams = list(rows)
+        if not teams:
+            return []
+        stats = list(rows.values())
+        order = table_order(
+            teams,
+            [w * POINTS_WIN + d * POINTS_DRAW for _, w, d, _, _, _ in stats],
+            [gf - ga for _, _, _, _, gf, ga in stats],
+            [gf for _, _, _, _, gf, _ in stats],
+            *self._pair_block(zone, teams), fair_play_points(teams, self.fair_play), self.tiebreakers,
+        )
+        return [teams[i] for i in order]
+
+    def frame(self, zone):
+        teams, *stats = list(zip(*self.table(zone))) or [()] * (len(STAT_COLUMNS) + 1)
+        df = pd.DataFrame({'Team': list(teams)} | {
+            column: np.array(values, dtype=np.int64) for column, values in zip(STAT_COLUMNS, stats)
+        })
+        df.insert(0, 'Zona', zone)
+        return df
+
+    def frames(self):
+        return [self.frame(zone) for zone in self.zones()]
+
+
+class StandingsOverlay(StandingsState):
+    """Hypothetical results on top of a shared ``StandingsState``, which is never copied or written.
+
+    Only the hypothetical results are kept, as sparse deltas: each team's
+    row and each head-to-head record they change. A table adds them to the
+    base rows as it is read. Results go in through the same ``set_result``,
+    ``remove_result`` and ``sync``, for matches the base has no result for;
+    a zone is re-sorted when one of its hypothetical results changes or the
+    base gets a real one.
+    """
+
+    def __init__(self, base):
+        super().__init__(base.tiebreakers, base.fair_play)
+        self.base = base
+        # zone -> (team, opponent) -> [points, goals] of the hypothetical results
+        self._pairs = {}
+        self._base_version = base.version
+
+    def zones(self):
+        return sorted(set(self.base.zones()) | set(self._rows))
+
+    def table(self, zone):
+        if self._base_version != self.base.version:
+            self._order.clear()
+            self._base_version = self.base.version
+        return super().table(zone)
+
+    def _apply(self, key, result, sign):
+        zone, home_goals, away_goals = result
+        _, home, away = key
+        rows = self._rows.setdefault(zone, {})
+        pairs = self._pairs.setdefault(zone, {})
+        for team, opponent, goals_for, goals_against in (
+            (home, away, home_goals, away_goals), (away, home, away_goals, home_goals)
+        ):
+            pair = pairs.setdefault((team, opponent), [0, 0])
+            pair[0] += sign * (POINTS_WIN if goals_for > goals_against else POINTS_DRAW if goals_for == goals_against else 0)
+            pair[1] += sign * goals_for
+            if pair == [0, 0]:
+                del pairs[(team, opponent)]
+            row = rows.setdefault(team, [0, 0, 0, 0, 0, 0])
+            row[0] += sign
+            row[1] += sign * (goals_for > goals_against)
+            row[2] += sign * (goals_for == goals_against)
+            row[3] += sign * (goals_for < goals_against)
+            row[4] += sign * goals_for
+            row[5] += sign * goals_against
+            if row[0] == 0:
+                del rows[team]
+        if not rows:
+            del self._rows[zone]
+            del self._pairs[zone]
+        self._order.pop(zone, None)
+        self.version += 1
+        return zone
+
+    def _zone_rows(self, zone):
+        deltas = self._rows.get(zone)
+        if not deltas:
+            return self.base._zone_rows(zone)
+        rows = dict(self.base._zone_rows(zone))
+        for team, delta in deltas.items():
+            row = rows.get(team)
+            rows[team] = delta if row is None else [total + change for total, change in zip(row, delta)]
+        return rows
+
+    def _pair_block(self, zone, teams):
+        deltas = self._pairs.get(zone)
+        if not deltas:
+            return self.base._pair_block(zone, teams)
+        n_teams = len(teams)
+        pair_points = np.zeros((n_teams, n_teams), dtype=np.int64)
+        pair_goals = np.zeros((n_teams, n_teams), dtype=np.int64)
+        played = [i for i, team in enumerate(teams) if team in self.base._zone_rows(zone)]
+        if played:
+            cells = np.ix_(played, played)
+            pair_points[cells], pair_goals[cells] = self.base._pair_block(zone, [teams[i] for i in played])
+        position = {team: i for i, team in enumerate(teams)}
+        for (team, opponent), (points, goals) in deltas.items():
+            cell = (position[team], position[opponent])
+            pair_points[cell] += points
+            pair_goals[cell] += goals
+        return pair_points, pair_goals
+
+
+class StandingsHistory:
+    """Standings of one zone as they stood after each round.
+
+    Arrays are indexed ``[round, team]`` over ``rounds`` and ``teams``:
+    ``totals`` holds each table column summed up to and including that
+    round, and ``rank`` the position in the table after it, 0 while the
+    team has not played yet.
+    """
+
+    def __init__(self, zone, rounds, teams, totals, rank):
+        self.zone = zone
+        self.rounds = rounds
+        self.teams = teams
+        self.totals = totals
+        self.rank = rank
+
+    @property
+    def points(self):
+        return self.totals['Pts']
+
+    @property
+    def goal_difference(self):
+        return self.totals['GD']
+
+    def table(self, round_index):
+        """Standings after ``rounds[round_index]``, like ``StandingsState.frame`` would give them."""
+        rank = self.rank[round_index]
+        order = np.flatnonzero(rank)
+        order = order[np.argsort(rank[order])]
+        df = pd.DataFrame({'Zona': self.zone, 'Team': self.teams[order]})
+        for column in STAT_COLUMNS:
+            df[column] = self.totals[column][round_index, order]
+        return df
+
+    def positions(self):
+        """Long frame of every team's position after each round it had played by."""
+        round_index, team_index = np.nonzero(self.rank)
+        return pd.DataFrame({
+            'Fecha': self.rounds[round_index],
+            'Ronda': round_index + 1,
+            'Team': self.teams[team_index],
+            'Posición': self.rank[round_index, team_index],
+            'Pts': self.points[round_index, team_index],
+        })
+
+
+def standings_history(matches, tiebreakers=DEFAULT_TIEBREAKERS, fair_play=None):
+    """Cumulative standings of every zone after each regular-season round, in one pass.
+
+    Rounds keep file order; only rounds with at least one result are
+    included. Each round's table is ordered like a ``StandingsState`` of
+    the matches up to it would order it. Returns one ``StandingsHistory`` per zone, in zone order.
+    """
+    start = time.time()
+    played = [match for match in matches if match.regular_season and match.played]
+    if not played:
+        return ()
+    round_codes, rounds = pd.factorize(np.array([match.round for match in played], dtype=object))
+    zones = np.array([match.zone or DEFAULT_ZONE for match in played], dtype=object)
+    n_rounds = len(rounds)
+
+    histories = []
+    for zone in sorted(set(zones)):
+        in_zone = zones == zone
+        zone_matches = [match for match, keep in zip(played, in_zone) if keep]
+        match_rounds = round_codes[in_zone]
+        team_codes, teams = pd.factorize(np.array(
+            [match.home for match in zone_matches] + [match.away for match in zone_matches], dtype=object
+        ))
+        n_teams = len(teams)
+        home_goals = np.array([match.home_goals for match in zone_matches], dtype=np.int64)
+        away_goals = np.array([match.away_goals for match in zone_matches], dtype=np.int64)
+        goals_for = np.concatenate([home_goals, away_goals])
+        goals_against = np.concatenate([away_goals, home_goals])
+        side_rounds = np.concatenate([match_rounds, match_rounds])
+        # One cell per (round, team); each side of a match adds to its own
+        cells = side_rounds * n_teams + team_codes
+        # And one per (round, team, opponent) for head-to-head records
+        opponents = np.concatenate([team_codes[len(zone_matches):], team_codes[:len(zone_matches)]])
+        pair_cells = cells * n_teams + opponents
+
+        def cumulative(weights):
+            per_round = np.bincount(cells, weights=weights, minlength=n_rounds * n_teams)
+            return per_round.reshape(n_rounds, n_teams).cumsum(axis=0).astype(np.int64)
+
+        totals = {
+            'MP': cumulative(None),
+            'W': cumulative(goals_for > goals_against),
+            'D': cumulative(goals_for == goals_against),
+            'L': cumulative(goals_for < goals_against),
+            'GF': cumulative(goals_for),
+            'GA': cumulative(goals_against),
+        }
+        totals['Pts'] = totals['W'] * POINTS_WIN + totals['D'] * POINTS_DRAW
+        totals['GD'] = totals['GF'] - totals['GA']
+
+        def cumulative_pairs(weights):
+            per_round = np.bincount(pair_cells, weights=weights, minlength=n_rounds * n_teams * n_teams)
+            return per_round.reshape(n_rounds, n_teams, n_teams).cumsum(axis=0).astype(np.int64)
+
+        pair_points = cumulative_pairs((goals_for > goals_against) * POINTS_WIN + (goals_for == goals_against) * POINTS_DRAW)
+        pair_goals = cumulative_pairs(goals_for)
+        zone_fair_play = fair_play_points(teams, fair_play)
+
+        # Rank the teams that had played by each round
+        rank = np.zeros((n_rounds, n_teams), dtype=np.int64)
+        for round_index in range(n_rounds):
+            ranked = np.flatnonzero(totals['MP'][round_index])
+            pairs = np.ix_(ranked, ranked)
+            order = table_order(
+                teams[ranked], totals['Pts'][round_index, ranked], totals['GD'][round_index, ranked],
+                totals['GF'][round_index, ranked], pair_points[round_index][pairs], pair_goals[round_index][pairs],
+                None if zone_fair_play is None else zone_fair_play[ranked], tiebreakers,
+            )
+            rank[round_index, ranked[order]] = np.arange(1, len(ranked) + 1)
+        histories.append(StandingsHistory(zone, rounds, teams, totals, rank))
+    logger.info(f"Calculated standings after {n_rounds} rounds for {len(played)} matches in {time.time() - start:.4f} seconds")
+    return tuple(histories)
+
+
+# Shared read-only frames, one per zone. A new version of the file only
+# rebuilds the tables of the zones whose results changed, a new logos file
+# every table
+@rule('standings', inputs=lambda slug: [('matches', slug), source(LOGOS_FILE)], incremental=True)
+def build_standings(loaded, logos, slug, previous=None):
+    """Standings of the regular season ("Fecha N" rounds) of a category, with logos.
+
+    The value is a ``StandingsState``, the frames in zone order and the
+    resolver their logos came from. The previous state is copied, not
+    updated, as sessions may still be reading it.
+    """
+    start = time.time()
+    matches, _ = loaded
+    results = StandingsState.match_results(matches)
+    resolver = team_resolver()
+    if previous is None:
+        state, frames = StandingsState.from_results(results, CATEGORIES_BY_SLUG[slug].tiebreakers), {}
+        changed = set(state.zones())
+    else:
+        state = previous[0].copy()
+        frames = {df['Zona'].iloc[0]: df for df in previous[1]} if previous[2] is resolver else {}
+        changed = state.sync(results)
+    for zone in changed | (set(state.zones()) - set(frames)):
+        frames.pop(zone, None)
+        if zone in state.zones():
+            df_standings = state.frame(zone)
+            df_standings['Logo'] = resolver.logos(df_standings['Team'])
+            frames[zone] = df_standings
+    logger.info(f"Updated standings of {len(changed)} zones of {slug} in {time.time() - start:.4f} seconds")
+    return state, tuple(frames[zone] for zone in sorted(frames)), resolver
+
+
+def category_standings(slug, versions=None):
+    return artifact('standings', slug, versions=versions)[1]
+
+
+def category_standings_state(slug, versions=None):
+    """The ``StandingsState`` behind ``category_standings``, never changed once built; read it, never write it."""
+    return artifact('standings', slug, versions=versions)[0]
+
+
+# Per version of the category file, so a new result only rebuilds its own category
+@rule('standings_history', inputs=lambda slug: [('matches', slug)])
+def build_standings_history(loaded, slug):
+    matches, _ = loaded
+    return standings_history(matches, CATEGORIES_BY_SLUG[slug].tiebreakers)
+
+
+def category_standings_history(slug, versions=None):
+    return artifact('standings_history', slug, versions=versions)
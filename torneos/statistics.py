@@ -0,0 +1,29 @@
+import logging
+
+from torneos.artifacts import artifact, rule, source
+from torneos.categories import CATEGORIES_BY_SLUG
+from torneos.snapshot import read_statistics, statistics_table
+
+logger = logging.getLogger(__name__)
+
+
+@rule('scorer_table', inputs=lambda slug: [source(CATEGORIES_BY_SLUG[slug].stats_file)], persist=True)
+def build_scorer_table(_path, slug):
+    """Sorted scorers of a category, kept on disk between restarts."""
+    return statistics_table(slug, read_statistics(CATEGORIES_BY_SLUG[slug].stats_file))
+
+
+# Shared read-only frame: callers copy before modifying it
+@rule('scorers', inputs=lambda slug: [('scorer_table', slug)], keep_going=True)
+def build_scorers(table, slug):
+    if isinstance(table, Exception):
+        return None
+    logger.info(f"Processing statistics for {slug}")
+    df = table.drop_columns(['category']).to_pandas()
+    df.index = df.index + 1
+    return df
+
+
+def category_statistics(slug, versions=None):
+    """Scorers of a category, sorted by goals, or None when its file is missing or invalid."""
+    return artifact('scorers', slug, versions=versions)
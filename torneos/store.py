@@ -0,0 +1,118 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pyarrow as pa
+
+from torneos.artifacts import artifact, rule, source
+from torneos.categories import CATEGORIES_BY_SLUG
+from torneos.loader import DATE_FORMAT, read_json
+from torneos.snapshot import matches_table
+
+
+@dataclass(frozen=True, slots=True)
+class Match:
+    """One fixture row of a category file, immutable once loaded."""
+    category: str
+    round: str
+    kickoff: Optional[datetime]
+    home: str
+    away: str
+    home_goals: Optional[int]
+    away_goals: Optional[int]
+    zone: str
+    venue: str
+    referee_1: str
+    referee_2: str
+    obs: str
+
+    @property
+    def is_bye(self):
+        return self.away.strip() == ''
+
+    @property
+    def played(self):
+        return not self.is_bye and self.home_goals is not None and self.away_goals is not None
+
+    @property
+    def regular_season(self):
+        return self.round.startswith('Fecha ')
+
+
+def parse_kickoff(date_str):
+    try:
+        return datetime.strptime(date_str, DATE_FORMAT)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_goals(goals):
+    if goals is None or str(goals).strip() == '':
+        return None
+    try:
+        return int(goals)
+    except ValueError:
+        return 0
+
+
+def goals_text(goals):
+    return '' if goals is None else str(goals)
+
+
+def category_matches(slug, data):
+    """Freeze the rounds of a category file into a tuple of Match records."""
+    return tuple(
+        Match(
+            category=slug,
+            round=fecha['Fecha'],
+            kickoff=parse_kickoff(match.get('Fecha')),
+            home=match.get('Local', ''),
+            away=match.get('Visitante', ''),
+            home_goals=parse_goals(match.get('GL')),
+            away_goals=parse_goals(match.get('GV')),
+            zone=match.get('Zona', ''),
+            venue=match.get('Cancha', ''),
+            referee_1=match.get('Arbitro 1', ''),
+            referee_2=match.get('Arbitro 2', ''),
+            obs=match.get('OBS', ''),
+        )
+        for fecha in data
+        for match in fecha['Data']
+    )
+
+
+def column_values(column):
+    """Python values of an Arrow column; much faster than ``to_pylist`` for labels and datetimes."""
+    column = column.combine_chunks()
+    if pa.types.is_dictionary(column.type):
+        labels = np.array(column.dictionary.to_pylist(), dtype=object)
+        return labels[column.indices.to_numpy()].tolist()
+    if pa.types.is_timestamp(column.type):
+        # datetime64[s] -> datetime, NaT -> None
+        return column.to_numpy(zero_copy_only=False).astype(object).tolist()
+    return column.to_pylist()
+
+
+def table_matches(table):
+    """Match records of a snapshot table, built column by column."""
+    columns = [column_values(table.column(field.name)) for field in fields(Match)]
+    return tuple(Match(*row) for row in zip(*columns))
+
+
+@rule('match_table', inputs=lambda slug: [source(CATEGORIES_BY_SLUG[slug].json_file)], persist=True)
+def build_match_table(_path, slug):
+    """Typed matches of a category file, kept on disk between restarts."""
+    return matches_table({slug: read_json(CATEGORIES_BY_SLUG[slug].json_file)})
+
+
+@rule('matches', inputs=lambda slug: [('match_table', slug)], keep_going=True)
+def build_category_matches(table, slug):
+    if isinstance(table, Exception):
+        return (), str(table)
+    return table_matches(table), None
+
+
+def load_category_matches(slug, versions=None):
+    """Match records of a category, and the error that kept them out if any."""
+    return artifact('matches', slug, versions=versions)
@@ -0,0 +1,73 @@
+import base64
+import hashlib
+import logging
+import os
+import shutil
+import threading
+
+from PIL import Image, ImageOps
+
+from torneos.loader import ROOT_PATH
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_PATH = os.path.join(ROOT_PATH, '.cache', 'thumbnails')
+# Served by Streamlit static serving at app/static/logos/
+STATIC_LOGO_PATH = os.path.join(ROOT_PATH, 'static', 'logos')
+THUMBNAIL_FORMAT = 'WEBP'
+THUMBNAIL_MIME_TYPE = 'image/webp'
+THUMBNAIL_QUALITY = 80
+# Rendered at twice the column width so logos stay sharp on high-density screens
+PIXEL_DENSITY = 2
+
+
+def content_hash(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()[:16]
+
+
+def thumbnail_path(image_path, width):
+    """Path of the thumbnail of ``image_path`` for a ``width`` px column, created on first use.
+
+    Thumbnails are keyed by the source's content hash, so an edited logo
+    gets a new file and stale ones are never served.
+    """
+    size = width * PIXEL_DENSITY
+    path = os.path.join(THUMBNAIL_PATH, f"{content_hash(image_path)}-{size}.webp")
+    if not os.path.exists(path):
+        os.makedirs(THUMBNAIL_PATH, exist_ok=True)
+        with Image.open(image_path) as image:
+            thumbnail = ImageOps.contain(ImageOps.exif_transpose(image).convert('RGB'), (size, size), Image.LANCZOS)
+        atomic_write(path, lambda tmp_path: thumbnail.save(
+            tmp_path, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY, method=6
+        ))
+        logger.info(f"Created {size}px thumbnail for {image_path}")
+    return path
+
+
+def atomic_write(path, write):
+    """Write ``path`` through a temporary file so concurrent sessions never read a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def publish_thumbnail(image_path, width):
+    """Copy the thumbnail into the static directory under a content-hashed name.
+
+    The name changes whenever the logo does, so browsers may cache it forever.
+    """
+    source = thumbnail_path(image_path, width)
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    file_name = f"{stem}.{os.path.basename(source)}"
+    path = os.path.join(STATIC_LOGO_PATH, file_name)
+    if not os.path.exists(path):
+        os.makedirs(STATIC_LOGO_PATH, exist_ok=True)
+        atomic_write(path, lambda tmp_path: shutil.copyfile(source, tmp_path))
+    return file_name
+
+
+def thumbnail_data_uri(image_path, width):
+    with open(thumbnail_path(image_path, width), 'rb') as file:
+        encoded = base64.b64encode(file.read()).decode('utf-8')
+    return f"data:{THUMBNAIL_MIME_TYPE};base64,{encoded}"
@@ -0,0 +1,151 @@
+import numpy as np
+
+# Criteria for teams level on points, applied in the order a category lists
+# them. Head-to-head criteria only count the matches among the tied teams
+H2H_POINTS = 'h2h_points'
+H2H_GOAL_DIFFERENCE = 'h2h_goal_difference'
+GOAL_DIFFERENCE = 'goal_difference'
+GOALS_FOR = 'goals_for'
+# Fewer disciplinary points ranks higher; teams without a record count 0
+FAIR_PLAY = 'fair_play'
+
+DEFAULT_TIEBREAKERS = (H2H_POINTS, H2H_GOAL_DIFFERENCE, GOAL_DIFFERENCE, GOALS_FOR, FAIR_PLAY)
+# Tie groups above this size sum their head-to-head blocks with numpy
+LARGE_GROUP = 24
+
+
+def table_order(teams, points, goal_difference, goals_for, pair_points, pair_goals, fair_play=None,
+                criteria=DEFAULT_TIEBREAKERS):
+    """Indices of ``teams`` in table order: by points, then each tie group by ``criteria``.
+
+    The first criterion that separates a tie group splits it by value, and
+    every smaller group still tied is resolved again from the first
+    criterion, so head-to-head only counts the teams still level. Teams no
+    criterion separates are ordered by name.
+    """
+    names = list(teams)
+    points = np.asarray(points).tolist()
+    goal_difference = np.asarray(goal_difference).tolist()
+    goals_for = np.asarray(goals_for).tolist()
+    fair_play = [0] * len(names) if fair_play is None else np.asarray(fair_play).tolist()
+
+    def head_to_head(matrix, group):
+        """What each team of ``group`` took off the others of it, and what they took off it."""
+        if len(group) > LARGE_GROUP:
+            block = matrix[np.ix_(group, group)]
+            return block.sum(axis=1).tolist(), block.sum(axis=0).tolist()
+        taken = [sum(matrix.item(team, other) for other in group) for team in group]
+        given = [sum(matrix.item(other, team) for other in group) for team in group]
+        return taken, given
+
+    def values(criterion, group):
+        """Value of ``criterion`` for each team of ``group``, higher is better."""
+        if criterion == H2H_POINTS:
+            return head_to_head(pair_points, group)[0]
+        if criterion == H2H_GOAL_DIFFERENCE:
+            scored, conceded = head_to_head(pair_goals, group)
+            return [a - b for a, b in zip(scored, conceded)]
+        if criterion == GOAL_DIFFERENCE:
+            return [goal_difference[team] for team in group]
+        if criterion == GOALS_FOR:
+            return [goals_for[team] for team in group]
+        if criterion == FAIR_PLAY:
+            return [-fair_play[team] for team in group]
+        raise ValueError(f"Unknown tie-breaker: {criterion}")
+
+    def resolve(group):
+        if len(group) == 1:
+            return group
+        for criterion in criteria:
+            group_values = values(criterion, group)
+            if min(group_values) != max(group_values):
+                split = {}
+                for team, value in zip(group, group_values):
+                    split.setdefault(value, []).append(team)
+                return [team for value in sorted(split, reverse=True) for team in resolve(split[value])]
+        return sorted(group, key=names.__getitem__)
+
+    order = []
+    group = []
+    for team in sorted(range(len(names)), key=lambda team: (-points[team], names[team])):
+        if group and points[team] != points[group[0]]:
+            order.extend(resolve(group))
+            group = []
+        group.append(team)
+    if group:
+        order.extend(resolve(group))
+    return np.array(order, dtype=np.int64)
+
+
+def level_ranks(keys):
+    """Entries before each entry of its row of ``keys``, lowest first; equal keys share a rank."""
+    order = np.argsort(keys, axis=1)
+    ordered = np.take_along_axis(keys, order, axis=1)
+    starts = np.ones(keys.shape, dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.maximum.accumulate(np.where(starts, np.arange(keys.shape[1]), 0), axis=1), axis=1)
+    return ranks
+
+
+def table_places(teams, points, goal_difference, goals_for, pair_points, pair_goals, fair_play=None,
+                 criteria=DEFAULT_TIEBREAKERS):
+    """Place of each of ``teams`` in many tables at once, ``places[table, team]``, as ``table_order`` ranks each.
+
+    Stats are ``[table, team]`` and head-to-head matrices ``[table, team,
+    other]``. Every table starts with one group per points level; each pass
+    splits every group still level by the first criterion that separates
+    it, head-to-head counting only that group, until no group splits.
+    """
+    n_teams = len(teams)
+    fair_play = np.zeros(n_teams) if fair_play is None else np.asarray(fair_play)
+    head_to_head = H2H_POINTS in criteria or H2H_GOAL_DIFFERENCE in criteria
+
+    def values(criterion, tables, same):
+        """Value of ``criterion`` for each team of ``tables``, higher is better."""
+        if criterion == H2H_POINTS:
+            return np.einsum('stu,stu->st', pair_points[tables], same)
+        if criterion == H2H_GOAL_DIFFERENCE:
+            goals = pair_goals[tables]
+            return np.einsum('stu,stu->st', goals, same) - np.einsum('sut,stu->st', goals, same)
+        if criterion == GOAL_DIFFERENCE:
+            return goal_difference[tables]
+        if criterion == GOALS_FOR:
+            return goals_for[tables]
+        if criterion == FAIR_PLAY:
+            return np.broadcast_to(-fair_play, goals_for[tables].shape)
+        raise ValueError(f"Unknown tie-breaker: {criterion}")
+
+    # Teams ahead of each team, which also names its group: teams level share it
+    ahead = level_ranks(-np.asarray(points, dtype=np.float64))
+    cells = np.arange(len(ahead))[:, None] * n_teams + ahead
+    # Tables where a group may still split, at first those with teams level on points
+    active = np.flatnonzero((np.bincount(cells.ravel(), minlength=cells.size)[cells] > 1).any(axis=1))
+    while len(active):
+        # Every table at once needs no copy of the matrices
+        tables = slice(None) if len(active) == len(ahead) else active
+        groups = ahead[tables]
+        same = (groups[:, :, None] == groups[:, None, :]).astype(np.float32) if head_to_head else None
+        cells = (np.arange(len(groups))[:, None] * n_teams + groups).ravel()
+        sizes = np.bincount(cells, minlength=cells.size)[cells].reshape(groups.shape)
+        # Value of the first criterion that separates each team's group, 0 where none does
+        split = np.zeros(groups.shape)
+        level = sizes > 1
+        for criterion in criteria:
+            if not level.any():
+                break
+            value = np.asarray(values(criterion, tables, same), dtype=np.float64)
+            # A group is level on ``value`` when its size times its sum of squares is its sum squared
+            total = np.bincount(cells, weights=value.ravel(), minlength=cells.size)[cells].reshape(groups.shape)
+            squares = np.bincount(cells, weights=(value * value).ravel(), minlength=cells.size)[cells].reshape(groups.shape)
+            separated = level & (sizes * squares != total * total)
+            split[separated] = value[separated]
+            level &= ~separated
+        split_groups = level_ranks(groups * (split.max() - split.min() + 1) - split)
+        ahead[tables] = split_groups
+        # Only the parts of a group just split that still hold two teams or more can split again
+        cells = (np.arange(len(groups))[:, None] * n_teams + split_groups).ravel()
+        shared = np.bincount(cells, minlength=cells.size)[cells].reshape(groups.shape) > 1
+        active = active[(shared & (sizes > 1) & ~level).any(axis=1)]
+    name_rank = np.argsort(np.argsort(np.array(teams, dtype=object)))
+    return level_ranks(ahead * n_teams + name_rank)
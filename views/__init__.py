@@ -0,0 +1 @@
+"""Streamlit page bodies routed from Home.py."""
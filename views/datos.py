@@ -0,0 +1,68 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import streamlit as st
+
+from torneos.artifacts import SOURCE, artifact_graph
+from torneos.ingest import data_versions
+
+ORIGINS = {'computed': 'Calculado', 'disk': 'Disco', 'error': 'Error'}
+
+st.markdown("# Datos")
+st.caption("Artefactos derivados de los archivos de datos y cuáles se recalcularon en cada ingesta.")
+
+graph = artifact_graph()
+if not graph.ingests:
+    st.info("Todavía no se procesaron datos. Abrí Home o una división primero.")
+    st.stop()
+
+if graph.ingests[-1].fingerprint != data_versions().fingerprint:
+    st.warning("Hay archivos modificados que se procesarán cuando se abra una página que los use.")
+
+# Most recent ingest first
+argentina_tz = ZoneInfo('America/Argentina/Buenos_Aires')
+ingests = list(reversed(graph.ingests))
+ingest = st.selectbox(
+    "Ingesta",
+    ingests,
+    format_func=lambda ingest: (
+        f"{datetime.fromtimestamp(ingest.started, argentina_tz).strftime('%d/%m/%Y %H:%M:%S')}"
+        f" — {len(ingest.changed_files)} archivos modificados"
+    ),
+    key="data_ingest"
+)
+
+st.markdown("### Archivos modificados")
+st.write(", ".join(ingest.changed_files) or "Ninguno")
+
+st.markdown("### Artefactos recalculados")
+df_builds = pd.DataFrame([{
+    'Artefacto': build.name,
+    'Origen': ORIGINS[build.origin],
+    'Tiempo (ms)': build.seconds * 1000,
+    'Error': build.error or '',
+} for build in ingest.builds])
+if df_builds.empty:
+    st.write("No se recalculó ningún artefacto.")
+else:
+    st.metric("Tiempo total", f"{df_builds['Tiempo (ms)'].sum():.1f} ms")
+    st.dataframe(
+        df_builds,
+        column_config={"Tiempo (ms)": st.column_config.NumberColumn("Tiempo (ms)", format="%.1f")},
+        hide_index=True,
+        use_container_width=True,
+        key="data_builds"
+    )
+
+# Dependency graph of the artifacts in memory; the ones rebuilt in this ingest are highlighted
+st.markdown("### Grafo de dependencias")
+rebuilt = {build.name for build in ingest.builds}
+lines = ['digraph {', 'rankdir=LR;', 'node [shape=box, style="rounded,filled", fillcolor="#eeeeee", fontsize=10];']
+for name, inputs, fingerprint, error in graph.entries():
+    color = "#f4b6b6" if error is not None else "#ffd38a" if name in rebuilt else "#eeeeee"
+    shape = "note" if name.startswith(f"{SOURCE}/") else "box"
+    lines.append(f'"{name}" [fillcolor="{color}", shape={shape}, tooltip="{fingerprint}"];')
+    lines.extend(f'"{input_name}" -> "{name}";' for input_name in inputs)
+lines.append('}')
+st.graphviz_chart("\n".join(lines), use_container_width=True)
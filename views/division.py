@@ -0,0 +1,478 @@
+import logging
+import time
+import zlib
+import altair as alt
+import pandas as pd
+import streamlit as st
+import json
+from torneos.bracket import category_bracket
+from torneos.fixtures import ROUND_COLUMNS, fixture_rounds, fixtures_frame
+from torneos.logos import LOGO_WIDTH, MOBILE_LOGO_WIDTH, build_logo_dict, team_resolver
+from torneos.ingest import data_versions
+from torneos.match_db import match_db
+from torneos.ranking import category_cross_zone_ranking, cross_zone_ranking
+from torneos.round_calendar import round_calendar
+from torneos.simulation import SIMULATIONS, category_odds
+from torneos.standings import (
+    DEFAULT_ZONE, StandingsOverlay, category_standings, category_standings_history, category_standings_state
+)
+from torneos.statistics import category_statistics
+from torneos.store import load_category_matches
+
+logger = logging.getLogger(__name__)
+
+# Upcoming rounds whose matches can be given hypothetical results
+WHAT_IF_ROUNDS = 3
+
+
+# Detect mobile device
+def detect_mobile():
+    return st.query_params.get("mobile", ["false"])[0].lower() == "true" or (
+        "Mobi" in st._get_user_agent() if hasattr(st, "_get_user_agent") else False
+    )
+
+
+def render_division(category):
+    """Page body shared by every division; ``category`` comes from the registry."""
+    st.markdown(f"# {category.name}")
+    is_mobile = detect_mobile()
+
+    # Define tabs
+    tab1, tab2, tab3 = st.tabs(["Fixture", "Tabla", "Estadisticas"])
+
+    # Load logos.json
+    try:
+        with st.spinner("Cargando logos"):
+            _, missing_logos = build_logo_dict()
+    except (json.JSONDecodeError, FileNotFoundError) as e:
+        logger.error(f"Error loading logos.json: {str(e)}")
+        st.error(f"Error loading logos.json: {str(e)}")
+        st.stop()
+
+    if missing_logos:
+        st.warning(f"Missing or invalid logo files:\n" + "\n".join(missing_logos))
+
+    # Each tab is a fragment: a widget inside one reruns only that tab
+    with tab1:
+        render_fixture_tab(category, is_mobile)
+    with tab2:
+        render_standings_tab(category, is_mobile)
+    with tab3:
+        render_statistics_tab(category, is_mobile)
+    st.markdown("---")
+
+
+def clear_rendered(prefix):
+    for key in [key for key in st.session_state.keys() if key.startswith(prefix)]:
+        del st.session_state[key]
+
+
+def check_category_data(category, versions, empty_message):
+    matches, error = load_category_matches(category.slug, versions)
+    if error is not None:
+        logger.error(f"Error loading {category.json_file}: {error}")
+        st.error(f"Error loading {category.json_file}: {error}")
+        st.stop()
+    if not matches:
+        st.header(empty_message)
+        st.stop()
+
+
+def fixture_column_config(logo_width):
+    return {
+        "Fecha": st.column_config.DatetimeColumn("Dia/Hora", format="DD/MM/YYYY HH:mm"),
+        "Local_Logo": st.column_config.ImageColumn(" ", width=logo_width),
+        "Local": st.column_config.TextColumn("Local"),
+        "GL": st.column_config.TextColumn("Goles", width=40),
+        "Visitante_Logo": st.column_config.ImageColumn(" ", width=logo_width),
+        "Visitante": st.column_config.TextColumn("Visitante"),
+        "GV": st.column_config.TextColumn("Goles", width=40),
+        "Cancha": st.column_config.TextColumn("Cancha")
+    }
+
+
+# Tab 1: Fixture
+@st.fragment
+def render_fixture_tab(category, is_mobile):
+    clear_rendered("fixture_rendered_")
+    # Content versions of the data files, checked on every run of the tab;
+    # derived frames are shared by every session and rebuilt only when their file changes
+    versions = data_versions()
+    check_category_data(category, versions, "El fixture será cargado en los próximos días")
+    logo_width = MOBILE_LOGO_WIDTH if is_mobile else LOGO_WIDTH
+
+    # One team's matches come straight from the match database
+    db = match_db(versions)
+    team = st.selectbox(
+        "Equipo", db.teams(category.slug), index=None, placeholder="Todos los equipos",
+        key=f"fixture_team_{category.slug}"
+    )
+    if team:
+        df_team = fixtures_frame(db.involving(team, category.slug, exact=True), team_resolver(logo_width))
+        st.dataframe(
+            df_team[ROUND_COLUMNS],
+            use_container_width=True,
+            column_config=fixture_column_config(logo_width),
+            hide_index=True,
+            key=f"fixture_{category.slug}_team"
+        )
+        return
+
+    # The round being played now, or the next one, opens by default
+    current = round_calendar(category.slug, versions).current()
+    with st.container():
+        for fecha_num, group in fixture_rounds(category.slug, versions, logo_width):
+            if f"fixture_rendered_{fecha_num}" not in st.session_state:
+                # Only open rounds build and send their table; opening one reruns to fill it in
+                expander = st.expander(
+                    fecha_num, expanded=fecha_num == current, on_change="rerun",
+                    key=f"fixture_round_{category.slug}_{fecha_num.replace(' ', '_')}"
+                )
+                if not expander.open:
+                    continue
+                with expander:
+                    try:
+                        with st.spinner(f"Cargando tabla para {fecha_num}"):
+                            st.dataframe(
+                                group,
+                                use_container_width=True,
+                                height=300 if is_mobile else "auto",
+                                column_config=fixture_column_config(logo_width),
+                                hide_index=True,
+                                key=f"fixture_{category.slug}_{fecha_num.replace(' ', '_')}"
+                            )
+                            st.session_state[f"fixture_rendered_{fecha_num}"] = True
+                    except Exception as e:
+                        logger.error(f"Error rendering fixture table for {fecha_num}: {str(e)}")
+                        st.error(f"Error al mostrar la tabla para {fecha_num}. Por favor, intenta de nuevo.")
+
+
+# Tab 2: Tabla (Standings)
+@st.fragment
+def render_standings_tab(category, is_mobile):
+    clear_rendered("standings_rendered_")
+    versions = data_versions()
+    check_category_data(category, versions, "Tabla de posiciones aún no disponible. No hay partidos jugados.")
+    all_standings = category_standings(category.slug, versions)
+
+    # Every zone's table after each round comes from one cumulative pass
+    history = category_standings_history(category.slug, versions)
+    rounds = list(history[0].rounds) if history else []
+    round_index = len(rounds) - 1
+    if len(rounds) > 1:
+        round_name = st.selectbox(
+            "Tabla a la fecha", rounds, index=len(rounds) - 1, key=f"standings_round_{category.slug}"
+        )
+        round_index = rounds.index(round_name)
+        if round_index < len(rounds) - 1:
+            resolver = team_resolver()
+            all_standings = []
+            for zone_history in history:
+                if zone_history.rank[round_index].any():
+                    df_standings = zone_history.table(round_index)
+                    df_standings['Logo'] = resolver.logos(df_standings['Team'])
+                    all_standings.append(df_standings)
+
+    with st.container():
+        if not all_standings:
+            st.header("Tabla de posiciones aún no disponible. No hay partidos jugados.")
+        for df_standings in all_standings:
+            zona = df_standings['Zona'].iloc[0]
+            if f"standings_rendered_{zona}" not in st.session_state:
+                with st.expander(zona, expanded=True):
+                    try:
+                        with st.spinner(f"Cargando tabla para {zona}"):
+                            if len(df_standings) < 5 and is_mobile:
+                                st.table(df_standings[['Team', 'Pts']])
+                            else:
+                                if is_mobile:
+                                    st.dataframe(
+                                        df_standings,
+                                        use_container_width=True,
+                                        height=300,
+                                        column_config={
+                                            "Team": st.column_config.TextColumn("Equipo"),
+                                            "Pts": st.column_config.NumberColumn("Puntos", width=60)
+                                        },
+                                        hide_index=True,
+                                        column_order=['Team', 'Pts'],
+                                        key=f"standings_{category.slug}_{zona.replace(' ', '_')}"
+                                    )
+                                else:
+                                    st.dataframe(
+                                        df_standings,
+                                        use_container_width=True,
+                                        column_config={
+                                            "Team": st.column_config.TextColumn("Equipo"),
+                                            "Logo": st.column_config.ImageColumn(" ", width=LOGO_WIDTH),
+                                            "MP": st.column_config.NumberColumn("Partidos Jugados", width=80),
+                                            "W": st.column_config.NumberColumn("Ganados", width=60),
+                                            "D": st.column_config.NumberColumn("Empates", width=60),
+                                            "L": st.column_config.NumberColumn("Perdidos", width=60),
+                                            "Pts": st.column_config.NumberColumn("Puntos", width=60),
+                                            "GF": st.column_config.NumberColumn("Goles a Favor", width=80),
+                                            "GA": st.column_config.NumberColumn("Goles en Contra", width=80),
+                                            "GD": st.column_config.NumberColumn("Goles Diferencia", width=80)
+                                        },
+                                        hide_index=True,
+                                        column_order=['Logo', 'Team', 'Pts', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD'],
+                                        key=f"standings_{category.slug}_{zona.replace(' ', '_')}"
+                                    )
+                            st.session_state[f"standings_rendered_{zona}"] = True
+                    except Exception as e:
+                        logger.error(f"Error rendering standings table for {zona}: {str(e)}")
+                        st.error(f"Error al mostrar la tabla para {zona}. Por favor, intenta de nuevo.")
+
+    if len(all_standings) > 1:
+        # The current tables come ranked with the standings; an earlier round is ranked on the fly
+        if round_index < len(rounds) - 1:
+            df_ranking = cross_zone_ranking(all_standings)
+        else:
+            df_ranking = category_cross_zone_ranking(category.slug, versions)
+        render_cross_zone_ranking(category, df_ranking, is_mobile)
+    if len(rounds) > 1:
+        render_position_chart(category, history)
+    if category.qualifiers:
+        render_bracket(category, versions)
+    if pending_matches(category, versions):
+        render_what_if(category, is_mobile)
+        render_odds(category, versions)
+
+
+def pending_matches(category, versions):
+    matches, _ = load_category_matches(category.slug, versions)
+    return [match for match in matches if match.regular_season and not match.is_bye and not match.played]
+
+
+def render_cross_zone_ranking(category, df_ranking, is_mobile):
+    st.subheader("Ranking entre zonas")
+    positions = sorted(df_ranking['Posición'].unique())
+    position = st.selectbox(
+        "Puesto en la zona", [0] + positions,
+        format_func=lambda position: f"Mejores {position}°" if position else "Todos los equipos",
+        key=f"cross_zone_position_{category.slug}"
+    )
+    if position:
+        df_ranking = df_ranking[df_ranking['Posición'] == position]
+        rank_column = 'Ranking'
+    else:
+        df_ranking = df_ranking.sort_values('General')
+        rank_column = 'General'
+    column_order = [rank_column, 'Team', 'Zona', 'PPM'] if is_mobile else [
+        rank_column, 'Logo', 'Team', 'Zona', 'Posición', 'MP', 'Pts', 'PPM', 'GD', 'GF'
+    ]
+    st.dataframe(
+        df_ranking,
+        use_container_width=True,
+        column_config={
+            rank_column: st.column_config.NumberColumn("#", width=40),
+            "Logo": st.column_config.ImageColumn(" ", width=LOGO_WIDTH),
+            "Team": st.column_config.TextColumn("Equipo"),
+            "Posición": st.column_config.NumberColumn("Puesto", width=60),
+            "MP": st.column_config.NumberColumn("Partidos Jugados", width=80),
+            "Pts": st.column_config.NumberColumn("Puntos", width=60),
+            "PPM": st.column_config.NumberColumn("Puntos por Partido", format="%.2f", width=80),
+            "GD": st.column_config.NumberColumn("Goles Diferencia", width=80),
+            "GF": st.column_config.NumberColumn("Goles a Favor", width=80),
+        },
+        hide_index=True,
+        column_order=[column for column in column_order if column in df_ranking],
+        key=f"cross_zone_ranking_{category.slug}"
+    )
+
+
+def render_position_chart(category, history):
+    st.subheader("Evolución de posiciones")
+    zone_history = history[0]
+    if len(history) > 1:
+        zona = st.selectbox("Zona", [h.zone for h in history], key=f"position_zone_{category.slug}")
+        zone_history = next(h for h in history if h.zone == zona)
+    chart = alt.Chart(zone_history.positions()).mark_line(point=True).encode(
+        x=alt.X('Fecha:N', sort=list(zone_history.rounds), title=None),
+        y=alt.Y('Posición:Q', scale=alt.Scale(reverse=True, domain=[1, len(zone_history.teams)]),
+                axis=alt.Axis(tickMinStep=1)),
+        color=alt.Color('Team:N', title="Equipo"),
+        tooltip=[alt.Tooltip('Team:N', title="Equipo"), 'Fecha:N', 'Posición:Q', alt.Tooltip('Pts:Q', title="Puntos")],
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+
+def render_bracket(category, versions):
+    bracket = category_bracket(category.slug, versions)
+    if bracket is None:
+        return
+    st.subheader("Fase final")
+    if bracket.provisional:
+        st.caption("Cruces provisorios según las tablas actuales.")
+    unplaced = bracket.unplaced()
+    if unplaced:
+        st.warning("Partidos que no coinciden con los cruces: " + ", ".join(
+            f"{match.home} - {match.away} ({match.round})" for match in unplaced
+        ))
+    for column, ties in zip(st.columns(len(bracket.rounds)), bracket.rounds):
+        with column:
+            st.markdown(f"**{ties[0].round}**")
+            for tie in ties:
+                score = tie.score()
+                with st.container(border=True):
+                    for i, team in enumerate((tie.home, tie.away)):
+                        line = team or "A definir"
+                        if score is not None:
+                            line = f"{line} — {score[i]}"
+                        st.markdown(f"**{line}**" if team and team == tie.winner else line)
+    champion = bracket.champion()
+    if champion:
+        st.success(f"Campeón: {champion}")
+
+
+# A fragment of its own, so an edit reruns the hypothetical tables and not the whole Tabla tab
+@st.fragment
+def render_what_if(category, is_mobile):
+    st.subheader("¿Qué pasaría si...?")
+    if not st.toggle("Probar resultados de los próximos partidos", key=f"what_if_{category.slug}"):
+        return
+    versions = data_versions()
+    pending = pending_matches(category, versions)
+    if not pending:
+        return
+    # Each session keeps only its hypothetical results, on top of the tables of these versions,
+    # which are never changed; a new version of the file starts a new overlay
+    state = category_standings_state(category.slug, versions)
+    overlay_key = f"what_if_overlay_{category.slug}"
+    overlay = st.session_state.get(overlay_key)
+    if overlay is None or overlay.base is not state:
+        overlay = st.session_state[overlay_key] = StandingsOverlay(state)
+
+    rounds = list(dict.fromkeys(match.round for match in pending))[:WHAT_IF_ROUNDS]
+    pending = [match for match in pending if match.round in rounds]
+    df_pending = pd.DataFrame({
+        'Fecha': [match.round for match in pending],
+        'Zona': [match.zone or DEFAULT_ZONE for match in pending],
+        'Local': [match.home for match in pending],
+        'GL': pd.array([None] * len(pending), dtype='Int64'),
+        'GV': pd.array([None] * len(pending), dtype='Int64'),
+        'Visitante': [match.away for match in pending],
+    })
+    # New pending matches start a new editor, so edits never land on the wrong row
+    digest = zlib.crc32("|".join(f"{match.round}/{match.home}/{match.away}" for match in pending).encode())
+    df_edited = st.data_editor(
+        df_pending,
+        use_container_width=True,
+        column_config={
+            "GL": st.column_config.NumberColumn("Goles", min_value=0, step=1, width=60),
+            "GV": st.column_config.NumberColumn("Goles", min_value=0, step=1, width=60),
+        },
+        disabled=['Fecha', 'Zona', 'Local', 'Visitante'],
+        hide_index=True,
+        column_order=['Fecha', 'Local', 'GL', 'GV', 'Visitante'] if is_mobile else None,
+        key=f"what_if_matches_{category.slug}_{digest}"
+    )
+    results = {
+        (match.round, match.home, match.away): (match.zone or DEFAULT_ZONE, int(home_goals), int(away_goals))
+        for match, home_goals, away_goals in zip(pending, df_edited['GL'], df_edited['GV'])
+        if not pd.isna(home_goals) and not pd.isna(away_goals)
+    }
+    start = time.perf_counter()
+    changed = overlay.sync(results)
+    frames = {zone: overlay.frame(zone) for zone in sorted({zone for zone, _, _ in results.values()})}
+    logger.info(f"Applied {len(changed)} what-if zone changes for {category.slug} in {(time.perf_counter() - start) * 1000:.3f} ms")
+    if not results:
+        st.caption("Carga los goles de ambos equipos para ver cómo quedaría la tabla.")
+        return
+
+    resolver = team_resolver()
+    current = {df['Zona'].iloc[0]: list(df['Team']) for df in category_standings(category.slug, versions)}
+    for zone, df_table in frames.items():
+        before = current.get(zone, [])
+        # Places gained (positive) or lost against the real table; None for a team that had not played
+        df_table['Cambio'] = [
+            before.index(team) - place if team in before else None for place, team in enumerate(df_table['Team'])
+        ]
+        df_table['Logo'] = resolver.logos(df_table['Team'])
+        n_results = sum(1 for result in results.values() if result[0] == zone)
+        with st.expander(f"{zone} con {n_results} resultados hipotéticos", expanded=True):
+            st.dataframe(
+                df_table,
+                use_container_width=True,
+                column_config={
+                    "Team": st.column_config.TextColumn("Equipo"),
+                    "Logo": st.column_config.ImageColumn(" ", width=LOGO_WIDTH),
+                    "Pts": st.column_config.NumberColumn("Puntos", width=60),
+                    "MP": st.column_config.NumberColumn("Partidos Jugados", width=80),
+                    "GD": st.column_config.NumberColumn("Goles Diferencia", width=80),
+                    "GF": st.column_config.NumberColumn("Goles a Favor", width=80),
+                    "Cambio": st.column_config.NumberColumn("Cambio", format="%+d", width=60),
+                },
+                hide_index=True,
+                column_order=['Team', 'Pts', 'Cambio'] if is_mobile else ['Logo', 'Team', 'Pts', 'MP', 'GD', 'GF', 'Cambio'],
+                key=f"what_if_{category.slug}_{zone.replace(' ', '_')}"
+            )
+
+
+def render_odds(category, versions):
+    st.subheader("Probabilidades")
+    # Simulating is opt-in so opening the tab never waits for it
+    if not st.toggle("Simular los partidos que faltan", key=f"odds_{category.slug}"):
+        return
+    with st.spinner("Simulando el resto de la temporada"):
+        odds = category_odds(category.slug, versions)
+    st.caption(f"Porcentaje de {SIMULATIONS:,} simulaciones en que cada equipo termina en cada puesto.".replace(',', '.'))
+    pending = [zone_odds for zone_odds in odds if zone_odds.remaining]
+    for zone_odds in pending:
+        df_odds = zone_odds.frame(category.qualifiers)
+        with st.expander(f"{zone_odds.zone} — {zone_odds.remaining} partidos por jugar", expanded=len(pending) == 1):
+            st.dataframe(
+                df_odds,
+                use_container_width=True,
+                column_config={
+                    "Team": st.column_config.TextColumn("Equipo"),
+                    **{
+                        column: st.column_config.NumberColumn(column, format="%.1f%%")
+                        for column in df_odds.columns if column != 'Team'
+                    },
+                },
+                hide_index=True,
+                key=f"odds_{category.slug}_{zone_odds.zone.replace(' ', '_')}"
+            )
+
+
+# Tab 3: Estadisticas (Statistics)
+@st.fragment
+def render_statistics_tab(category, is_mobile):
+    versions = data_versions()
+    with st.spinner("Cargando datos de estadísticas"):
+        df_stats = category_statistics(category.slug, versions)
+    if df_stats is None:
+        st.header("Tabla de goleadores aún no disponible.")
+        return
+
+    st.header("Goleadores")
+    column_config = {
+        "Goals": st.column_config.NumberColumn("Goles", help="Numero de goles convertidos"),
+        "Player": st.column_config.TextColumn("Jugador", help="Nombre Jugador"),
+        "Club": st.column_config.TextColumn("Club", help="Club Jugador")
+    }
+    try:
+        with st.spinner("Cargando tabla de goleadores"):
+            if len(df_stats) < 5 and is_mobile:
+                st.table(df_stats.head(10)[['Goals', 'Player', 'Club']])
+            elif is_mobile:
+                st.dataframe(
+                    df_stats.head(10),
+                    column_config=column_config,
+                    hide_index=True,
+                    use_container_width=True,
+                    height=300,
+                    key=f"statistics_table_{category.slug}"
+                )
+            else:
+                st.dataframe(
+                    df_stats,
+                    column_config=column_config,
+                    hide_index=True,
+                    use_container_width=True,
+                    key=f"statistics_table_{category.slug}"
+                )
+    except Exception as e:
+        logger.error(f"Error rendering statistics table: {str(e)}")
+        st.error("Error al mostrar la tabla de goleadores. Por favor, intenta de nuevo.")
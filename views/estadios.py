@@ -4,17 +4,12 @@ import pandas as pd
 import logging
 from streamlit_folium import st_folium
 from streamlit.components.v1 import html
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from torneos.categories import CATEGORIES_BY_SLUG
+from torneos.match_db import match_db
 
-# Set page configuration
-st.set_page_config(
-    page_title="Futsal De Toque",
-    page_icon="images/favicon.jpg",
-    layout="wide"
-)
-
-st.logo("images/round.png")
 st.markdown("# Estadios")
-st.sidebar.markdown("# Futsal De Toque")
 
 # Define stadium data
 stadiums = [
@@ -22,55 +17,65 @@ stadiums = [
         "name": "Sportivo Pedal Club",
         "lat": -34.628520,
         "lon": -68.336973,
-        "google_maps": "https://maps.google.com/?q=-34.628520,-68.336973"
+        "google_maps": "https://maps.google.com/?q=-34.628520,-68.336973",
+        # Names the fixtures use for this venue, compared ignoring case
+        "venues": ["Sportivo Pedal Club", "Sportivo Pedal", "PEDAL"]
     },
     {
         "name": "Tenis Club",
         "lat": -34.62106,
         "lon": -68.37281,
-        "google_maps": "https://maps.google.com/?q=-34.62106,-68.37281"
+        "google_maps": "https://maps.google.com/?q=-34.62106,-68.37281",
+        "venues": ["TENIS", "San Rafael Tenis Club C1", "San Rafael Tenis Club C2", "San Rafael Tenis Club Cancha 1"]
     },
     {
         "name": "CIU UTN",
         "lat": -34.603497,
         "lon": -68.327794,
-        "google_maps": "https://maps.google.com/?q=-34.603497,-68.327794"
+        "google_maps": "https://maps.google.com/?q=-34.603497,-68.327794",
+        "venues": ["CIU UTN", "CIU", "CIU UT"]
     },
     {
         "name": "Banco Mendoza",
         "lat": -34.602058,
         "lon": -68.348941,
-        "google_maps": "https://maps.google.com/?q=-34.602058,-68.348941"
+        "google_maps": "https://maps.google.com/?q=-34.602058,-68.348941",
+        "venues": ["Banco Mendoza"]
     },
     {
         "name": "Polideportivo Nro2",
         "lat": -34.634303,
         "lon": -68.324028,
-        "google_maps": "https://maps.google.com/?q=-34.634303,-68.324028"
+        "google_maps": "https://maps.google.com/?q=-34.634303,-68.324028",
+        "venues": ["Polideportivo N2", "POLI ADENTRO", "POLIDEPORTIVO N2 ADENTRO"]
     },
     {
         "name": "Club Pescadores",
         "lat": -34.602605,
         "lon": -68.354466,
-        "google_maps": "https://maps.google.com/?q=-34.602605,-68.354466"
+        "google_maps": "https://maps.google.com/?q=-34.602605,-68.354466",
+        "venues": ["PESCADORES"]
     },
     {
         "name": "Huracan",
         "lat": -34.628061,
         "lon": -68.294438,
-        "google_maps": "https://maps.google.com/?q=-34.628061,-68.294438"
+        "google_maps": "https://maps.google.com/?q=-34.628061,-68.294438",
+        "venues": ["HURACAN"]
     },
     {
         "name": "CIC Sosnneado Futsal",
         "lat": -34.636386,
         "lon": -68.374009,
-        "google_maps": "https://maps.google.com/?q=-34.636386,-68.374009"
+        "google_maps": "https://maps.google.com/?q=-34.636386,-68.374009",
+        "venues": ["CIC (SOSNEADO)", "CIC SOSNEADO FUTSAL", "CIC (Centro integrador Comunitario)"]
     },
     {
         "name": "CDA",
         "lat": -34.608495,
         "lon": -68.341752,
-        "google_maps": "https://maps.google.com/?q=-34.608495,-68.341752"
+        "google_maps": "https://maps.google.com/?q=-34.608495,-68.341752",
+        "venues": ["CDA"]
     },
 ]
 
@@ -176,4 +181,26 @@ else:
         height=300 if st.session_state.get("is_mobile", False) else 400,
         returned_objects=[],
         key=f"map_{selected_stadium}"
-    )
\ No newline at end of file
+    )
+
+    # Upcoming matches at this stadium, looked up by venue in the match database
+    st.markdown("#### Próximos partidos")
+    today = datetime.now(ZoneInfo('America/Argentina/Buenos_Aires')).date()
+    upcoming = match_db().at_venues(stadium["venues"], start=today)
+    if upcoming:
+        df_upcoming = pd.DataFrame([{
+            'Fecha': match.kickoff,
+            'Categoría': CATEGORIES_BY_SLUG[match.category].name,
+            'Local': match.home,
+            'Visitante': match.away,
+            'Cancha': match.venue
+        } for match in upcoming[:20]])
+        st.dataframe(
+            df_upcoming,
+            column_config={"Fecha": st.column_config.DatetimeColumn("Fecha - Hora", format="DD/MM/YYYY HH:mm")},
+            hide_index=True,
+            use_container_width=True,
+            key=f"upcoming_{selected_stadium}"
+        )
+    else:
+        st.write("No hay partidos programados en este estadio.")
@@ -0,0 +1,105 @@
+import logging
+
+import streamlit as st
+
+from torneos.categories import CATEGORIES_BY_SLUG
+from torneos.ingest import data_versions
+from torneos.leaderboard import scorer_leaderboard
+from torneos.players import player_index
+
+logger = logging.getLogger(__name__)
+
+st.markdown("# Goleadores")
+
+# Detect mobile device
+is_mobile = st.query_params.get("mobile", ["false"])[0].lower() == "true" or (
+    "Mobi" in st._get_user_agent() if hasattr(st, "_get_user_agent") else False
+)
+
+with st.spinner("Cargando goleadores"):
+    leaderboard = scorer_leaderboard(data_versions())
+if not len(leaderboard):
+    st.header("Tabla de goleadores aún no disponible.")
+    st.stop()
+
+n_scorers = st.selectbox("Mostrar", [10, 25, 50, 100], index=1, key="leaderboard_top")
+
+try:
+    st.markdown("### Todas las categorías")
+    df_top = leaderboard.top(n_scorers)
+    df_top['category'] = df_top['category'].map(lambda slug: CATEGORIES_BY_SLUG[slug].name)
+    df_top.index = df_top.index + 1
+    st.dataframe(
+        df_top if not is_mobile else df_top[['Goals', 'Player', 'category']],
+        column_config={
+            "Goals": st.column_config.NumberColumn("Goles", help="Numero de goles convertidos"),
+            "Player": st.column_config.TextColumn("Jugador", help="Nombre Jugador"),
+            "Club": st.column_config.TextColumn("Club", help="Club Jugador"),
+            "category": st.column_config.TextColumn("Categoría", help="Category the goals were scored in")
+        },
+        use_container_width=True,
+        key="leaderboard_table"
+    )
+
+    st.markdown("### Goles por club")
+    df_clubs = leaderboard.clubs(n_scorers)
+    df_clubs.index = df_clubs.index + 1
+    st.dataframe(
+        df_clubs,
+        column_config={
+            "Club": st.column_config.TextColumn("Club", help="Club Jugador"),
+            "Goals": st.column_config.NumberColumn("Goles", help="Goals of the club's players in every category"),
+            "Players": st.column_config.NumberColumn("Goleadores", help="Players of the club who scored")
+        },
+        use_container_width=True,
+        key="leaderboard_clubs"
+    )
+
+    # Goals of the same player in different categories, and spelt differently, added up
+    players = player_index(data_versions())
+    st.markdown("### Goleadores de todas las categorías")
+    df_careers = players.careers(n_scorers)
+    df_careers.index = df_careers.index + 1
+    st.dataframe(
+        df_careers,
+        column_config={
+            "Player": st.column_config.TextColumn("Jugador", help="Nombre Jugador"),
+            "Club": st.column_config.TextColumn("Club", help="Club Jugador"),
+            "Goals": st.column_config.NumberColumn("Goles", help="Goals in every category"),
+            "Categories": st.column_config.NumberColumn("Categorías", help="Categories the player scored in")
+        },
+        use_container_width=True,
+        key="leaderboard_careers"
+    )
+
+    st.markdown("### Buscar jugador")
+    query = st.text_input("Apellido", key="leaderboard_player_search")
+    if query:
+        found = players.search(query)
+        if not found:
+            st.write("No se encontraron jugadores.")
+        else:
+            player_id = st.selectbox(
+                "Jugador",
+                found,
+                format_func=lambda player_id: f"{players.names[player_id]} ({players.clubs[player_id]})",
+                key="leaderboard_player"
+            )
+            df_rows = players.rows(player_id)
+            df_rows['category'] = df_rows['category'].map(lambda slug: CATEGORIES_BY_SLUG[slug].name)
+            st.metric("Goles", int(players.goals[player_id]))
+            st.dataframe(
+                df_rows,
+                column_config={
+                    "category": st.column_config.TextColumn("Categoría", help="Category the goals were scored in"),
+                    "Goals": st.column_config.NumberColumn("Goles", help="Numero de goles convertidos"),
+                    "Player": st.column_config.TextColumn("Jugador", help="Name as spelt in that category"),
+                    "Club": st.column_config.TextColumn("Club", help="Team as spelt in that category")
+                },
+                hide_index=True,
+                use_container_width=True,
+                key="leaderboard_player_rows"
+            )
+except Exception as e:
+    logger.error(f"Error rendering leaderboard: {str(e)}")
+    st.error("Error al mostrar la tabla de goleadores. Por favor, intenta de nuevo.")
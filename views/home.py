@@ -0,0 +1,242 @@
+import logging
+import streamlit as st
+import json
+import pandas as pd
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from torneos.categories import CATEGORIES_BY_SLUG
+from torneos.logos import LOGO_WIDTH, build_logo_dict, team_resolver
+from torneos.ingest import data_versions
+from torneos.match_db import match_db
+from torneos.match_index import match_index
+from torneos.ratings import HOME_ADVANTAGE, expected_score, team_ratings
+from torneos.store import goals_text
+
+# Clear session state keys related to match rendering
+for key in list(st.session_state.keys()):
+    if key.startswith("fixture_rendered_") or key.startswith("matches_rendered_"):
+        del st.session_state[key]
+
+logger = logging.getLogger(__name__)
+
+st.markdown("## PARTIDOS DE HOY")
+
+# Detect mobile device
+is_mobile = st.query_params.get("mobile", ["false"])[0].lower() == "true" or (
+    "Mobi" in st._get_user_agent() if hasattr(st, "_get_user_agent") else False
+)
+
+# Load logos.json
+try:
+    with st.spinner("Cargando logos"):
+        _, missing_logos = build_logo_dict()
+except (json.JSONDecodeError, FileNotFoundError) as e:
+    logger.error(f"Error loading logos.json: {str(e)}")
+    st.error(f"Error loading logos.json: {str(e)}")
+    st.stop()
+
+if missing_logos:
+    st.warning(f"Missing or invalid logo files:\n" + "\n".join(missing_logos))
+resolver = team_resolver()
+
+# Display frame for a list of indexed matches, with both teams' Elo ratings when given
+def matches_frame(matches, ratings=None):
+    if not matches:
+        return pd.DataFrame()
+    df = pd.DataFrame([{
+        'Date & Time': match.kickoff,
+        'Home Team': match.home,
+        'GL': goals_text(match.home_goals),
+        'Away Team': match.away,
+        'GV': goals_text(match.away_goals),
+        'Venue': match.venue,
+        'Category': CATEGORIES_BY_SLUG[match.category].name,
+        'Local_Logo': resolver.logo(match.home),
+        'Visitante_Logo': resolver.logo(match.away)
+    } for match in matches])
+    df['Date & Time'] = pd.to_datetime(df['Date & Time'])
+    if ratings is not None:
+        df['Home Rating'] = [ratings.of(match.category, match.home) for match in matches]
+        df['Away Rating'] = [ratings.of(match.category, match.away) for match in matches]
+        df['Home Expectancy'] = expected_score(df['Home Rating'] + HOME_ADVANTAGE, df['Away Rating']) * 100
+    return df
+
+# Set timezone to Argentina (GMT-3)
+argentina_tz = ZoneInfo('America/Argentina/Buenos_Aires')
+today = datetime.now(argentina_tz).date()
+current_date = today.strftime('%d/%m/%Y')
+
+# Load and display today's matches
+with st.spinner("Cargando partidos de hoy"):
+    versions = data_versions()
+    index = match_index(versions)
+    df_todays_matches = matches_frame(index.on(today), team_ratings(versions))
+    logger.info(f"Found {len(df_todays_matches)} matches for {current_date}")
+
+if not df_todays_matches.empty:
+    # Group by Category
+    with st.container():
+        for category, group in df_todays_matches.groupby('Category', sort=False):
+            session_key = f"matches_rendered_{category}"
+            logger.info(f"Rendering category: {category}, Session key: {session_key}, In session state: {session_key in st.session_state}")
+            if session_key not in st.session_state:
+                st.subheader(category)
+                # Limit to 10 matches per category to reduce rendering overhead
+                display_group = group.head(10)
+                try:
+                    with st.spinner(f"Cargando tabla para {category}"):
+                        if len(display_group) < 5 and is_mobile:
+                            st.table(display_group[['Date & Time', 'Home Team', 'Away Team', 'Venue']])
+                        else:
+                            if is_mobile:
+                                st.dataframe(
+                                    display_group,
+                                    column_config={
+                                        "Date & Time": st.column_config.DatetimeColumn(
+                                            "Fecha - Hora",
+                                            format="DD/MM/YYYY HH:mm",
+                                            help="Match date and time"
+                                        ),
+                                        "Home Team": st.column_config.TextColumn(
+                                            "Local",
+                                            help="Home team name"
+                                        ),
+                                        "Away Team": st.column_config.TextColumn(
+                                            "Visitante",
+                                            help="Away team name"
+                                        ),
+                                        "Venue": st.column_config.TextColumn(
+                                            "Cancha",
+                                            help="Match venue"
+                                        ),
+                                        "Home Expectancy": st.column_config.NumberColumn(
+                                            "Pronóstico",
+                                            format="%.0f%%",
+                                            help="Expected score of the home team from the Elo ratings (win 100%, draw 50%)"
+                                        )
+                                    },
+                                    hide_index=True,
+                                    use_container_width=True,
+                                    column_order=['Date & Time', 'Home Team', 'Away Team', 'Venue', 'Home Expectancy'],
+                                    key=f"today_matches_{category.replace(' ', '_')}"
+                                )
+                            else:
+                                st.dataframe(
+                                    display_group,
+                                    column_config={
+                                        "Date & Time": st.column_config.DatetimeColumn(
+                                            "Fecha - Hora",
+                                            format="DD/MM/YYYY HH:mm",
+                                            help="Match date and time"
+                                        ),
+                                        "Local_Logo": st.column_config.ImageColumn(
+                                            " ",
+                                            width=LOGO_WIDTH,
+                                            help="Home team logo"
+                                        ),
+                                        "Home Team": st.column_config.TextColumn(
+                                            "Local",
+                                            help="Home team name"
+                                        ),
+                                        "Visitante_Logo": st.column_config.ImageColumn(
+                                            " ",
+                                            width=LOGO_WIDTH,
+                                            help="Away team logo"
+                                        ),
+                                        "Away Team": st.column_config.TextColumn(
+                                            "Visitante",
+                                            help="Away team name"
+                                        ),
+                                        "Venue": st.column_config.TextColumn(
+                                            "Cancha",
+                                            help="Match venue"
+                                        ),
+                                        "Home Rating": st.column_config.NumberColumn(
+                                            "Elo Local",
+                                            format="%.0f",
+                                            help="Home team Elo rating"
+                                        ),
+                                        "Away Rating": st.column_config.NumberColumn(
+                                            "Elo Visitante",
+                                            format="%.0f",
+                                            help="Away team Elo rating"
+                                        ),
+                                        "Home Expectancy": st.column_config.NumberColumn(
+                                            "Pronóstico",
+                                            format="%.0f%%",
+                                            help="Expected score of the home team from the Elo ratings (win 100%, draw 50%)"
+                                        )
+                                    },
+                                    hide_index=True,
+                                    use_container_width=True,
+                                    column_order=['Date & Time', 'Local_Logo', 'Home Team', 'Visitante_Logo', 'Away Team', 'Venue',
+                                                  'Home Rating', 'Away Rating', 'Home Expectancy'],
+                                    key=f"today_matches_{category.replace(' ', '_')}"
+                                )
+                        st.session_state[session_key] = True
+                        if len(group) > 10:
+                            st.write(f"Showing first 10 matches for {category}. Total matches: {len(group)}")
+                except Exception as e:
+                    logger.error(f"Error rendering matches table for {category}: {str(e)}")
+                    st.error(f"Error al mostrar la tabla para {category}. Por favor, intenta de nuevo.")
+else:
+    st.write(f"No hay partidos programados para {current_date}.")
+
+# Yesterday's results and the coming week, answered by range queries on the index
+results_column_config = {
+    "Date & Time": st.column_config.DatetimeColumn("Fecha - Hora", format="DD/MM/YYYY HH:mm"),
+    "Category": st.column_config.TextColumn("Categoría"),
+    "Home Team": st.column_config.TextColumn("Local"),
+    "GL": st.column_config.TextColumn("Goles", width=40),
+    "Away Team": st.column_config.TextColumn("Visitante"),
+    "GV": st.column_config.TextColumn("Goles", width=40),
+    "Venue": st.column_config.TextColumn("Cancha")
+}
+df_yesterday = matches_frame(index.results(today - timedelta(days=1)))
+if not df_yesterday.empty:
+    with st.expander("Resultados de ayer", expanded=False):
+        st.dataframe(
+            df_yesterday,
+            column_config=results_column_config,
+            hide_index=True,
+            use_container_width=True,
+            column_order=['Date & Time', 'Category', 'Home Team', 'GL', 'GV', 'Away Team', 'Venue'],
+            key="yesterday_results"
+        )
+df_upcoming = matches_frame(index.upcoming(today, days=7))
+if not df_upcoming.empty:
+    with st.expander("Próximos 7 días", expanded=False):
+        st.dataframe(
+            df_upcoming,
+            column_config=results_column_config,
+            hide_index=True,
+            use_container_width=True,
+            column_order=['Date & Time', 'Category', 'Home Team', 'Away Team', 'Venue'],
+            key="upcoming_matches"
+        )
+
+# Search every category at once, answered by the indexed match database
+with st.expander("Buscar partidos", expanded=False):
+    db = match_db(versions)
+    search_by = st.radio("Buscar por", ["Equipo", "Árbitro", "Cancha"], horizontal=True, key="search_by")
+    options = {"Equipo": db.teams, "Árbitro": db.referees, "Cancha": db.venues}[search_by]()
+    selected = st.selectbox(search_by, options, index=None, placeholder="Selecciona una opción", key=f"search_{search_by}")
+    if selected:
+        if search_by == "Equipo":
+            found = db.involving(selected)
+        elif search_by == "Árbitro":
+            found = db.refereed_by(selected)
+        else:
+            found = db.at_venues([selected])
+        df_found = matches_frame(found)
+        if df_found.empty:
+            st.write("No se encontraron partidos.")
+        else:
+            st.dataframe(
+                df_found,
+                column_config=results_column_config,
+                hide_index=True,
+                use_container_width=True,
+                column_order=['Date & Time', 'Category', 'Home Team', 'GL', 'GV', 'Away Team', 'Venue'],
+                key="search_results"
+            )